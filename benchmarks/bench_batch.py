@@ -0,0 +1,55 @@
+"""
+Benchmark how vcon.batch.map scales with the number of worker processes.
+
+Run with ``python benchmarks/bench_batch.py``. The work function
+re-serializes and hashes each vCon several times, standing in for CPU-bound
+stages such as signing or redaction. Speedup is relative to running in the
+calling process (``workers=0``).
+"""
+import hashlib
+import os
+import time
+
+from vcon import Vcon, batch
+
+COUNT = 4_000
+
+
+def make_documents() -> list:
+    vcon = Vcon.build_new()
+    vcon.add_parties([{"tel": "+14327534365"}, {"tel": "+18043243300"}])
+    vcon.add_dialogs({"type": "text", "start": "2024-05-03T20:13:48+00:00", "parties": [0, 1],
+                      "originator": i % 2, "body": f"message {i}"} for i in range(20))
+    document = vcon.to_json().encode()
+    return [document] * COUNT
+
+
+def digest(vcon: Vcon) -> str:
+    data = b""
+    for _ in range(20):
+        data = hashlib.sha256(data + vcon.to_json().encode()).digest()
+    return data.hex()
+
+
+def run(documents: list, workers: int) -> float:
+    started = time.perf_counter()
+    for _ in batch.map(digest, documents, workers=workers, chunksize=64):
+        pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    documents = make_documents()
+    baseline = run(documents, 0)
+    print(f"{'workers':>8} {'seconds':>8} {'vcons/s':>9} {'speedup':>8}")
+    print(f"{0:>8} {baseline:>8.2f} {COUNT / baseline:>9.0f} {1:>7.1f}x")
+    cores = os.cpu_count() or 1
+    workers = 1
+    while workers <= cores:
+        seconds = run(documents, workers)
+        print(f"{workers:>8} {seconds:>8.2f} {COUNT / seconds:>9.0f} {baseline / seconds:>7.1f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark assembling a vCon one item at a time against the bulk builders.
+
+Run with ``python benchmarks/bench_bulk.py``. Both variants build a vCon
+with two parties, 10,000 text dialogs and one analysis entry per dialog.
+"""
+import timeit
+
+from vcon import Vcon
+from vcon.dialog import Dialog
+from vcon.party import Party
+
+COUNT = 10_000
+START = "2024-05-03T20:13:48.414951+00:00"
+
+
+def one_by_one() -> Vcon:
+    vcon = Vcon.build_new()
+    vcon.add_party(Party(tel="+14327534365"))
+    vcon.add_party(Party(tel="+18043243300"))
+    for i in range(COUNT):
+        vcon.add_dialog(Dialog(type="text", start=START, parties=[0, 1], originator=i % 2,
+                               mimetype="text/plain", body=f"message {i}"))
+        vcon.add_analysis(type="sentiment", dialog=i, vendor="acme", body="neutral")
+    return vcon
+
+
+def bulk() -> Vcon:
+    vcon = Vcon.build_new()
+    vcon.add_parties([{"tel": "+14327534365"}, {"tel": "+18043243300"}])
+    vcon.add_dialogs({"type": "text", "start": START, "parties": [0, 1], "originator": i % 2,
+                      "mimetype": "text/plain", "body": f"message {i}"} for i in range(COUNT))
+    vcon.add_analyses({"type": "sentiment", "dialog": i, "vendor": "acme", "body": "neutral"}
+                      for i in range(COUNT))
+    return vcon
+
+
+def main() -> None:
+    assert one_by_one().to_dict()["dialog"] == bulk().to_dict()["dialog"]
+    number = 10
+    for name, build in (("one by one", one_by_one), ("bulk", bulk)):
+        seconds = timeit.timeit(build, number=number) / number
+        print(f"{name:>12} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark Vcon construction cost against the size of the dialog bodies.
+
+Run with ``python benchmarks/bench_construction.py``. The copying
+constructor grows with the body size, ``Vcon.from_dict`` should not.
+"""
+import base64
+import os
+import timeit
+
+from vcon import Vcon
+
+
+def make_vcon_dict(body_size: int) -> dict:
+    body = base64.urlsafe_b64encode(os.urandom(body_size)).decode()
+    return {
+        "uuid": "018f4e5a-0000-8000-8000-000000000000",
+        "vcon": "0.0.1",
+        "created_at": "2024-05-03T20:13:48.414984+00:00",
+        "parties": [{"tel": "+14327534365"}, {"tel": "+18043243300"}],
+        "dialog": [
+            {
+                "type": "recording",
+                "start": "2024-05-03T20:13:48.414951+00:00",
+                "parties": [0, 1],
+                "mimetype": "audio/x-wav",
+                "body": body,
+                "encoding": "base64url",
+            }
+        ],
+        "attachments": [],
+        "analysis": [],
+    }
+
+
+def main() -> None:
+    number = 20
+    print(f"{'body size':>12} {'Vcon(d) ms':>12} {'from_dict ms':>14}")
+    for body_size in (1_000, 100_000, 1_000_000, 10_000_000):
+        vcon_dict = make_vcon_dict(body_size)
+        copied = timeit.timeit(lambda: Vcon(vcon_dict), number=number) / number
+        adopted = timeit.timeit(lambda: Vcon.from_dict(vcon_dict), number=number) / number
+        print(f"{body_size:>12} {copied * 1000:>12.3f} {adopted * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
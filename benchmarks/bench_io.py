@@ -0,0 +1,46 @@
+"""
+Benchmark reading and writing a JSON Lines corpus of vCons.
+
+Run with ``python benchmarks/bench_io.py``. Peak memory while reading
+stays flat as the corpus grows because only one line is held at a time.
+"""
+import os
+import tempfile
+import tracemalloc
+
+from vcon import Vcon
+from vcon.io import VconReader, VconWriter
+
+
+def make_vcon(n: int) -> Vcon:
+    vcon = Vcon.build_new()
+    vcon.add_parties([{"tel": "+14327534365"}, {"tel": "+18043243300"}])
+    vcon.add_dialogs({"type": "text", "start": "2024-05-03T20:13:48+00:00", "parties": [0, 1],
+                      "originator": i % 2, "body": f"message {n}/{i}"} for i in range(10))
+    return vcon
+
+
+def main() -> None:
+    template = make_vcon(0)
+    with tempfile.TemporaryDirectory() as directory:
+        for count in (5_000, 20_000):
+            for suffix in (".jsonl", ".jsonl.gz"):
+                path = os.path.join(directory, f"corpus{suffix}")
+                with VconWriter(path) as writer:
+                    for _ in range(count):
+                        writer.write(template)
+                written = writer.stats
+
+                tracemalloc.start()
+                with VconReader(path) as reader:
+                    for _ in reader:
+                        pass
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                read = reader.stats
+                print(f"{count:>7} {suffix:>10} write {written.vcons_per_second:>9.0f} vcons/s"
+                      f"  read {read.vcons_per_second:>9.0f} vcons/s  read peak {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark eager and lazy parsing of vCons with large inline bodies.
+
+Run with ``python benchmarks/bench_lazy.py``. A metadata-only stage reads
+``uuid``, ``parties`` and ``created_at``; with ``lazy=True`` its latency and
+extra memory should not depend on the size of the media.
+"""
+import base64
+import json
+import os
+import timeit
+import tracemalloc
+
+from vcon import Vcon
+
+
+def make_vcon_json(body_size: int) -> str:
+    body = base64.urlsafe_b64encode(os.urandom(body_size)).decode()
+    return json.dumps({
+        "uuid": "018f4e5a-0000-8000-8000-000000000000",
+        "vcon": "0.0.1",
+        "created_at": "2024-05-03T20:13:48.414984+00:00",
+        "parties": [{"tel": "+14327534365"}, {"tel": "+18043243300"}],
+        "dialog": [
+            {
+                "type": "recording",
+                "start": "2024-05-03T20:13:48.414951+00:00",
+                "parties": [0, 1],
+                "mimetype": "audio/x-wav",
+                "body": body,
+                "encoding": "base64url",
+            }
+        ],
+        "attachments": [],
+        "analysis": [],
+    })
+
+
+def metadata_stage(json_string: str, lazy: bool) -> tuple:
+    vcon = Vcon.build_from_json(json_string, lazy=lazy)
+    return vcon.uuid, vcon.created_at, len(vcon.vcon_dict["parties"])
+
+
+def peak_memory(json_string: str, lazy: bool) -> int:
+    tracemalloc.start()
+    metadata_stage(json_string, lazy)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    number = 20
+    print(f"{'body size':>12} {'eager ms':>10} {'lazy ms':>10} {'eager peak KiB':>16} {'lazy peak KiB':>15}")
+    for body_size in (10_000, 1_000_000, 10_000_000, 40_000_000):
+        json_string = make_vcon_json(body_size)
+        eager = timeit.timeit(lambda: metadata_stage(json_string, False), number=number) / number
+        lazy = timeit.timeit(lambda: metadata_stage(json_string, True), number=number) / number
+        print(
+            f"{body_size:>12} {eager * 1000:>10.3f} {lazy * 1000:>10.3f}"
+            f" {peak_memory(json_string, False) // 1024:>16} {peak_memory(json_string, True) // 1024:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
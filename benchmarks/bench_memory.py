@@ -0,0 +1,76 @@
+"""
+Measure the memory used per Dialog, Party, PartyHistory and CivicAddress
+instance.
+
+Run with ``python benchmarks/bench_memory.py``. The "__dict__" column
+copies the same attributes onto an instance of a plain class, which is how
+these classes stored them before they were given ``__slots__``.
+"""
+import tracemalloc
+
+from vcon.civic_address import CivicAddress
+from vcon.dialog import Dialog
+from vcon.party import Party, PartyHistory
+
+COUNT = 10_000
+
+
+def make_dialog(n: int) -> Dialog:
+    return Dialog(type="text", start="2024-05-03T20:13:48.414951+00:00", parties=[0, 1],
+                  originator=n % 2, mimetype="text/plain", body="hello")
+
+
+def make_party(n: int) -> Party:
+    return Party(tel="+14327534365", name="Daniel Rodriguez", role="agent")
+
+
+def make_party_history(n: int) -> PartyHistory:
+    return PartyHistory(n % 2, "join", "2024-05-03T20:13:48.414951+00:00")
+
+
+def make_civic_address(n: int) -> CivicAddress:
+    return CivicAddress(country="US", a1="CA", a3="Los Angeles", sts="Main St", hno="1234", pc="90001")
+
+
+def with_dict(factory, skip_none: bool = False):
+    # the dict-backed Party only stored the fields that were not None
+    cls = type("Legacy", (), {})
+
+    def legacy_factory(n: int):
+        instance = factory(n)
+        legacy = cls()
+        for field in type(instance).__slots__:
+            value = getattr(instance, field)
+            if value is not None or not skip_none:
+                setattr(legacy, field, value)
+        return legacy
+
+    return legacy_factory
+
+
+def bytes_per_instance(factory) -> float:
+    # build the shared argument objects first so only the instances are measured
+    factory(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory(n) for n in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # subtract the list holding the instances
+    return (after - before - 8 * len(instances)) / COUNT
+
+
+def main() -> None:
+    print(f"{'class':>14} {'__dict__ bytes':>15} {'__slots__ bytes':>16}")
+    for name, factory, skip_none in [
+        ("Dialog", make_dialog, False),
+        ("Party", make_party, True),
+        ("PartyHistory", make_party_history, False),
+        ("CivicAddress", make_civic_address, False),
+    ]:
+        legacy = bytes_per_instance(with_dict(factory, skip_none))
+        print(f"{name:>14} {legacy:>15.0f} {bytes_per_instance(factory):>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark sign_many and verify_many against the number of workers.
+
+Run with ``python benchmarks/bench_sign_many.py``. Each row signs and then
+verifies the same vCons with a process pool and with a thread pool; 0
+workers runs in the calling thread. Thread pools only scale if the crypto
+backend releases the GIL during the signature operation.
+"""
+import os
+import time
+
+from vcon import Vcon
+from vcon.dialog import Dialog
+from vcon.signing import OK, VconSigner, VconVerifier, sign_many, verify_many
+
+COUNT = 2000
+
+
+def make_vcons() -> list:
+    vcons = []
+    for i in range(COUNT):
+        vcon = Vcon.build_new()
+        vcon.add_dialog(Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0], body=f"message {i}"))
+        vcons.append(vcon)
+    return vcons
+
+
+def main() -> None:
+    private_key, public_key = Vcon.generate_key_pair()
+    signer, verifier = VconSigner(private_key), VconVerifier(public_key)
+    cores = os.cpu_count() or 1
+    print(f"{cores} CPU cores, {COUNT} vCons")
+    print(f"{'executor':>8} {'workers':>7} {'sign/s':>8} {'verify/s':>9}")
+    for executor in ("process", "thread"):
+        for workers in sorted({0, 1, 2, 4, cores}):
+            vcons = make_vcons()
+            started = time.perf_counter()
+            assert sign_many(vcons, signer, workers=workers, executor=executor, chunksize=64) == [OK] * COUNT
+            signed = time.perf_counter()
+            assert verify_many(vcons, verifier, workers=workers, executor=executor, chunksize=64) == [OK] * COUNT
+            verified = time.perf_counter()
+            print(f"{executor:>8} {workers:>7} {COUNT / (signed - started):8.0f} {COUNT / (verified - signed):9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark signing and verifying vCons with raw keys against reusable
+signer and verifier objects.
+
+Run with ``python benchmarks/bench_signing.py``. The "per call" variant
+repeats what ``Vcon.sign`` and ``Vcon.verify`` used to do for every vCon:
+serialize the key to PEM and have authlib parse it back. The second part
+signs a vCon carrying a large recording with the whole vCon as payload, in
+manifest mode, and with a detached payload with and without a manifest.
+"""
+import base64
+import time
+
+from authlib.jose import JsonWebSignature
+from cryptography.hazmat.primitives import serialization
+
+from vcon import Vcon
+from vcon.dialog import Dialog
+from vcon.signing import VconSigner, VconVerifier
+
+COUNT = 300
+MEDIA_SIZE = 30 << 20
+
+
+def per_call_sign(vcon: Vcon, private_key) -> None:
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    signed = JsonWebSignature().serialize_compact({"alg": "RS256", "typ": "JWS"}, vcon.to_json(), pem)
+    header, payload, signature = signed.decode("utf-8").split(".")
+    vcon.vcon_dict["signatures"] = [{"protected": header, "signature": signature}]
+    vcon.vcon_dict["payload"] = payload
+
+
+def per_call_verify(vcon: Vcon, public_key) -> None:
+    pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    signature = vcon.vcon_dict["signatures"][0]
+    JsonWebSignature().deserialize_compact(
+        f"{signature['protected']}.{vcon.vcon_dict['payload']}.{signature['signature']}", pem
+    )
+
+
+def make_vcons() -> list:
+    vcons = []
+    for i in range(COUNT):
+        vcon = Vcon.build_new()
+        vcon.add_dialog(Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0], body=f"message {i}"))
+        vcons.append(vcon)
+    return vcons
+
+
+def rate(fn, vcons: list) -> float:
+    started = time.perf_counter()
+    for vcon in vcons:
+        fn(vcon)
+    return len(vcons) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    private_key, public_key = Vcon.generate_key_pair()
+    signer, verifier = VconSigner(private_key), VconVerifier(public_key)
+    vcons = make_vcons()
+    print(f"{'per call sign':>16} {rate(lambda v: per_call_sign(v, private_key), vcons):8.0f} vCons/s")
+    print(f"{'signer':>16} {rate(signer.sign, vcons):8.0f} vCons/s")
+    print(f"{'per call verify':>16} {rate(lambda v: per_call_verify(v, public_key), vcons):8.0f} vCons/s")
+    print(f"{'verifier':>16} {rate(verifier.verify, vcons):8.0f} vCons/s")
+    print()
+    media(private_key, verifier)
+
+
+def media(private_key, verifier: VconVerifier) -> None:
+    vcon = Vcon.build_new()
+    body = base64.urlsafe_b64encode(b"\x01" * MEDIA_SIZE).decode()
+    vcon.add_dialog(Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0],
+                           mimetype="audio/x-wav", body=body, encoding="base64url"))
+    size = len(vcon.to_json())
+    modes = (("full", False, False), ("manifest", True, False), ("detached", False, True), ("det+man", True, True))
+    for name, manifest, detached in modes:
+        signer = VconSigner(private_key, manifest=manifest, detached=detached)
+        for attempt in ("first", "again"):
+            started = time.perf_counter()
+            signer.sign(vcon)
+            signed = time.perf_counter()
+            assert verifier.verify(vcon)
+            verified = time.perf_counter()
+            print(f"{name:>9} {attempt:>6} sign {(signed - started) * 1000:7.1f} ms  "
+                  f"verify {(verified - signed) * 1000:7.1f} ms  signed size {len(vcon.to_json()) / size:.2f}x")
+            if manifest:
+                continue
+            vcon.vcon_dict.pop("signatures")
+            vcon.vcon_dict.pop("payload", None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the to_dict serializers of CivicAddress, Party and Dialog.
+
+Run with ``python benchmarks/bench_to_dict.py``. The "before" column times
+the implementations the classes used before their serializers were
+generated: ``dir()`` introspection for CivicAddress, a per-field
+``getattr`` loop for Party and a full dict filtered by a comprehension for
+Dialog.
+"""
+import timeit
+
+from vcon.civic_address import CivicAddress
+from vcon.dialog import Dialog
+from vcon.party import Party
+
+
+def civic_address_before(self):
+    return {attr: getattr(self, attr) for attr in dir(self)
+            if not attr.startswith("_") and getattr(self, attr) is not None and not callable(getattr(self, attr))}
+
+
+def party_before(self):
+    party_dict = {}
+    for key in Party.__slots__:
+        value = getattr(self, key, None)
+        if value is not None:
+            party_dict[key] = value
+    return party_dict
+
+
+def dialog_before(self):
+    dialog_dict = {
+        "type": self.type, "start": self.start, "duration": self.duration, "parties": self.parties,
+        "originator": self.originator, "mimetype": self.mimetype, "filename": self.filename,
+        "body": self.body, "encoding": self.encoding, "url": self.url, "alg": self.alg,
+        "signature": self.signature, "disposition": self.disposition,
+        "party_history": [p.to_dict() for p in self.party_history] if self.party_history else None,
+        "transferee": self.transferee, "transferor": self.transferor,
+        "transfer_target": self.transfer_target, "original": self.original,
+        "consultation": self.consultation, "target_dialog": self.target_dialog,
+        "campaign": self.campaign, "interaction": self.interaction, "skill": self.skill,
+        "meta": self.meta,
+    }
+    return {k: v for k, v in dialog_dict.items() if v is not None}
+
+
+def main() -> None:
+    number = 100_000
+    cases = [
+        ("CivicAddress", CivicAddress(country="US", a1="CA", a3="Los Angeles", sts="Main St", hno="1234", pc="90001"),
+         civic_address_before),
+        ("Party", Party(tel="+14327534365", name="Daniel Rodriguez", role="agent"), party_before),
+        ("Dialog", Dialog(type="text", start="2024-05-03T20:13:48.414951+00:00", parties=[0, 1],
+                          originator=0, mimetype="text/plain", body="hello"), dialog_before),
+    ]
+    print(f"{'class':>14} {'before us':>10} {'to_dict us':>11} {'speedup':>8}")
+    for name, instance, before in cases:
+        assert before(instance) == instance.to_dict()
+        old = timeit.timeit(lambda: before(instance), number=number) / number
+        new = timeit.timeit(instance.to_dict, number=number) / number
+        print(f"{name:>14} {old * 1e6:>10.2f} {new * 1e6:>11.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
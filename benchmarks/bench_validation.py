@@ -0,0 +1,37 @@
+"""
+Benchmark body validation levels on large json and base64url bodies.
+
+Run with ``python benchmarks/bench_validation.py``. Peak memory is the
+extra memory allocated while checking one body.
+"""
+import base64
+import json
+import os
+import timeit
+import tracemalloc
+
+from vcon.validation import VALIDATION_LEVELS, check_body
+
+
+def peak_bytes(body, encoding: str, level: str) -> int:
+    tracemalloc.start()
+    check_body(body, encoding, level)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    transcript = json.dumps({"segments": [{"speaker": i % 2, "text": "word " * 20} for i in range(40_000)]})
+    audio = base64.urlsafe_b64encode(os.urandom(6_000_000)).decode()
+    number = 5
+    print(f"{'body':>10} {'size MB':>8} {'level':>11} {'ms':>8} {'peak MB':>8}")
+    for name, body, encoding in (("json", transcript, "json"), ("base64url", audio, "base64url")):
+        for level in VALIDATION_LEVELS:
+            seconds = timeit.timeit(lambda: check_body(body, encoding, level), number=number) / number
+            peak = peak_bytes(body, encoding, level)
+            print(f"{name:>10} {len(body) / 1e6:>8.1f} {level:>11} {seconds * 1000:>8.2f} {peak / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Run a function over many vCons in a pool of worker processes.
+
+:func:`map` reads raw JSON documents in the parent process and ships them
+to the workers in chunks, so ``Vcon`` objects are never pickled on the way
+in. Each worker parses the documents, applies the function and sends the
+return values back. The function and its return values must be picklable:
+use a module-level function and return plain data, such as
+``vcon.to_json()`` or a digest, rather than the ``Vcon`` itself.
+
+Sources
+-------
+- a path to a JSON Lines corpus, read as in :mod:`vcon.io` including
+  gzip and zstd compression
+- a path to a directory, each ``*.json`` file in it being one vCon
+- a binary or text file object holding a JSON Lines corpus
+- an iterable of JSON documents (``str`` or ``bytes``) or of
+  ``pathlib.Path`` objects naming ``.json`` files
+"""
+import collections
+import concurrent.futures
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .io import DEFAULT_BUFFER_SIZE, _open_read
+from .lazy import parse_lazy
+from .vcon import Vcon
+from . import json_engine
+
+DEFAULT_CHUNKSIZE = 64
+
+_worker_fn = None
+_worker_lazy = False
+
+
+class WorkerStats:
+    __slots__ = ("vcons", "errors", "busy")
+
+    def __init__(self) -> None:
+        """
+        Counters for one worker process.
+        """
+        self.vcons = 0
+        self.errors = 0
+        self.busy = 0.0
+
+    @property
+    def vcons_per_second(self) -> float:
+        """
+        Returns the number of vCons processed per second of work.
+
+        :return: the worker throughput
+        :rtype: float
+        """
+        return self.vcons / self.busy if self.busy > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return f"WorkerStats(vcons={self.vcons}, errors={self.errors}, vcons_per_second={self.vcons_per_second:.0f})"
+
+
+class BatchStats:
+    __slots__ = ("submitted", "completed", "errors", "started", "workers")
+
+    def __init__(self) -> None:
+        """
+        Progress counters for a batch run.
+
+        ``workers`` maps the process id of each worker to its
+        :class:`WorkerStats`.
+        """
+        self.submitted = 0
+        self.completed = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.workers: Dict[int, WorkerStats] = {}
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Returns the seconds since the batch was started.
+
+        :return: the elapsed time in seconds
+        :rtype: float
+        """
+        return time.perf_counter() - self.started
+
+    @property
+    def vcons_per_second(self) -> float:
+        """
+        Returns the number of vCons completed per second.
+
+        :return: the overall throughput
+        :rtype: float
+        """
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchStats(submitted={self.submitted}, completed={self.completed}, errors={self.errors}, "
+            f"workers={len(self.workers)}, vcons_per_second={self.vcons_per_second:.0f})"
+        )
+
+
+def _init_worker(fn: Callable[[Vcon], Any], lazy: bool) -> None:
+    global _worker_fn, _worker_lazy
+    _worker_fn = fn
+    _worker_lazy = lazy
+
+
+def _run_chunk(chunk: List[Tuple[int, Union[bytes, str]]]) -> Tuple[int, float, list]:
+    """
+    Parse and process a chunk of documents in a worker.
+
+    :return: the worker's process id, the seconds spent and a list of
+        ``(index, ok, value)`` tuples where value is the result or the
+        exception
+    :rtype: tuple
+    """
+    started = time.perf_counter()
+    results = []
+    for index, document in chunk:
+        try:
+            vcon_dict = parse_lazy(document) if _worker_lazy else json_engine.loads(document)
+            if not isinstance(vcon_dict, dict):
+                raise ValueError(f"Expected a JSON object, got {type(vcon_dict).__name__}")
+            results.append((index, True, _worker_fn(Vcon(vcon_dict, copy=False))))
+        except Exception as e:
+            results.append((index, False, e))
+    return os.getpid(), time.perf_counter() - started, results
+
+
+def _documents(source: Any, buffer_size: int) -> Iterator[Union[bytes, str]]:
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        for path in sorted(Path(source).glob("*.json")):
+            yield path.read_bytes()
+        return
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+        stream, owned = _open_read(source, None, buffer_size)
+        try:
+            for line in stream:
+                if line.strip():
+                    yield line
+        finally:
+            for opened in owned:
+                opened.close()
+        return
+    for document in source:
+        if isinstance(document, os.PathLike):
+            yield Path(document).read_bytes()
+        else:
+            yield document
+
+
+def _chunks(documents: Iterator, chunksize: int) -> Iterator[list]:
+    chunk = []
+    for index, document in enumerate(documents):
+        chunk.append((index, document))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map(
+    fn: Callable[[Vcon], Any],
+    source: Union[str, os.PathLike, Any, Iterable[Union[bytes, str, os.PathLike]]],
+    *,
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    ordered: bool = True,
+    lazy: bool = False,
+    errors: str = "raise",
+    progress: Optional[Callable[[BatchStats], None]] = None,
+    stats: Optional[BatchStats] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Iterator[Any]:
+    """
+    Apply a function to every vCon of a source in worker processes.
+
+    Results are streamed back as chunks complete. At most two chunks per
+    worker are in flight, so memory does not grow with the source.
+
+    :param fn: a picklable function taking a Vcon
+    :type fn: Callable[[Vcon], Any]
+    :param source: the vCons to process, see the module documentation
+    :type source: Union[str, os.PathLike, IO, Iterable]
+    :param workers: the number of worker processes, ``os.cpu_count()`` by
+        default; 0 runs everything in the calling process
+    :type workers: int or None
+    :param chunksize: the number of vCons sent to a worker at a time
+    :type chunksize: int
+    :param ordered: yield results in source order; otherwise in the order
+        they complete
+    :type ordered: bool
+    :param lazy: defer decoding of large bodies, see :mod:`vcon.lazy`
+    :type lazy: bool
+    :param errors: ``"raise"`` to re-raise the first exception from
+        parsing or ``fn``, ``"skip"`` to drop the vCon and count the error
+    :type errors: str
+    :param progress: called with the stats after every chunk
+    :type progress: Callable[[BatchStats], None] or None
+    :param stats: a BatchStats to update, to read the counters afterwards
+    :type stats: BatchStats or None
+    :param buffer_size: the read buffer size in bytes for corpus files
+    :type buffer_size: int
+    :return: an iterator over the return values of ``fn``
+    :rtype: Iterator[Any]
+    :raises ValueError: if ``errors`` or ``chunksize`` is invalid
+    """
+    if errors not in ("raise", "skip"):
+        raise ValueError(f"Unknown errors mode: {errors}")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if stats is None:
+        stats = BatchStats()
+
+    chunks = _chunks(_documents(source, buffer_size), chunksize)
+
+    def collect(outcome: Tuple[int, float, list]) -> List[Any]:
+        pid, busy, results = outcome
+        worker = stats.workers.get(pid)
+        if worker is None:
+            worker = stats.workers[pid] = WorkerStats()
+        worker.busy += busy
+        values = []
+        for _, ok, value in results:
+            worker.vcons += 1
+            stats.completed += 1
+            if ok:
+                values.append(value)
+                continue
+            worker.errors += 1
+            stats.errors += 1
+            if errors == "raise":
+                raise value
+        if progress is not None:
+            progress(stats)
+        return values
+
+    if workers == 0:
+        _init_worker(fn, lazy)
+        for chunk in chunks:
+            stats.submitted += len(chunk)
+            yield from collect(_run_chunk(chunk))
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(fn, lazy)) as pool:
+        pending = collections.deque()
+        try:
+            for chunk in chunks:
+                stats.submitted += len(chunk)
+                pending.append(pool.submit(_run_chunk, chunk))
+                if len(pending) < 2 * workers:
+                    continue
+                if ordered:
+                    yield from collect(pending.popleft().result())
+                else:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield from collect(future.result())
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    future = next(iter(done))
+                    pending.remove(future)
+                yield from collect(future.result())
+        finally:
+            for future in pending:
+                future.cancel()
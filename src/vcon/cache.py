@@ -0,0 +1,387 @@
+"""
+Content-addressed on-disk cache for external dialog media.
+
+A :class:`MediaCache` keeps each downloaded body once, under its SHA-256
+digest, and a small entry per URL recording the digest together with the
+``ETag`` and ``Last-Modified`` validators and the Content-Type of the
+response. A :class:`vcon.fetch.Fetcher` created with ``cache=`` serves
+repeated requests for a URL from disk, revalidating them with a
+conditional request unless ``revalidate=False``.
+
+Layout of the cache directory::
+
+    blobs/<first two hex digits>/<sha256>
+    urls/<sha256 of the URL>.json
+    tmp/
+
+Every file is written to ``tmp/`` first and moved into place with
+:func:`os.replace`, so readers never see a partial file. Several worker
+processes on one host can share a directory: blobs are immutable, a URL
+entry is replaced whole, and a blob that another process evicts between
+lookup and read is treated as a miss. Blobs are evicted least recently
+used first, by modification time, which is refreshed on every hit, once
+the total size exceeds ``max_bytes``. The hit and miss counters in
+:class:`CacheStats` are kept per ``MediaCache`` instance.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+
+DEFAULT_MAX_BYTES = 1 << 30
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "stores", "evictions", "bytes_served")
+
+    def __init__(self) -> None:
+        """
+        Counters for a media cache.
+
+        ``bytes_served`` counts the bytes read from the cache on hits.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_served = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Returns the fraction of lookups that were served from the cache.
+
+        :return: the hit ratio
+        :rtype: float
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, stores={self.stores}, "
+            f"evictions={self.evictions}, hit_ratio={self.hit_ratio:.2f})"
+        )
+
+
+class BlobWriter:
+    def __init__(self, cache: "MediaCache") -> None:
+        """
+        Write a body to a temporary file of the cache while hashing it.
+        Use :meth:`MediaCache.writer` to create one.
+
+        :param cache: the cache to write to
+        :type cache: MediaCache
+        """
+        self._cache = cache
+        fd, self._path = tempfile.mkstemp(dir=cache._tmp_dir)
+        self._file = os.fdopen(fd, "wb")
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Append a chunk of the body.
+
+        :param chunk: the chunk
+        :type chunk: bytes
+        :return: None
+        :rtype: None
+        """
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def commit(
+        self,
+        url: str,
+        content_type: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> str:
+        """
+        Move the body into the cache and record it as the content of a URL.
+
+        :param url: the URL the body was fetched from
+        :type url: str
+        :param content_type: the Content-Type of the response
+        :type content_type: str or None
+        :param etag: the ETag of the response
+        :type etag: str or None
+        :param last_modified: the Last-Modified header of the response
+        :type last_modified: str or None
+        :return: the SHA-256 hex digest of the body
+        :rtype: str
+        """
+        self._file.close()
+        digest = self._hash.hexdigest()
+        path = self._cache.blob_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self._path, path)
+        self._cache._add_entry(
+            url,
+            {
+                "url": url,
+                "sha256": digest,
+                "size": self.size,
+                "content_type": content_type,
+                "etag": etag,
+                "last_modified": last_modified,
+            },
+        )
+        return digest
+
+    def abort(self) -> None:
+        """
+        Discard the body.
+
+        :return: None
+        :rtype: None
+        """
+        self._file.close()
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+
+class MediaCache:
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        revalidate: bool = True,
+    ) -> None:
+        """
+        Initialize a cache in a directory, creating it if needed.
+
+        :param directory: the cache directory
+        :type directory: Union[str, os.PathLike]
+        :param max_bytes: the total size of the cached bodies above which
+            the least recently used ones are evicted
+        :type max_bytes: int
+        :param revalidate: check cached URLs with a conditional request
+            before serving them; otherwise they are served without
+            contacting the server
+        :type revalidate: bool
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self.stats = CacheStats()
+        self._blob_dir = os.path.join(self.directory, "blobs")
+        self._url_dir = os.path.join(self.directory, "urls")
+        self._tmp_dir = os.path.join(self.directory, "tmp")
+        for path in (self._blob_dir, self._url_dir, self._tmp_dir):
+            os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = None
+
+    def blob_path(self, digest: str) -> str:
+        """
+        Returns the path of the body with a SHA-256 digest.
+
+        :param digest: the SHA-256 hex digest
+        :type digest: str
+        :return: the path, which may not exist
+        :rtype: str
+        """
+        return os.path.join(self._blob_dir, digest[:2], digest)
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self._url_dir, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def lookup(self, url: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Returns the entry of a URL whose body is in the cache.
+
+        The entry holds the ``url``, the ``sha256`` digest and ``size`` of
+        the body, its ``content_type``, and the ``etag`` and
+        ``last_modified`` validators. Looking up does not count as a hit or
+        a miss; :meth:`read` and :meth:`record_miss` do.
+
+        :param url: the URL
+        :type url: str
+        :return: the entry, or None if the URL is not cached
+        :rtype: dict or None
+        """
+        try:
+            with open(self._entry_path(url), "rb") as fp:
+                entry = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url or not os.path.exists(self.blob_path(entry["sha256"])):
+            return None
+        return entry
+
+    @staticmethod
+    def validators(entry: Dict[str, Optional[str]]) -> Dict[str, str]:
+        """
+        Returns the headers of a conditional request for a cached entry.
+
+        :param entry: the entry returned by :meth:`lookup`
+        :type entry: dict
+        :return: the If-None-Match and If-Modified-Since headers
+        :rtype: dict
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(
+        self,
+        entry: Dict[str, Optional[str]],
+        sink: Callable[[bytes], None],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> bool:
+        """
+        Pass a cached body to a callback a chunk at a time, and count a hit.
+
+        :param entry: the entry returned by :meth:`lookup`
+        :type entry: dict
+        :param sink: called with each chunk of the body in order
+        :type sink: Callable[[bytes], None]
+        :param chunk_size: the size of the chunks in bytes
+        :type chunk_size: int
+        :return: False if the body was evicted in the meantime and nothing
+            was read
+        :rtype: bool
+        """
+        path = self.blob_path(entry["sha256"])
+        try:
+            fp = open(path, "rb")
+        except FileNotFoundError:
+            return False
+        with fp:
+            # keep recently used bodies from being evicted
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            served = 0
+            for chunk in iter(lambda: fp.read(chunk_size), b""):
+                sink(chunk)
+                served += len(chunk)
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.bytes_served += served
+        return True
+
+    def record_miss(self) -> None:
+        """
+        Count a request that could not be served from the cache.
+
+        :return: None
+        :rtype: None
+        """
+        with self._lock:
+            self.stats.misses += 1
+
+    def writer(self) -> BlobWriter:
+        """
+        Returns a writer for a new body.
+
+        :return: the writer
+        :rtype: BlobWriter
+        """
+        return BlobWriter(self)
+
+    def _add_entry(self, url: str, entry: dict) -> None:
+        fd, path = tempfile.mkstemp(dir=self._tmp_dir)
+        with os.fdopen(fd, "w") as fp:
+            json.dump(entry, fp)
+        os.replace(path, self._entry_path(url))
+        with self._lock:
+            self.stats.stores += 1
+            if self._size is not None:
+                self._size += entry["size"]
+            over = self._size is None or self._size > self.max_bytes
+        if over:
+            self.prune()
+
+    def _blobs(self) -> list:
+        blobs = []
+        for prefix in os.scandir(self._blob_dir):
+            if not prefix.is_dir():
+                continue
+            for blob in os.scandir(prefix.path):
+                try:
+                    stat = blob.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, blob.path))
+        return blobs
+
+    def size(self) -> int:
+        """
+        Returns the total size of the cached bodies in bytes.
+
+        :return: the size in bytes
+        :rtype: int
+        """
+        return sum(size for _, size, _ in self._blobs())
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Evict the least recently used bodies until the cache fits in its
+        size limit. URL entries whose body is evicted become misses.
+
+        :param max_bytes: the size limit to use instead of ``max_bytes``
+        :type max_bytes: int or None
+        :return: the number of bodies evicted
+        :rtype: int
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        # rescan, since other processes may have added or evicted bodies
+        blobs = self._blobs()
+        total = sum(size for _, size, _ in blobs)
+        evicted = 0
+        for _, size, path in sorted(blobs):
+            if total <= limit:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            else:
+                evicted += 1
+            total -= size
+        self._remove_stale_tmp()
+        with self._lock:
+            self._size = total
+            self.stats.evictions += evicted
+        return evicted
+
+    def _remove_stale_tmp(self, age: float = 3600.0) -> None:
+        # temporary files left behind by processes that died mid-write
+        cutoff = time.time() - age
+        for tmp in os.scandir(self._tmp_dir):
+            try:
+                if tmp.stat().st_mtime < cutoff:
+                    os.unlink(tmp.path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Remove every body and URL entry from the cache.
+
+        :return: None
+        :rtype: None
+        """
+        self.prune(0)
+        for entry in os.scandir(self._url_dir):
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
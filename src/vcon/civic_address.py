@@ -1,7 +1,27 @@
 from typing import Optional
-from typing import Optional
+from .serializers import compile_to_dict
 
 class CivicAddress:
+    __slots__ = (
+        "country",
+        "a1",
+        "a2",
+        "a3",
+        "a4",
+        "a5",
+        "a6",
+        "prd",
+        "pod",
+        "sts",
+        "hno",
+        "hns",
+        "lmk",
+        "loc",
+        "flr",
+        "nam",
+        "pc",
+    )
+
     def __init__(self,
                  country: Optional[str] = None,
                  a1: Optional[str] = None,
@@ -80,11 +100,12 @@ class CivicAddress:
         """
         Convert the CivicAddress object to a dictionary.
 
-        The dictionary keys are the attribute names of the object, and the
-        values are the attribute values.
+        The dictionary holds the fields that are set, in declaration order.
 
         :return: A dictionary of the object's attributes
         :rtype: dict[str, Optional[str]]
         """
-        return {attr: getattr(self, attr) for attr in dir(self) if not attr.startswith("_") and getattr(self, attr) is not None and not callable(getattr(self, attr))}
+        return _to_dict(self)
+
 
+_to_dict = compile_to_dict("CivicAddress", CivicAddress.__slots__)
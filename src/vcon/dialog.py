@@ -1,10 +1,11 @@
-import requests
 import hashlib
 import base64
 from datetime import datetime
 from typing import Optional, List, Union
 from .party import PartyHistory
-from dateutil import parser
+from .fetch import AsyncFetcher, get_default_fetcher
+from .serializers import compile_to_dict
+from .timestamps import normalize_timestamp
 
 MIME_TYPES = [
     "text/plain",
@@ -20,6 +21,33 @@ MIME_TYPES = [
 
 
 class Dialog:
+    __slots__ = (
+        "type",
+        "start",
+        "parties",
+        "originator",
+        "mimetype",
+        "filename",
+        "body",
+        "encoding",
+        "url",
+        "alg",
+        "signature",
+        "disposition",
+        "party_history",
+        "transferee",
+        "transferor",
+        "transfer_target",
+        "original",
+        "consultation",
+        "target_dialog",
+        "campaign",
+        "interaction",
+        "skill",
+        "duration",
+        "meta",
+    )
+
     def __init__(self,
                  type: str,
                  start: Union[datetime, str],
@@ -97,10 +125,7 @@ class Dialog:
         """
         
         # Convert the start time to an ISO 8601 string from a datetime or a string
-        if isinstance(start, datetime):
-            start = start.isoformat()
-        elif isinstance(start, str):
-            start = parser.parse(start).isoformat()
+        start = normalize_timestamp(start)
 
         # Set the attributes
         self.type = type
@@ -140,52 +165,44 @@ class Dialog:
         if not self.start:
             self.start = datetime.now().isoformat()
 
-        dialog_dict = {
-            "type": self.type,
-            "start": self.start,
-            "duration": self.duration,
-            "parties": self.parties,
-            "originator": self.originator,
-            "mimetype": self.mimetype,
-            "filename": self.filename,
-            "body": self.body,
-            "encoding": self.encoding,
-            "url": self.url,
-            "alg": self.alg,
-            "signature": self.signature,
-            "disposition": self.disposition,
-            "party_history": (
-                [party_history.to_dict() for party_history in self.party_history]
-                if self.party_history
-                else None
-            ),
-            "transferee": self.transferee,
-            "transferor": self.transferor,
-            "transfer_target": self.transfer_target,
-            "original": self.original,
-            "consultation": self.consultation,
-            "target_dialog": self.target_dialog,
-            "campaign": self.campaign,
-            "interaction": self.interaction,
-            "skill": self.skill,
-            "meta": self.meta
-        }
-        return {k: v for k, v in dialog_dict.items() if v is not None}
-
-    def add_external_data(self, url: str, filename: str, mimetype: str) -> None:
+        return _dialog_to_dict(self)
+
+    def add_external_data(self, url: str, filename: str, mimetype: str, fetcher=None) -> None:
         """
         Add external data to the dialog.
 
+        The content is streamed and hashed a chunk at a time, so it is never
+        held in memory whole.
+
         :param url: the URL of the external data
         :type url: str
+        :param fetcher: the fetcher to use instead of the shared default one
+        :type fetcher: vcon.fetch.Fetcher or None
         :return: None
         :rtype: None
         """
-        response = requests.get(url)
-        if response.status_code == 200:
-            self.mimetype = response.headers["Content-Type"]
-        else:
-            raise Exception(f"Failed to fetch external data: {response.status_code}")
+        digest = _ContentDigest()
+        content_type = _fetcher(fetcher).stream(url, digest)
+        self._set_external_data(url, digest.signature(), content_type, filename, mimetype)
+
+    async def add_external_data_async(self, url: str, filename: str, mimetype: str, fetcher=None) -> None:
+        """
+        Add external data to the dialog without blocking the event loop.
+
+        :param url: the URL of the external data
+        :type url: str
+        :param fetcher: the fetcher to use; by default a new one is
+            created for this request
+        :type fetcher: vcon.fetch.AsyncFetcher or None
+        :return: None
+        :rtype: None
+        """
+        digest = _ContentDigest()
+        content_type = await _stream_async(url, digest, fetcher)
+        self._set_external_data(url, digest.signature(), content_type, filename, mimetype)
+
+    def _set_external_data(self, url: str, signature: str, content_type: str, filename: str, mimetype: str) -> None:
+        self.mimetype = content_type
 
         # Overide the filename if provided, otherwise use the filename from the URL
         if filename:
@@ -197,10 +214,10 @@ class Dialog:
         if mimetype:
             self.mimetype = mimetype
 
-        # Calculate the SHA-256 hash of the body as the signature
+        # The SHA-256 hash of the content is the signature
         self.alg = "sha256"
         self.encoding = "base64url"
-        self.signature = base64.urlsafe_b64encode(hashlib.sha256(response.text.encode()).digest()).decode()
+        self.signature = signature
 
     def add_inline_data(self, body: str, filename: str, mimetype: str) -> None:
         """
@@ -257,36 +274,132 @@ class Dialog:
             return False
         try:
             body_hash = base64.urlsafe_b64decode(self.signature.encode())
-            return hashlib.sha256(self.body.encode()).digest() != body_hash
+            if hashlib.sha256(self.body.encode()).digest() == body_hash:
+                return False
+            # to_inline_data stores the content base64url encoded and signs
+            # the content itself
+            content = base64.urlsafe_b64decode(self.body.encode())
+            return hashlib.sha256(content).digest() != body_hash
         except Exception as e:
             print(e)
             return True
 
     # Convert the dialog from an external data dialog to an inline data dialog
-    # by reading the contents from the URL then adding the contents to the body
-    def to_inline_data(self) -> None:
-        # Read the contents from the URL
-        response = requests.get(self.url)
-        if response.status_code == 200:
-            self.body = response.text
-            self.mimetype = response.headers["Content-Type"]
-        else:
-            raise Exception(f"Failed to fetch external data: {response.status_code}")
+    # by reading the contents from the URL then adding the base64url encoded
+    # contents to the body
+    def to_inline_data(self, fetcher=None) -> None:
+        # Stream the contents through the shared pooled session unless a
+        # fetcher is given, hashing and encoding them a chunk at a time
+        digest = _ContentDigest(encode=True)
+        content_type = _fetcher(fetcher).stream(self.url, digest)
+        self._set_inline_data(digest.body(), digest.signature(), content_type)
+
+    async def to_inline_data_async(self, fetcher=None) -> None:
+        """
+        Convert the dialog to an inline data dialog without blocking the
+        event loop.
+
+        :param fetcher: the fetcher to use; by default a new one is
+            created for this request
+        :type fetcher: vcon.fetch.AsyncFetcher or None
+        :return: None
+        :rtype: None
+        """
+        digest = _ContentDigest(encode=True)
+        content_type = await _stream_async(self.url, digest, fetcher)
+        self._set_inline_data(digest.body(), digest.signature(), content_type)
 
-        # Calculate the SHA-256 hash of the body as the signature
+    def _set_inline_data(self, body: str, signature: str, content_type: str) -> None:
+        self.body = body
+        self.mimetype = content_type
+
+        # The SHA-256 hash of the content is the signature
         self.alg = "sha256"
         self.encoding = "base64url"
-        self.signature = base64.urlsafe_b64encode(hashlib.sha256(self.body.encode()).digest()).decode()
+        self.signature = signature
 
         # Overide the filename if provided, otherwise use the filename from the URL
-        if self.filename:
-            self.filename = self.filename
-        else:
+        if not self.filename:
             self.filename = self.url.split("/")[-1]
 
-        # Overide the mimetype if provided, otherwise use the mimetype from the URL
-        if self.mimetype:
-            self.mimetype = self.mimetype
 
-        # Add the body to the dialog
-        self.add_inline_data(self.body, self.filename, self.mimetype)
\ No newline at end of file
+class _ContentDigest:
+    """
+    Incremental SHA-256 and, optionally, base64url encoding of content
+    passed in a chunk at a time. Bytes that do not fill a 3-byte base64
+    group are carried over to the next chunk.
+    """
+    __slots__ = ("_hash", "_parts", "_pending")
+
+    def __init__(self, encode: bool = False) -> None:
+        self._hash = hashlib.sha256()
+        self._parts = [] if encode else None
+        self._pending = b""
+
+    def __call__(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        if self._parts is None:
+            return
+        if self._pending:
+            chunk = self._pending + chunk
+        cut = len(chunk) - len(chunk) % 3
+        view = memoryview(chunk)
+        self._parts.append(base64.urlsafe_b64encode(view[:cut]).decode("ascii"))
+        self._pending = bytes(view[cut:])
+
+    def signature(self) -> str:
+        return base64.urlsafe_b64encode(self._hash.digest()).decode()
+
+    def body(self) -> str:
+        self._parts.append(base64.urlsafe_b64encode(self._pending).decode("ascii"))
+        self._pending = b""
+        body = "".join(self._parts)
+        self._parts = []
+        return body
+
+
+def _fetcher(fetcher=None):
+    return fetcher if fetcher is not None else get_default_fetcher()
+
+
+async def _stream_async(url: str, sink, fetcher=None):
+    if fetcher is not None:
+        return await fetcher.stream(url, sink)
+    async with AsyncFetcher() as fetcher:
+        return await fetcher.stream(url, sink)
+
+
+def _party_history_to_dict(party_history):
+    return [entry.to_dict() for entry in party_history] if party_history else None
+
+
+_dialog_to_dict = compile_to_dict(
+    "Dialog",
+    (
+        "type",
+        "start",
+        "duration",
+        "parties",
+        "originator",
+        "mimetype",
+        "filename",
+        "body",
+        "encoding",
+        "url",
+        "alg",
+        "signature",
+        "disposition",
+        "party_history",
+        "transferee",
+        "transferor",
+        "transfer_target",
+        "original",
+        "consultation",
+        "target_dialog",
+        "campaign",
+        "interaction",
+        "skill",
+        "meta",
+    ),
+    converters={"party_history": _party_history_to_dict},
+)
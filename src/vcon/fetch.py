@@ -0,0 +1,401 @@
+"""
+HTTP fetching of external dialog data.
+
+:class:`Fetcher` wraps a ``requests`` session with a keep-alive connection
+pool per host, connect and read timeouts, and retries with jittered
+exponential backoff on connection errors and transient 5xx responses. It
+backs :meth:`vcon.dialog.Dialog.add_external_data`,
+:meth:`vcon.dialog.Dialog.to_inline_data` and
+:meth:`vcon.Vcon.inline_all_external`; a shared default fetcher is used
+unless one is passed in, see :func:`set_default_fetcher`. Given a
+:class:`vcon.cache.MediaCache`, it serves repeated downloads from disk.
+
+:class:`AsyncFetcher` wraps an ``aiohttp`` client session with a pooled
+connector, a request timeout and a concurrency limit. It backs the
+``async`` variants of those methods. ``aiohttp`` is an optional
+dependency, imported when an async fetcher is created.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from .cache import MediaCache
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_CONCURRENCY = 10
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_JITTER = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+class Fetcher:
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = DEFAULT_CONCURRENCY,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF,
+        backoff_jitter: float = DEFAULT_JITTER,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        session: Optional[requests.Session] = None,
+        cache: Optional[MediaCache] = None,
+    ) -> None:
+        """
+        Initialize a fetcher over a pooled ``requests`` session.
+
+        :param pool_connections: the number of hosts to keep a connection
+            pool for
+        :type pool_connections: int
+        :param pool_maxsize: the maximum number of connections per host;
+            further requests to the host wait for a free connection
+        :type pool_maxsize: int
+        :param connect_timeout: the connect timeout in seconds, or None
+        :type connect_timeout: float or None
+        :param read_timeout: the timeout between bytes received in
+            seconds, or None
+        :type read_timeout: float or None
+        :param retries: the number of retries after a failed request
+        :type retries: int
+        :param backoff_factor: retry ``n`` waits ``backoff_factor * 2 ** (n - 1)``
+            seconds
+        :type backoff_factor: float
+        :param backoff_jitter: a random delay of up to this many seconds
+            added to each backoff
+        :type backoff_jitter: float
+        :param retry_statuses: the response statuses that are retried
+        :type retry_statuses: Iterable[int]
+        :param session: a session to mount the adapter on instead of
+            creating one
+        :type session: requests.Session or None
+        :param cache: an on-disk cache that :meth:`stream` serves repeated
+            URLs from
+        :type cache: vcon.cache.MediaCache or None
+        """
+        retry_options = dict(
+            total=retries,
+            status_forcelist=frozenset(retry_statuses),
+            allowed_methods=frozenset(("GET",)),
+            backoff_factor=backoff_factor,
+            raise_on_status=False,
+        )
+        try:
+            retry = Retry(backoff_jitter=backoff_jitter, **retry_options)
+        except TypeError:
+            # urllib3 < 2 has no jitter
+            retry = Retry(**retry_options)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session = session if session is not None else requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+
+    def get(self, url: str, stream: bool = False) -> requests.Response:
+        """
+        Send a GET request through the pool.
+
+        :param url: the URL to fetch
+        :type url: str
+        :param stream: leave the body unread, to be consumed with
+            ``iter_content``; the response must then be closed
+        :type stream: bool
+        :return: the response
+        :rtype: requests.Response
+        :raises Exception: if the response status is not 200
+        """
+        return _checked(self.session.get(url, timeout=self.timeout, stream=stream))
+
+    def fetch(self, url: str) -> Tuple[str, Optional[str]]:
+        """
+        Fetch a URL.
+
+        :param url: the URL to fetch
+        :type url: str
+        :return: the decoded response body and the Content-Type header
+        :rtype: tuple
+        :raises Exception: if the response status is not 200
+        """
+        response = self.get(url)
+        return response.text, response.headers.get("Content-Type")
+
+    def stream(self, url: str, sink: Callable[[bytes], None], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Optional[str]:
+        """
+        Fetch a URL, passing the raw body to a callback a chunk at a time
+        so that it is never held in memory whole. With a cache, bodies are
+        served from and stored to it.
+
+        :param url: the URL to fetch
+        :type url: str
+        :param sink: called with each chunk of the body in order
+        :type sink: Callable[[bytes], None]
+        :param chunk_size: the size of the chunks in bytes
+        :type chunk_size: int
+        :return: the Content-Type header
+        :rtype: str or None
+        :raises Exception: if the response status is not 200
+        """
+        if self.cache is not None:
+            return self._stream_cached(url, sink, chunk_size)
+        response = self.get(url, stream=True)
+        try:
+            for chunk in response.iter_content(chunk_size):
+                sink(chunk)
+        finally:
+            response.close()
+        return response.headers.get("Content-Type")
+
+    def _stream_cached(self, url: str, sink: Callable[[bytes], None], chunk_size: int) -> Optional[str]:
+        cache = self.cache
+        entry = cache.lookup(url)
+        if entry is not None:
+            if not cache.revalidate and cache.read(entry, sink, chunk_size):
+                return entry["content_type"]
+            response = self.session.get(url, timeout=self.timeout, stream=True, headers=cache.validators(entry))
+            if response.status_code == 304:
+                response.close()
+                if cache.read(entry, sink, chunk_size):
+                    return entry["content_type"]
+                # evicted by another process since the lookup
+                response = self.session.get(url, timeout=self.timeout, stream=True)
+        else:
+            response = self.session.get(url, timeout=self.timeout, stream=True)
+
+        cache.record_miss()
+        _checked(response)
+        writer = cache.writer()
+        try:
+            for chunk in response.iter_content(chunk_size):
+                sink(chunk)
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        finally:
+            response.close()
+        headers = response.headers
+        writer.commit(url, headers.get("Content-Type"), headers.get("ETag"), headers.get("Last-Modified"))
+        return headers.get("Content-Type")
+
+    def fetch_many(
+        self, urls: Iterable[str], workers: Optional[int] = None
+    ) -> List[Union[Tuple[str, Optional[str]], Exception]]:
+        """
+        Fetch several URLs from a thread pool.
+
+        :param urls: the URLs to fetch
+        :type urls: Iterable[str]
+        :param workers: the number of threads, ``pool_maxsize`` by default
+        :type workers: int or None
+        :return: the result of :meth:`fetch` for each URL in order, or the
+            exception raised for it
+        :rtype: list
+        """
+        return run_in_threads(self.fetch, list(urls), workers or self.pool_maxsize)
+
+    def close(self) -> None:
+        """
+        Close the pooled connections.
+
+        :return: None
+        :rtype: None
+        """
+        self.session.close()
+
+    def __enter__(self) -> "Fetcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _checked(response: requests.Response) -> requests.Response:
+    if response.status_code != 200:
+        response.close()
+        raise Exception(f"Failed to fetch external data: {response.status_code}")
+    return response
+
+
+def run_in_threads(fn, items: list, workers: int) -> list:
+    """
+    Call a function on each item from a thread pool.
+
+    :param fn: the function to call
+    :type fn: Callable
+    :param items: the items to pass, one per call
+    :type items: list
+    :param workers: the number of threads
+    :type workers: int
+    :return: the return value of each call in order, or the exception it
+        raised
+    :rtype: list
+    """
+    def call(item):
+        try:
+            return fn(item)
+        except Exception as e:
+            return e
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(call, items))
+
+
+def get_default_fetcher() -> Fetcher:
+    """
+    Returns the fetcher shared by dialogs that are not given one, creating
+    it with the default settings on first use.
+
+    :return: the default fetcher
+    :rtype: Fetcher
+    """
+    global _default_fetcher
+    if _default_fetcher is None:
+        with _default_lock:
+            if _default_fetcher is None:
+                _default_fetcher = Fetcher()
+    return _default_fetcher
+
+
+def set_default_fetcher(fetcher: Optional[Fetcher]) -> None:
+    """
+    Replace the shared default fetcher. Passing None resets it so that a
+    new one is created on next use.
+
+    :param fetcher: the new default fetcher
+    :type fetcher: Fetcher or None
+    :return: None
+    :rtype: None
+    """
+    global _default_fetcher
+    with _default_lock:
+        _default_fetcher = fetcher
+
+
+def _aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("async fetching requires the aiohttp package") from None
+    return aiohttp
+
+
+class AsyncFetcher:
+    def __init__(
+        self,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        session=None,
+    ) -> None:
+        """
+        Initialize an async fetcher.
+
+        Use it as an async context manager, or call :meth:`close` when
+        done, to release the pooled connections.
+
+        :param concurrency: the maximum number of requests in flight
+        :type concurrency: int
+        :param timeout: the total timeout of a request in seconds, or None
+        :type timeout: float or None
+        :param session: an ``aiohttp.ClientSession`` to use instead of
+            creating one; it is not closed by the fetcher
+        :type session: aiohttp.ClientSession or None
+        """
+        self._aiohttp = _aiohttp()
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+
+    def _get_session(self):
+        if self._session is None:
+            aiohttp = self._aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def fetch(self, url: str) -> Tuple[str, Optional[str]]:
+        """
+        Fetch a URL.
+
+        :param url: the URL to fetch
+        :type url: str
+        :return: the decoded response body and the Content-Type header
+        :rtype: tuple
+        :raises Exception: if the response status is not 200
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise Exception(f"Failed to fetch external data: {response.status}")
+                return await response.text(), response.headers.get("Content-Type")
+
+    async def stream(
+        self, url: str, sink: Callable[[bytes], None], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Optional[str]:
+        """
+        Fetch a URL, passing the raw body to a callback a chunk at a time,
+        see :meth:`Fetcher.stream`.
+
+        :param url: the URL to fetch
+        :type url: str
+        :param sink: called with each chunk of the body in order
+        :type sink: Callable[[bytes], None]
+        :param chunk_size: the maximum size of the chunks in bytes
+        :type chunk_size: int
+        :return: the Content-Type header
+        :rtype: str or None
+        :raises Exception: if the response status is not 200
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise Exception(f"Failed to fetch external data: {response.status}")
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    sink(chunk)
+                return response.headers.get("Content-Type")
+
+    async def close(self) -> None:
+        """
+        Close the session if the fetcher created it.
+
+        :return: None
+        :rtype: None
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
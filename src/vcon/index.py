@@ -0,0 +1,183 @@
+"""
+Hash indexes over the lists of dicts that make up a vCon.
+
+A :class:`ListIndex` maps the value of one field to the positions of the
+entries holding that value, so lookups by type, vendor or party field do not
+scan the list. Indexes are built on first use and kept current by the
+:class:`vcon.Vcon` methods that append entries. Appending to or removing
+from the underlying list directly is detected by its length and triggers a
+rebuild; an entry edited in place is re-checked whenever it is returned.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from pydash import get as _get
+
+# Dotted paths without brackets or escapes, e.g. "tel" or "meta.role"
+_SIMPLE_PATH = re.compile(r"[^.\[\]\\]+(?:\.[^.\[\]\\]+)*")
+
+
+@lru_cache(maxsize=256)
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """
+    Compile a ``pydash.get`` style path into a getter function.
+
+    Dotted paths are split once and walked directly; anything more complex
+    (brackets, escaped dots) is handed to ``pydash.get``. Missing keys
+    yield None.
+
+    :param path: the path, e.g. ``"tel"`` or ``"meta.role"``
+    :type path: str
+    :return: a function returning the value at the path
+    :rtype: Callable[[Any], Any]
+    """
+    if not _SIMPLE_PATH.fullmatch(path):
+        return lambda obj: _get(obj, path)
+
+    keys = tuple(path.split("."))
+    if len(keys) == 1:
+        key = keys[0]
+
+        def get_key(obj):
+            if type(obj) is dict:
+                return obj.get(key)
+            return _get(obj, path)
+
+        return get_key
+
+    def get_path(obj):
+        for key in keys:
+            if isinstance(obj, dict):
+                obj = obj.get(key)
+            elif isinstance(obj, list) and key.isdigit():
+                index = int(key)
+                obj = obj[index] if index < len(obj) else None
+            else:
+                obj = _get(obj, key)
+            if obj is None:
+                return None
+        return obj
+
+    return get_path
+
+
+class ListIndex:
+    __slots__ = ("getter", "many", "_items", "_length", "_positions")
+
+    def __init__(self, getter: Callable[[dict], Any], many: bool = False) -> None:
+        """
+        Initialize an index over a list of dicts.
+
+        :param getter: returns the indexed value of an entry
+        :type getter: Callable[[dict], Any]
+        :param many: the getter returns a list of values, and the entry is
+            indexed under each of them
+        :type many: bool
+        """
+        self.getter = getter
+        self.many = many
+        self._items = None
+        self._length = 0
+        self._positions: Dict[Any, List[int]] = {}
+
+    def _values(self, item: dict) -> Iterable[Any]:
+        value = self.getter(item)
+        return value if self.many else (value,)
+
+    def _add(self, positions: dict, position: int, item: dict) -> None:
+        for value in self._values(item):
+            try:
+                entries = positions.setdefault(value, [])
+            except TypeError:
+                # unhashable values are not indexed
+                continue
+            if not entries or entries[-1] != position:
+                entries.append(position)
+
+    def _rebuild(self, items: list) -> None:
+        positions = {}
+        for position, item in enumerate(items):
+            self._add(positions, position, item)
+        self._items = items
+        self._length = len(items)
+        self._positions = positions
+
+    def _sync(self, items: list) -> None:
+        if items is not self._items or len(items) != self._length:
+            self._rebuild(items)
+
+    def positions(self, items: list, value: Any) -> List[int]:
+        """
+        Returns the positions of the entries holding a value.
+
+        :param items: the indexed list
+        :type items: list
+        :param value: the value to look up
+        :type value: Any
+        :return: the positions in ascending order
+        :rtype: list[int]
+        """
+        self._sync(items)
+        try:
+            positions = self._positions.get(value, [])
+        except TypeError:
+            return [position for position, item in enumerate(items) if value in self._values(item)]
+        if any(value not in self._values(items[position]) for position in positions):
+            # an entry was edited in place since the index was built
+            self._rebuild(items)
+            positions = self._positions.get(value, [])
+        return list(positions)
+
+    def first(self, items: list, value: Any) -> Optional[int]:
+        """
+        Returns the position of the first entry holding a value.
+
+        :param items: the indexed list
+        :type items: list
+        :param value: the value to look up
+        :type value: Any
+        :return: the position, or None if no entry holds the value
+        :rtype: int or None
+        """
+        positions = self.positions(items, value)
+        return positions[0] if positions else None
+
+    def appended(self, items: list) -> None:
+        """
+        Record that an entry was appended to the list.
+
+        :param items: the indexed list, with the new entry at the end
+        :type items: list
+        :return: None
+        :rtype: None
+        """
+        self.extended(items, len(items) - 1)
+
+    def extended(self, items: list, start: int) -> None:
+        """
+        Record that entries were appended to the list.
+
+        :param items: the indexed list
+        :type items: list
+        :param start: the position of the first new entry
+        :type start: int
+        :return: None
+        :rtype: None
+        """
+        if items is not self._items or start != self._length:
+            # out of sync already, rebuild on the next lookup
+            self._items = None
+            return
+        for position in range(start, len(items)):
+            self._add(self._positions, position, items[position])
+        self._length = len(items)
+
+    def invalidate(self) -> None:
+        """
+        Drop the index so that it is rebuilt on the next lookup.
+
+        :return: None
+        :rtype: None
+        """
+        self._items = None
+        self._positions = {}
@@ -0,0 +1,383 @@
+"""
+Streaming reader and writer for vCon corpora stored as JSON Lines.
+
+A corpus holds one vCon per line. :class:`VconReader` and
+:func:`iter_vcons` read it one line at a time and :class:`VconWriter`
+appends one line per vCon, so memory use does not grow with the size of
+the corpus. gzip files (``.gz``) are handled with the standard library and
+zstd files (``.zst``) with the optional ``zstandard`` package. When reading
+a file object that can peek or seek, the compression is detected from its
+first bytes.
+
+Lines that fail to parse are skipped by default. Each one is reported to
+the ``on_error`` callback, counted in :class:`CorpusStats` and kept in
+``VconReader.errors`` up to ``max_errors``.
+"""
+import gzip
+import io
+import os
+import time
+from typing import IO, Callable, Iterator, List, Optional, Tuple, Union
+from .vcon import Vcon
+from .lazy import parse_lazy
+from . import json_engine
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+PathOrFile = Union[str, os.PathLike, IO]
+
+
+class CorpusStats:
+    __slots__ = ("lines", "vcons", "errors", "bytes", "started")
+
+    def __init__(self) -> None:
+        """
+        Throughput counters for a corpus reader or writer.
+
+        ``bytes`` counts uncompressed JSON Lines bytes.
+        """
+        self.lines = 0
+        self.vcons = 0
+        self.errors = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Returns the seconds since the reader or writer was created.
+
+        :return: the elapsed time in seconds
+        :rtype: float
+        """
+        return time.perf_counter() - self.started
+
+    @property
+    def vcons_per_second(self) -> float:
+        """
+        Returns the number of vCons read or written per second.
+
+        :return: the vCon throughput
+        :rtype: float
+        """
+        elapsed = self.elapsed
+        return self.vcons / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """
+        Returns the number of uncompressed bytes read or written per second.
+
+        :return: the byte throughput
+        :rtype: float
+        """
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CorpusStats(lines={self.lines}, vcons={self.vcons}, errors={self.errors}, "
+            f"bytes={self.bytes}, vcons_per_second={self.vcons_per_second:.0f})"
+        )
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compression requires the zstandard package") from None
+    return zstandard
+
+
+def _compression_for(path: Union[str, os.PathLike], compression: Optional[str]) -> Optional[str]:
+    if compression is not None:
+        if compression not in ("gzip", "zstd", "none"):
+            raise ValueError(f"Unknown compression: {compression}")
+        return None if compression == "none" else compression
+    return _SUFFIXES.get(os.path.splitext(os.fspath(path))[1].lower())
+
+
+def _sniff_compression(fp: IO) -> Optional[str]:
+    # look at the first bytes of a binary file object without consuming them
+    if hasattr(fp, "peek"):
+        head = fp.peek(4)[:4]
+    elif fp.seekable():
+        position = fp.tell()
+        head = fp.read(4)
+        fp.seek(position)
+    else:
+        return None
+    if head.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(_ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def _open_read(source: PathOrFile, compression: Optional[str], buffer_size: int) -> Tuple[IO, List[IO]]:
+    """
+    Open a corpus for reading.
+
+    :return: the stream to read lines from and the streams to close
+    :rtype: tuple
+    """
+    if isinstance(source, (str, os.PathLike)):
+        raw = open(source, "rb", buffering=buffer_size)
+        compression = _compression_for(source, compression)
+        owned = [raw]
+    else:
+        raw = source
+        owned = []
+        if isinstance(raw, io.TextIOBase):
+            return raw, owned
+        if compression is None:
+            compression = _sniff_compression(raw)
+        elif compression == "none":
+            compression = None
+
+    if compression == "gzip":
+        stream = io.BufferedReader(gzip.GzipFile(fileobj=raw, mode="rb"), buffer_size)
+    elif compression == "zstd":
+        reader = _zstandard().ZstdDecompressor().stream_reader(raw, read_size=buffer_size, closefd=False)
+        stream = io.BufferedReader(reader, buffer_size)
+    else:
+        return raw, owned
+    return stream, [stream] + owned
+
+
+class VconReader:
+    def __init__(
+        self,
+        source: PathOrFile,
+        *,
+        compression: Optional[str] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        lazy: bool = False,
+        engine: Optional[str] = None,
+        on_error: Optional[Callable[[int, bytes, Exception], None]] = None,
+        strict: bool = False,
+        max_errors: int = 100,
+    ) -> None:
+        """
+        Initialize a reader over a JSON Lines corpus of vCons.
+
+        :param source: a path, or a binary or text file object
+        :type source: Union[str, os.PathLike, IO]
+        :param compression: ``"gzip"``, ``"zstd"`` or ``"none"``; by default
+            it is taken from the file suffix, or detected for file objects
+        :type compression: str or None
+        :param buffer_size: the read buffer size in bytes
+        :type buffer_size: int
+        :param lazy: defer decoding of large bodies, see :mod:`vcon.lazy`
+        :type lazy: bool
+        :param engine: the JSON engine to use instead of the default one
+        :type engine: str or None
+        :param on_error: called with the line number, the line and the
+            exception for every line that fails to parse
+        :type on_error: Callable[[int, bytes, Exception], None] or None
+        :param strict: raise on the first bad line instead of skipping it
+        :type strict: bool
+        :param max_errors: the number of errors kept in ``errors``
+        :type max_errors: int
+        """
+        self._stream, self._owned = _open_read(source, compression, buffer_size)
+        self.lazy = lazy
+        self.engine = engine
+        self.on_error = on_error
+        self.strict = strict
+        self.max_errors = max_errors
+        self.errors: List[Tuple[int, Exception]] = []
+        self.stats = CorpusStats()
+
+    def __iter__(self) -> Iterator[Vcon]:
+        stats = self.stats
+        lazy, engine = self.lazy, self.engine
+        for line in self._stream:
+            stats.lines += 1
+            stats.bytes += len(line)
+            if not line.strip():
+                continue
+            try:
+                vcon_dict = parse_lazy(line) if lazy else json_engine.loads(line, engine)
+                if not isinstance(vcon_dict, dict):
+                    raise ValueError(f"Expected a JSON object, got {type(vcon_dict).__name__}")
+                # the decoded dictionary is not shared with anyone, so adopt it
+                vcon = Vcon(vcon_dict, copy=False)
+            except Exception as e:
+                if self.strict:
+                    raise
+                self._report(stats.lines, line, e)
+                continue
+            stats.vcons += 1
+            yield vcon
+
+    def _report(self, line_number: int, line: Union[bytes, str], error: Exception) -> None:
+        self.stats.errors += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_number, error))
+        if self.on_error is not None:
+            self.on_error(line_number, line, error)
+
+    def close(self) -> None:
+        """
+        Close the streams opened by the reader. File objects passed in by
+        the caller are left open.
+
+        :return: None
+        :rtype: None
+        """
+        for stream in self._owned:
+            stream.close()
+        self._owned = []
+
+    def __enter__(self) -> "VconReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def iter_vcons(source: PathOrFile, **options) -> Iterator[Vcon]:
+    """
+    Iterate over the vCons of a JSON Lines corpus.
+
+    Takes the same options as :class:`VconReader`. Bad lines are skipped
+    unless ``strict=True``; use a :class:`VconReader` directly to inspect
+    the errors and counters afterwards.
+
+    :param source: a path, or a binary or text file object
+    :type source: Union[str, os.PathLike, IO]
+    :return: an iterator of Vcon objects
+    :rtype: Iterator[Vcon]
+    """
+    with VconReader(source, **options) as reader:
+        yield from reader
+
+
+class VconWriter:
+    def __init__(
+        self,
+        target: PathOrFile,
+        *,
+        compression: Optional[str] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        engine: Optional[str] = None,
+        compat: Optional[bool] = None,
+        level: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize a writer that appends vCons to a JSON Lines corpus.
+
+        :param target: a path, or a binary file object
+        :type target: Union[str, os.PathLike, IO]
+        :param compression: ``"gzip"``, ``"zstd"`` or ``"none"``; by default
+            it is taken from the file suffix, and no compression is used
+            for file objects
+        :type compression: str or None
+        :param buffer_size: the write buffer size in bytes
+        :type buffer_size: int
+        :param engine: the JSON engine to use instead of the default one
+        :type engine: str or None
+        :param compat: override the JSON engine compatibility mode, see
+            :mod:`vcon.json_engine`
+        :type compat: bool or None
+        :param level: the compression level
+        :type level: int or None
+        """
+        if isinstance(target, (str, os.PathLike)):
+            raw = open(target, "wb", buffering=buffer_size)
+            compression = _compression_for(target, compression)
+            self._owned = [raw]
+        else:
+            raw = target
+            compression = None if compression == "none" else compression
+            if compression not in (None, "gzip", "zstd"):
+                raise ValueError(f"Unknown compression: {compression}")
+            self._owned = []
+
+        if compression == "gzip":
+            stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9 if level is None else level)
+            self._owned.insert(0, stream)
+        elif compression == "zstd":
+            zstandard = _zstandard()
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+            stream = compressor.stream_writer(raw, write_size=buffer_size, closefd=False)
+            self._owned.insert(0, stream)
+        else:
+            stream = raw
+        self._stream = stream
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self.buffer_size = buffer_size
+        self.engine = engine
+        self.compat = compat
+        self.stats = CorpusStats()
+
+    def write(self, vcon: Vcon) -> None:
+        """
+        Append a vCon to the corpus.
+
+        :param vcon: the vCon to write
+        :type vcon: Vcon
+        :return: None
+        :rtype: None
+        """
+        line = vcon.to_json(engine=self.engine, compat=self.compat).encode("utf-8") + b"\n"
+        self._buffer.append(line)
+        self._buffered += len(line)
+        self.stats.vcons += 1
+        self.stats.lines += 1
+        self.stats.bytes += len(line)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, vcons) -> None:
+        """
+        Append several vCons to the corpus.
+
+        :param vcons: the vCons to write
+        :type vcons: Iterable[Vcon]
+        :return: None
+        :rtype: None
+        """
+        for vcon in vcons:
+            self.write(vcon)
+
+    def flush(self) -> None:
+        """
+        Write the buffered lines to the underlying stream.
+
+        :return: None
+        :rtype: None
+        """
+        if self._buffer:
+            self._stream.write(b"".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self) -> None:
+        """
+        Flush the buffered lines and close the streams opened by the
+        writer. File objects passed in by the caller are flushed but left
+        open.
+
+        :return: None
+        :rtype: None
+        """
+        self.flush()
+        if self._owned:
+            for stream in self._owned:
+                stream.close()
+            self._owned = []
+        elif hasattr(self._stream, "flush"):
+            self._stream.flush()
+
+    def __enter__(self) -> "VconWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
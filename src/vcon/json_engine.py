@@ -0,0 +1,200 @@
+"""
+Pluggable JSON backend for vCon serialization.
+
+All of the JSON encoding and decoding done by :class:`vcon.Vcon` goes
+through :func:`dumps` and :func:`loads`. The backend is chosen once at
+module level with :func:`set_json_engine`, or per call by passing an
+``engine`` name. Supported engines are ``"orjson"``, ``"ujson"`` and the
+standard library ``"json"``; ``"auto"`` picks the fastest one installed.
+
+Compatibility mode
+------------------
+With ``compat=True`` (the default) :func:`dumps` produces exactly the same
+bytes as ``json.dumps(obj)``, which is what ``Vcon.to_json`` has always
+returned, and :func:`loads` decodes with ``json.loads``. The engines do not
+accept everything the standard library does: orjson rejects ``NaN``, which
+``json.dumps`` emits, and turns integers wider than 64 bits into floats.
+With ``compat=False`` the engine's own encoder and decoder are used and the
+output is compact UTF-8 JSON (``separators=(",", ":")``,
+``ensure_ascii=False``). Engines agree on this form for ordinary vCon
+content but may differ in corner cases such as float exponents, so use
+compatibility mode wherever the exact bytes matter.
+
+Naming an engine opts into it: ``set_json_engine("orjson")`` and a per-call
+``engine="orjson"`` turn compatibility mode off unless ``compat`` is given.
+Only ``"auto"``, which the module starts with, keeps it on. Asking for a
+specific engine together with ``compat=True`` is an error, since the output
+would not come from that engine.
+"""
+import json
+from typing import Any, Callable, Optional, Tuple
+from .lazy import LazyBody
+
+ENGINES = ("orjson", "ujson", "json")
+
+_engine = "json"
+_compat = True
+_loaded = {}
+
+
+def _default(obj: Any) -> Any:
+    # The stdlib encoder reaches lazy bodies through LazyDict.items(), the
+    # C extensions read dict subclasses directly and hand them to us
+    if isinstance(obj, LazyBody):
+        return obj.load()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _load_engine(name: str) -> Tuple[Callable[[Any], str], Callable[[Any], Any]]:
+    """
+    Import an engine and return its native ``(dumps, loads)`` pair.
+
+    :param name: the engine name
+    :type name: str
+    :return: the native dumps and loads functions
+    :rtype: tuple
+    :raises ValueError: if the engine name is unknown
+    :raises ImportError: if the engine is not installed
+    """
+    if name in _loaded:
+        return _loaded[name]
+
+    if name == "json":
+        functions = (_stdlib_dumps, json.loads)
+    elif name == "orjson":
+        import orjson
+
+        def orjson_dumps(obj):
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        functions = (orjson_dumps, orjson.loads)
+    elif name == "ujson":
+        import ujson
+
+        def ujson_dumps(obj):
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=_default)
+
+        def ujson_loads(s):
+            try:
+                return ujson.loads(s)
+            except ValueError:
+                # Re-parse with the standard library so callers always see
+                # a json.JSONDecodeError
+                return json.loads(s)
+
+        functions = (ujson_dumps, ujson_loads)
+    else:
+        raise ValueError(f"Unknown JSON engine: {name}")
+
+    _loaded[name] = functions
+    return functions
+
+
+def _resolve(name: str) -> str:
+    if name != "auto":
+        return name
+    for candidate in ENGINES:
+        try:
+            _load_engine(candidate)
+        except ImportError:
+            continue
+        return candidate
+    return "json"
+
+
+def set_json_engine(engine: str = "auto", compat: Optional[bool] = None) -> str:
+    """
+    Select the JSON engine used by default for all vCon serialization.
+
+    :param engine: ``"auto"``, ``"orjson"``, ``"ujson"`` or ``"json"``
+    :type engine: str
+    :param compat: keep :func:`dumps` output byte-identical to ``json.dumps``
+        and decode with ``json.loads``; by default on for ``"auto"`` and off
+        for a named engine
+    :type compat: bool or None
+    :return: the name of the engine that was selected
+    :rtype: str
+    :raises ImportError: if the requested engine is not installed
+    :raises ValueError: if a named engine is combined with ``compat=True``
+    """
+    global _engine, _compat
+    compat = _check_compat(engine, compat)
+    name = _resolve(engine)
+    _load_engine(name)
+    _engine = name
+    _compat = compat
+    return name
+
+
+def _check_compat(engine: Optional[str], compat: Optional[bool]) -> bool:
+    # a named engine opts out of compatibility mode
+    named = engine not in (None, "auto")
+    if compat is None:
+        return not named
+    if compat and named and engine != "json":
+        raise ValueError(f"compat=True encodes with the standard library, not {engine}; pass compat=False")
+    return compat
+
+
+def get_json_engine() -> str:
+    """
+    Returns the name of the default JSON engine.
+
+    :return: the engine name
+    :rtype: str
+    """
+    return _engine
+
+
+def dumps(obj: Any, engine: Optional[str] = None, compat: Optional[bool] = None) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    :param obj: the object to serialize
+    :type obj: Any
+    :param engine: the engine to use instead of the default one; its own
+        encoder is used unless ``compat`` is given
+    :type engine: str or None
+    :param compat: override the compatibility mode
+    :type compat: bool or None
+    :return: the JSON string
+    :rtype: str
+    :raises ValueError: if a named engine is combined with ``compat=True``
+    """
+    if engine is None:
+        compat = _compat if compat is None else compat
+    else:
+        compat = _check_compat(engine, compat)
+    if compat:
+        return json.dumps(obj)
+    return _load_engine(_resolve(engine) if engine else _engine)[0](obj)
+
+
+def loads(s: Any, engine: Optional[str] = None, compat: Optional[bool] = None) -> Any:
+    """
+    Deserialize a JSON string or bytes.
+
+    :param s: the JSON document
+    :type s: Union[str, bytes]
+    :param engine: the engine to use instead of the default one
+    :type engine: str or None
+    :param compat: override the compatibility mode; in compatibility mode
+        the standard library decodes unless an engine is passed
+    :type compat: bool or None
+    :return: the decoded object
+    :rtype: Any
+    :raises json.JSONDecodeError: if the document is not valid JSON
+    """
+    if engine:
+        return _load_engine(_resolve(engine))[1](s)
+    if _compat if compat is None else compat:
+        return json.loads(s)
+    return _load_engine(_engine)[1](s)
+
+
+set_json_engine()
@@ -0,0 +1,223 @@
+"""
+Lazy parsing of vCon JSON documents.
+
+:func:`parse_lazy` decodes everything in a vCon except large ``body``
+strings, which stay in the source text as :class:`LazyBody` references and
+are only decoded when read. Routing and tagging stages that never touch
+the inline media therefore pay for the metadata only.
+
+Objects holding a lazy body are :class:`LazyDict` instances. They behave
+like ordinary dicts: indexing, ``get``, iteration, ``items()``, ``dict(d)``,
+``{**d}``, copying, pickling and JSON encoding all see the decoded body.
+"""
+import json
+import re
+from json.decoder import scanstring
+from typing import Union
+
+# Body strings shorter than this are decoded with the rest of the document
+LAZY_BODY_THRESHOLD = 4096
+
+_KEY_SEPARATOR = re.compile(r'\s*:\s*"')
+_PLACEHOLDER = "\x00vcon-lazy:"
+
+
+class LazyBody:
+    __slots__ = ("source", "start")
+
+    def __init__(self, source: str, start: int) -> None:
+        """
+        Reference to a JSON string literal that has not been decoded yet.
+
+        :param source: the JSON document containing the literal
+        :type source: str
+        :param start: the offset of the literal's opening quote
+        :type start: int
+        """
+        self.source = source
+        self.start = start
+
+    def load(self) -> str:
+        """
+        Decode the string literal.
+
+        :return: the decoded string
+        :rtype: str
+        """
+        return scanstring(self.source, self.start + 1)[0]
+
+    def __repr__(self) -> str:
+        return f"LazyBody(start={self.start})"
+
+
+class LazyDict(dict):
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is LazyBody:
+            value = value.load()
+            dict.__setitem__(self, key, value)
+        return value
+
+    # Overriding __iter__ makes dict(d), {**d} and d.update() go through
+    # __getitem__ instead of copying the raw values
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if dict.__contains__(self, key):
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def pop(self, key, *default):
+        if dict.__contains__(self, key):
+            value = self[key]
+            dict.__delitem__(self, key)
+            return value
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self.load()
+        return dict.popitem(self)
+
+    def items(self):
+        self.load()
+        return dict.items(self)
+
+    def values(self):
+        self.load()
+        return dict.values(self)
+
+    def copy(self) -> dict:
+        self.load()
+        return dict(dict.items(self))
+
+    def __eq__(self, other) -> bool:
+        self.load()
+        if isinstance(other, LazyDict):
+            other.load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        self.load()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def is_loaded(self, key) -> bool:
+        """
+        Check whether the value stored under a key has been decoded.
+
+        :param key: the key to check
+        :type key: str
+        :return: False if the value is still a reference into the source
+        :rtype: bool
+        """
+        return type(dict.get(self, key)) is not LazyBody
+
+    def load(self) -> None:
+        """
+        Decode every value that is still a reference into the source.
+
+        :return: None
+        :rtype: None
+        """
+        for key, value in dict.items(self):
+            if type(value) is LazyBody:
+                dict.__setitem__(self, key, value.load())
+
+
+def _escaped(source: str, index: int) -> bool:
+    # A quote is escaped when preceded by an odd number of backslashes
+    backslashes = 0
+    index -= 1
+    while index >= 0 and source[index] == "\\":
+        backslashes += 1
+        index -= 1
+    return backslashes % 2 == 1
+
+
+def _find_lazy_bodies(source: str, threshold: int) -> list:
+    """
+    Find the ``"body"`` string values that are at least ``threshold`` long.
+
+    In valid JSON a ``"body"`` key followed by a string can only be
+    mistaken for text inside another string when its opening quote is
+    escaped, i.e. preceded by an odd number of backslashes.
+
+    :return: a list of (start, end) offsets of the string literals
+    :rtype: list
+    """
+    spans = []
+    pos = 0
+    while True:
+        key = source.find('"body"', pos)
+        if key == -1:
+            return spans
+        pos = key + 1
+        separator = _KEY_SEPARATOR.match(source, key + 6)
+        if separator is None or _escaped(source, key):
+            continue
+        start = separator.end() - 1
+        end = source.find('"', start + 1)
+        while end != -1 and _escaped(source, end):
+            end = source.find('"', end + 1)
+        if end == -1:
+            # Unterminated string, let the JSON decoder report it
+            return spans
+        end += 1
+        if end - start >= threshold:
+            spans.append((start, end))
+        pos = end
+
+
+def parse_lazy(json_string: Union[str, bytes], threshold: int = LAZY_BODY_THRESHOLD) -> dict:
+    """
+    Decode a vCon JSON document, leaving large body strings undecoded.
+
+    :param json_string: a JSON string representing a vCon
+    :type json_string: Union[str, bytes]
+    :param threshold: the minimum length in characters of a body literal
+        that is left undecoded
+    :type threshold: int
+    :return: the decoded vCon dictionary
+    :rtype: dict
+    :raises json.JSONDecodeError: if the document is not valid JSON
+    """
+    if isinstance(json_string, (bytes, bytearray)):
+        json_string = json_string.decode("utf-8")
+
+    spans = _find_lazy_bodies(json_string, threshold)
+    if not spans:
+        return json.loads(json_string)
+
+    pieces = []
+    pos = 0
+    for n, (start, end) in enumerate(spans):
+        pieces.append(json_string[pos:start])
+        pieces.append(f'"\\u0000vcon-lazy:{n}"')
+        pos = end
+    pieces.append(json_string[pos:])
+
+    def object_hook(obj: dict) -> dict:
+        body = obj.get("body")
+        if type(body) is str and body.startswith(_PLACEHOLDER):
+            obj = LazyDict(obj)
+            start = spans[int(body[len(_PLACEHOLDER):])][0]
+            dict.__setitem__(obj, "body", LazyBody(json_string, start))
+        return obj
+
+    return json.loads("".join(pieces), object_hook=object_hook)
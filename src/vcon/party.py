@@ -1,9 +1,24 @@
 from typing import Optional
 from vcon.civic_address import CivicAddress
 from datetime import datetime
+from .serializers import compile_to_dict
 
 
 class Party:
+    __slots__ = (
+        "tel",
+        "stir",
+        "mailto",
+        "name",
+        "validation",
+        "gmlpos",
+        "civicaddress",
+        "uuid",
+        "role",
+        "contact_list",
+        "meta",
+    )
+
     def __init__(self,
                  tel: Optional[str] = None,
                  stir: Optional[str] = None,
@@ -40,30 +55,44 @@ class Party:
         :param contact_list: Contact list of the party
         :type contact_list: str | None
         """
-        # copy the values that are not None
-        # TODO: should we allow changing the values of the object?
-        #       for now, we just use the values that are not None
-        #       and ignore the other values
-        #       (this is also how the old code worked)
-        for key, value in locals().items():
-            if value is not None:
-                setattr(self, key, value)
+        self.tel = tel
+        self.stir = stir
+        self.mailto = mailto
+        self.name = name
+        self.validation = validation
+        self.gmlpos = gmlpos
+        self.civicaddress = civicaddress
+        self.uuid = uuid
+        self.role = role
+        self.contact_list = contact_list
+        self.meta = meta
 
     def to_dict(self):
-        # copy the attributes that are not None
-        # TODO: should we allow changing the values of the object?
-        #       for now, we just use the values that are not None
-        #       and ignore the other values
-        #       (this is also how the old code worked)
-        party_dict = {}
-        for key, value in self.__dict__.items():
-            # Don't include self in the dict
-            if value is not None and key != "self":
-                party_dict[key] = value
-        return party_dict
+        """
+        Returns a dictionary representation of the Party object.
+
+        :return: the fields that are not None, in declaration order
+        :rtype: dict
+        """
+        return _party_to_dict(self)
+
+
+def _civicaddress_to_dict(civicaddress):
+    # a CivicAddress is serialized, a plain dict is passed through
+    to_dict = getattr(civicaddress, "to_dict", None)
+    return to_dict() if to_dict is not None else civicaddress
+
+
+_party_to_dict = compile_to_dict(
+    "Party",
+    Party.__slots__,
+    converters={"civicaddress": _civicaddress_to_dict},
+)
 
 
 class PartyHistory:
+    __slots__ = ("party", "event", "time")
+
     def __init__(self, party: int, event: str, time: datetime):
         """
         Initialize a new PartyHistory object.
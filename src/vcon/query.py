@@ -0,0 +1,117 @@
+"""
+Compiled queries over the dialogs of a vCon.
+
+A :class:`DialogQuery` turns a set of conditions into a predicate once and
+then runs it over the raw dialog dicts, without building a
+:class:`vcon.dialog.Dialog` per entry. Timestamps are compared as
+datetimes through the cached parser in :mod:`vcon.timestamps`; timestamps
+without an offset are taken to be UTC.
+"""
+from datetime import datetime, timezone
+from typing import Callable, Collection, List, Optional, Union
+from .timestamps import parse_timestamp
+
+
+def _as_set(value: Union[str, Collection[str]]) -> frozenset:
+    if isinstance(value, str):
+        return frozenset((value,))
+    return frozenset(value)
+
+
+def _as_utc(value: Union[datetime, str]) -> datetime:
+    value = parse_timestamp(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _has_party(parties, party: int) -> bool:
+    # a dialog party entry is an index or a list of indices for a channel
+    if not parties:
+        return False
+    if party in parties:
+        return True
+    return any(isinstance(p, list) and party in p for p in parties)
+
+
+class DialogQuery:
+    def __init__(
+        self,
+        *,
+        type: Union[str, Collection[str], None] = None,
+        mimetype: Union[str, Collection[str], None] = None,
+        party: Optional[int] = None,
+        originator: Optional[int] = None,
+        since: Union[datetime, str, None] = None,
+        until: Union[datetime, str, None] = None,
+    ) -> None:
+        """
+        Compile a dialog query. A dialog matches when it meets every
+        condition that is given.
+
+        :param type: the dialog type, or a collection of accepted types
+        :type type: str or Collection[str] or None
+        :param mimetype: the MIME type, or a collection of accepted MIME types
+        :type mimetype: str or Collection[str] or None
+        :param party: the index of a party that takes part in the dialog
+        :type party: int or None
+        :param originator: the index of the party that originated the dialog
+        :type originator: int or None
+        :param since: match dialogs starting at or after this time
+        :type since: datetime or str or None
+        :param until: match dialogs starting before this time
+        :type until: datetime or str or None
+        """
+        checks: List[Callable[[dict], bool]] = []
+        if type is not None:
+            types = _as_set(type)
+            checks.append(lambda dialog: dialog.get("type") in types)
+        if mimetype is not None:
+            mimetypes = _as_set(mimetype)
+            checks.append(lambda dialog: dialog.get("mimetype") in mimetypes)
+        if party is not None:
+            checks.append(lambda dialog: _has_party(dialog.get("parties"), party))
+        if originator is not None:
+            checks.append(lambda dialog: dialog.get("originator") == originator)
+        if since is not None or until is not None:
+            lower = _as_utc(since) if since is not None else None
+            upper = _as_utc(until) if until is not None else None
+
+            def in_range(dialog: dict) -> bool:
+                start = dialog.get("start")
+                if not start:
+                    return False
+                start = _as_utc(start)
+                return (lower is None or start >= lower) and (upper is None or start < upper)
+
+            checks.append(in_range)
+        self._checks = tuple(checks)
+
+    def matches(self, dialog: dict) -> bool:
+        """
+        Check whether a dialog dict meets every condition.
+
+        :param dialog: the dialog dict
+        :type dialog: dict
+        :return: True if the dialog matches
+        :rtype: bool
+        """
+        for check in self._checks:
+            if not check(dialog):
+                return False
+        return True
+
+    def indices(self, dialogs: list) -> List[int]:
+        """
+        Returns the indices of the matching dialogs.
+
+        :param dialogs: the dialog dicts of a vCon
+        :type dialogs: list
+        :return: the indices of the matching dialogs in order
+        :rtype: list[int]
+        """
+        if len(self._checks) == 1:
+            check = self._checks[0]
+            return [i for i, dialog in enumerate(dialogs) if check(dialog)]
+        matches = self.matches
+        return [i for i, dialog in enumerate(dialogs) if matches(dialog)]
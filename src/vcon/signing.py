@@ -0,0 +1,716 @@
+"""
+Reusable signing and verification of vCons.
+
+:meth:`vcon.Vcon.sign` and :meth:`vcon.Vcon.verify` accept raw keys and
+parse them on every call. A :class:`VconSigner` or :class:`VconVerifier`
+parses its keys once and reuses the encoded protected header, so signing
+or verifying a vCon costs one serialization and the signature operation.
+
+The algorithm follows from the key type: RS256 for RSA, ES256 for P-256
+and EdDSA for Ed25519 keys, see :func:`generate_key_pair`.
+
+A :class:`KeyRing` holds public keys indexed by ``kid``, and can be loaded
+from a JWKS document. A signer created with a ``kid`` puts it in the
+protected header, and a verifier over a key ring uses it to pick the key.
+
+In manifest mode, see :func:`build_manifest`, the signed payload is a
+compact list of digests instead of the whole vCon, so the cost of signing
+and the size of the stored payload do not grow with inline media.
+
+A detached signer (RFC 7797, ``"b64": false``) signs the canonical JSON
+of the vCon without its signature members and does not store the payload
+at all; verification recomputes it, see :func:`detached_payload`.
+
+:func:`sign_many` and :func:`verify_many` spread the signature operations
+of many vCons over a pool of worker processes or threads. Signers,
+verifiers and key rings pickle their keys as JWKs to reach the workers.
+"""
+import concurrent.futures
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from authlib.common.encoding import json_b64encode, to_bytes, urlsafe_b64decode, urlsafe_b64encode
+from authlib.jose import ECKey, JsonWebKey, JsonWebSignature, OKPKey, RSAKey
+from authlib.jose.rfc7517 import AsymmetricKey
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from . import json_engine
+
+# The JWS algorithm used for each type of key
+KEY_ALGORITHMS = {RSAKey: "RS256", ECKey: "ES256", OKPKey: "EdDSA"}
+# The only curve accepted for each type of elliptic curve key
+_KEY_CURVES = {ECKey: "P-256", OKPKey: "Ed25519"}
+
+# Per-vCon results of verify_many and sign_many
+OK = "ok"
+BAD_SIGNATURE = "bad_signature"
+MALFORMED = "malformed"
+
+_ALGORITHMS = JsonWebSignature.ALGORITHMS_REGISTRY
+
+# The content type in the protected header of manifest signatures
+MANIFEST_CONTENT_TYPE = "vcon-manifest+json"
+MANIFEST_VERSION = 1
+
+_ENTRY_SECTIONS = ("dialog", "attachments", "analysis")
+_UNSIGNED_MEMBERS = ("signatures", "payload")
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _digest(data: bytes) -> str:
+    return urlsafe_b64encode(hashlib.sha256(data).digest()).decode("ascii")
+
+
+def _body_digest(body: Any, previous: dict, digests: dict) -> str:
+    # dict and list bodies can be edited in place, so only string bodies
+    # are cached; the cache holds a reference to each, so an id is
+    # never reused by another body while its entry exists
+    if not isinstance(body, str):
+        return _digest(_canonical(body))
+    cached = previous.get(id(body))
+    if cached is not None and cached[0] is body:
+        digest = cached[1]
+    else:
+        digest = _digest(body.encode("utf-8"))
+    digests[id(body)] = (body, digest)
+    return digest
+
+
+def build_manifest(vcon) -> dict:
+    """
+    Returns the manifest signed in manifest mode.
+
+    The manifest holds a SHA-256 digest of the canonical JSON of every
+    top-level member of the vCon except ``signatures`` and ``payload``.
+    Dialogs, attachments and analysis get one digest per entry, covering
+    everything but the ``body``, and a separate digest of the body.
+    External dialogs are covered by their ``url``, ``alg`` and
+    ``signature`` fields. Digests of string bodies are cached on the vCon,
+    keyed by the body object, so signing or verifying the same vCon again
+    only hashes string bodies that were replaced; dict and list bodies are
+    hashed every time.
+
+    :param vcon: the vCon
+    :type vcon: Vcon
+    :return: the manifest
+    :rtype: dict
+    """
+    vcon_dict = vcon.vcon_dict
+    previous = vcon._body_digests
+    digests = {}
+    sections = {}
+    entries = {}
+    for key in vcon_dict:
+        if key in _UNSIGNED_MEMBERS:
+            continue
+        value = vcon_dict[key]
+        if key not in _ENTRY_SECTIONS or not isinstance(value, list):
+            sections[key] = _digest(_canonical(value))
+            continue
+        section = entries[key] = []
+        for entry in value:
+            if not isinstance(entry, dict) or "body" not in entry:
+                section.append({"entry": _digest(_canonical(entry))})
+                continue
+            rest = {name: entry[name] for name in entry if name != "body"}
+            section.append({"entry": _digest(_canonical(rest)), "body": _body_digest(entry["body"], previous, digests)})
+    vcon._body_digests = digests
+    return {"manifest": MANIFEST_VERSION, "alg": "sha256", "sections": sections, "entries": entries}
+
+
+def import_key(raw: Any) -> AsymmetricKey:
+    """
+    Parse a key once, for use by a signer, verifier or key ring.
+
+    RSA, P-256 and Ed25519 keys are supported.
+
+    :param raw: a ``cryptography`` key object, PEM data, a JWK dictionary
+        or an already parsed key
+    :type raw: Union[rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey, ed25519.Ed25519PrivateKey, bytes, str, dict,
+        AsymmetricKey]
+    :return: the parsed key
+    :rtype: AsymmetricKey
+    :raises ValueError: if the key type or curve is not supported
+    """
+    if isinstance(raw, AsymmetricKey):
+        key = raw
+    elif isinstance(raw, dict):
+        key = JsonWebKey.import_key(raw)
+    else:
+        if isinstance(raw, (bytes, str)):
+            data = to_bytes(raw)
+            if b"PRIVATE KEY" in data:
+                raw = serialization.load_pem_private_key(data, password=None)
+            else:
+                raw = serialization.load_pem_public_key(data)
+        key_cls = next(
+            (cls for cls in KEY_ALGORITHMS if isinstance(raw, (cls.PUBLIC_KEY_CLS, cls.PRIVATE_KEY_CLS))), None
+        )
+        if key_cls is None:
+            raise ValueError(f"Unsupported key type: {type(raw).__name__}")
+        key = key_cls.import_key(raw)
+    algorithm_for(key)
+    return key
+
+
+def algorithm_for(key: AsymmetricKey) -> str:
+    """
+    Returns the JWS algorithm used with a key.
+
+    :param key: the parsed key
+    :type key: AsymmetricKey
+    :return: the algorithm name: ``"RS256"``, ``"ES256"`` or ``"EdDSA"``
+    :rtype: str
+    :raises ValueError: if the key type or curve is not supported
+    """
+    for key_cls, algorithm in KEY_ALGORITHMS.items():
+        if isinstance(key, key_cls):
+            curve = _KEY_CURVES.get(key_cls)
+            if curve is not None and key.tokens.get("crv") != curve:
+                raise ValueError(f"Unsupported curve for {algorithm}: {key.tokens.get('crv')}")
+            return algorithm
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+
+def generate_key_pair(algorithm: str = "RS256") -> tuple:
+    """
+    Generate a new key pair for signing vCons.
+
+    EdDSA (Ed25519) signs much faster than RS256 and its signatures are a
+    quarter of the size; ES256 (P-256) sits in between.
+
+    :param algorithm: ``"RS256"`` for RSA-2048, ``"ES256"`` for P-256 or
+        ``"EdDSA"`` for Ed25519
+    :type algorithm: str
+    :return: a tuple containing the private key and public key
+    :rtype: tuple
+    :raises ValueError: if the algorithm is not supported
+    """
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"Unsupported algorithm: {algorithm}")
+    return private_key, private_key.public_key()
+
+
+class KeyRing:
+    def __init__(self, keys: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Initialize a key ring.
+
+        :param keys: keys to add, by ``kid``
+        :type keys: dict or None
+        """
+        self._keys: Dict[str, AsymmetricKey] = {}
+        for kid, key in (keys or {}).items():
+            self.add(key, kid)
+
+    @classmethod
+    def from_jwks(cls, source: Union[str, os.PathLike, dict]) -> "KeyRing":
+        """
+        Load a key ring from a JWKS document.
+
+        Keys without a ``kid`` are added under their RFC 7638 thumbprint.
+
+        :param source: the path of a JWKS file, or the parsed document
+        :type source: Union[str, os.PathLike, dict]
+        :return: the key ring
+        :rtype: KeyRing
+        :raises ValueError: if the document has no ``keys`` list
+        """
+        if not isinstance(source, dict):
+            with open(source, "rb") as fp:
+                source = json.load(fp)
+        keys = source.get("keys")
+        if not isinstance(keys, list):
+            raise ValueError("JWKS document must have a keys list")
+        ring = cls()
+        for jwk in keys:
+            ring.add(jwk, jwk.get("kid"))
+        return ring
+
+    def add(self, key: Any, kid: Optional[str] = None) -> str:
+        """
+        Add a key, replacing any key with the same ``kid``.
+
+        :param key: the key, in any form accepted by :func:`import_key`
+        :type key: Any
+        :param kid: the key id, by default the RFC 7638 thumbprint of the key
+        :type kid: str or None
+        :return: the key id
+        :rtype: str
+        """
+        key = import_key(key)
+        if kid is None:
+            kid = key.thumbprint()
+        self._keys[kid] = key
+        return kid
+
+    def get(self, kid: str) -> Optional[AsymmetricKey]:
+        """
+        Returns the key with a key id.
+
+        :param kid: the key id
+        :type kid: str
+        :return: the key, or None if there is none
+        :rtype: AsymmetricKey or None
+        """
+        return self._keys.get(kid)
+
+    def to_jwks(self) -> dict:
+        """
+        Returns the public keys as a JWKS document.
+
+        :return: the JWKS document
+        :rtype: dict
+        """
+        return {"keys": [dict(key.as_dict(is_private=False), kid=kid) for kid, key in self._keys.items()]}
+
+    def __contains__(self, kid: str) -> bool:
+        return kid in self._keys
+
+    def __reduce__(self):
+        return KeyRing.from_jwks, (self.to_jwks(),)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def items(self) -> Iterable[Tuple[str, AsymmetricKey]]:
+        """
+        Returns the key ids and keys.
+
+        :return: the ``(kid, key)`` pairs
+        :rtype: Iterable[tuple]
+        """
+        return self._keys.items()
+
+
+class VconSigner:
+    def __init__(
+        self, private_key: Any, kid: Optional[str] = None, manifest: bool = False, detached: bool = False
+    ) -> None:
+        """
+        Initialize a signer for a private key.
+
+        :param private_key: the private key, in any form accepted by
+            :func:`import_key`
+        :type private_key: Any
+        :param kid: a key id to put in the protected header
+        :type kid: str or None
+        :param manifest: sign a manifest of digests, see :func:`build_manifest`,
+            instead of the whole vCon
+        :type manifest: bool
+        :param detached: sign an unencoded payload (RFC 7797) that is not
+            stored in the vCon, see :func:`detached_payload`
+        :type detached: bool
+        :raises ValueError: if the key is not a supported private key
+        """
+        self.key = import_key(private_key)
+        if self.key.get_private_key() is None:
+            raise ValueError("Signing requires a private key")
+        self.kid = kid
+        self.manifest = manifest
+        self.detached = detached
+        self.algorithm = algorithm_for(self.key)
+        self._algorithm = _ALGORITHMS[self.algorithm]
+        protected = {"alg": self.algorithm, "typ": "JWS"}
+        if kid is not None:
+            protected["kid"] = kid
+        if manifest:
+            protected["cty"] = MANIFEST_CONTENT_TYPE
+        if detached:
+            protected["b64"] = False
+            protected["crit"] = ["b64"]
+        self._protected = json_b64encode(protected)
+
+    def sign_payload(self, payload: Union[str, bytes]) -> Tuple[str, str, str]:
+        """
+        Sign a payload with the JWS compact serialization.
+
+        :param payload: the payload
+        :type payload: Union[str, bytes]
+        :return: the encoded protected header, payload and signature; the
+            payload is empty for a detached signer
+        :rtype: tuple
+        """
+        if self.detached:
+            return self._protected.decode("ascii"), "", self.sign_segment(to_bytes(payload))
+        payload = urlsafe_b64encode(to_bytes(payload))
+        return self._protected.decode("ascii"), payload.decode("ascii"), self.sign_segment(payload)
+
+    def sign_segment(self, segment: bytes) -> str:
+        """
+        Sign the payload as it appears in the JWS signing input: base64url
+        encoded, or as is for a detached signer.
+
+        :param segment: the payload segment
+        :type segment: bytes
+        :return: the encoded signature
+        :rtype: str
+        """
+        signature = self._algorithm.sign(self._protected + b"." + segment, self.key)
+        return urlsafe_b64encode(signature).decode("ascii")
+
+    def sign(self, vcon) -> None:
+        """
+        Sign a vCon, storing the signature, and the payload unless the
+        signer is detached, in it.
+
+        :param vcon: the vCon to sign
+        :type vcon: Vcon
+        :return: None
+        :rtype: None
+        """
+        segment = self._segment(vcon)
+        self._store(vcon, segment, self.sign_segment(segment))
+
+    def _segment(self, vcon) -> bytes:
+        if self.detached:
+            return detached_payload(vcon, self.manifest)
+        if self.manifest:
+            payload = _canonical(build_manifest(vcon))
+        else:
+            # an earlier signature and payload are not signed again
+            payload = json_engine.dumps(_signed_members(vcon))
+        return urlsafe_b64encode(to_bytes(payload))
+
+    def _store(self, vcon, segment: bytes, signature: str) -> None:
+        vcon.vcon_dict["signatures"] = [{"protected": self._protected.decode("ascii"), "signature": signature}]
+        if self.detached:
+            vcon.vcon_dict.pop("payload", None)
+        else:
+            vcon.vcon_dict["payload"] = segment.decode("ascii")
+
+    def __reduce__(self):
+        # cryptography keys cannot be pickled, so worker processes get a JWK
+        return VconSigner, (self.key.as_dict(is_private=True), self.kid, self.manifest, self.detached)
+
+
+class VconVerifier:
+    def __init__(self, keys: Any) -> None:
+        """
+        Initialize a verifier.
+
+        :param keys: a key ring, or a single public key in any form
+            accepted by :func:`import_key` that is used whatever the
+            ``kid`` in the header
+        :type keys: Union[KeyRing, Any]
+        """
+        if isinstance(keys, KeyRing):
+            self.keys = keys
+            self._key = None
+        else:
+            self.keys = KeyRing()
+            self.keys.add(keys)
+            self._key = next(key for _, key in self.keys.items())
+
+    def _candidates(self, header: dict) -> Iterable[AsymmetricKey]:
+        if self._key is not None:
+            return (self._key,)
+        kid = header.get("kid")
+        if kid is not None:
+            key = self.keys.get(kid)
+            return () if key is None else (key,)
+        return (key for _, key in self.keys.items())
+
+    def verify_compact(self, protected: str, payload: Union[str, bytes], signature: str) -> bool:
+        """
+        Verify a JWS given as the parts of its compact serialization.
+
+        The algorithm in the protected header must be the one used with
+        the key, so a header cannot downgrade the check.
+
+        :param protected: the encoded protected header
+        :type protected: str
+        :param payload: the encoded payload, or the payload itself if the
+            header has ``"b64": false``
+        :type payload: Union[str, bytes]
+        :param signature: the encoded signature
+        :type signature: str
+        :return: True if the signature is valid for one of the keys
+        :rtype: bool
+        :raises ValueError: if the header or signature cannot be decoded
+        """
+        return self._verified_header(protected, payload, signature) is not None
+
+    def _verified_header(self, protected: str, payload: Union[str, bytes], signature: str) -> Optional[dict]:
+        header = _decode_header(protected)
+        try:
+            signature = urlsafe_b64decode(to_bytes(signature))
+        except Exception as e:
+            raise ValueError(f"Malformed JWS: {e}") from None
+        signing_input = to_bytes(protected) + b"." + to_bytes(payload)
+        for key in self._candidates(header):
+            algorithm = algorithm_for(key)
+            if header.get("alg") == algorithm and _ALGORITHMS[algorithm].verify(signing_input, signature, key):
+                return header
+        return None
+
+    def status_compact(self, protected: str, payload: Union[str, bytes], signature: str) -> str:
+        """
+        Check a JWS given as the parts of its compact serialization.
+
+        :param protected: the encoded protected header
+        :type protected: str
+        :param payload: the encoded payload, or the payload itself if the
+            header has ``"b64": false``
+        :type payload: Union[str, bytes]
+        :param signature: the encoded signature
+        :type signature: str
+        :return: :data:`OK`, :data:`BAD_SIGNATURE` or :data:`MALFORMED`
+        :rtype: str
+        """
+        try:
+            return OK if self.verify_compact(protected, payload, signature) else BAD_SIGNATURE
+        except ValueError:
+            return MALFORMED
+
+    def verify(self, vcon) -> bool:
+        """
+        Verify the signature of a vCon.
+
+        :param vcon: the vCon to verify
+        :type vcon: Vcon
+        :return: True if the signature is valid, False otherwise
+        :rtype: bool
+        :raises ValueError: if the vCon is not signed or its signature is
+            malformed
+        """
+        protected, payload, signature = _signed_parts(vcon)
+        header = self._verified_header(protected, payload, signature)
+        return header is not None and _content_matches(vcon, header, payload)
+
+    def __reduce__(self):
+        if self._key is not None:
+            return VconVerifier, (self._key.as_dict(is_private=False),)
+        return VconVerifier, (self.keys,)
+
+
+def _decode_header(protected: str) -> dict:
+    try:
+        header = json.loads(urlsafe_b64decode(to_bytes(protected)))
+    except Exception as e:
+        raise ValueError(f"Malformed JWS: {e}") from None
+    if not isinstance(header, dict):
+        raise ValueError("Malformed JWS: protected header is not an object")
+    # RFC 7515 section 4.1.11: reject critical parameters we do not know
+    crit = header.get("crit", [])
+    if not isinstance(crit, list) or not set(crit) <= {"b64"}:
+        raise ValueError(f"Malformed JWS: unsupported critical parameters {crit}")
+    if header.get("b64", True) is not True and (header["b64"] is not False or "b64" not in crit):
+        raise ValueError("Malformed JWS: b64 must be a boolean listed in crit")
+    return header
+
+
+def _signed_members(vcon) -> dict:
+    vcon_dict = vcon.vcon_dict
+    return {key: vcon_dict[key] for key in vcon_dict if key not in _UNSIGNED_MEMBERS}
+
+
+def detached_payload(vcon, manifest: bool = False) -> bytes:
+    """
+    Returns the payload signed by a detached signer.
+
+    It is the canonical JSON (sorted keys, no whitespace, UTF-8) of the vCon
+    without its ``signatures`` and ``payload`` members, or of its manifest.
+    Verification recomputes it from the vCon, so it is never stored.
+
+    :param vcon: the vCon
+    :type vcon: Vcon
+    :param manifest: use the manifest, see :func:`build_manifest`
+    :type manifest: bool
+    :return: the payload
+    :rtype: bytes
+    """
+    if manifest:
+        return _canonical(build_manifest(vcon))
+    return _canonical(_signed_members(vcon))
+
+
+def _content_matches(vcon, header: dict, payload: Union[str, bytes]) -> bool:
+    # a signed manifest must still describe the vCon; a full payload is
+    # the signed copy of the vCon itself, and a detached payload was
+    # recomputed from the vCon
+    if header.get("cty") != MANIFEST_CONTENT_TYPE or header.get("b64") is False:
+        return True
+    try:
+        signed = json.loads(urlsafe_b64decode(to_bytes(payload)))
+    except Exception as e:
+        raise ValueError(f"Malformed manifest: {e}") from None
+    return signed == build_manifest(vcon)
+
+
+def _content_status(vcon, parts: Tuple[str, Union[str, bytes], str]) -> str:
+    protected, payload, _ = parts
+    try:
+        header = _decode_header(protected)
+        return OK if _content_matches(vcon, header, payload) else BAD_SIGNATURE
+    except ValueError:
+        return MALFORMED
+
+
+def _signed_parts(vcon) -> Tuple[str, Union[str, bytes], str]:
+    vcon_dict = vcon.vcon_dict
+    if "signatures" not in vcon_dict:
+        raise ValueError("vCon is not signed")
+    try:
+        entry = vcon_dict["signatures"][0]
+        protected, signature = entry["protected"], entry["signature"]
+    except (IndexError, KeyError, TypeError):
+        raise ValueError("Malformed JWS: no protected header and signature") from None
+    header = _decode_header(protected)
+    if header.get("b64") is False:
+        return protected, detached_payload(vcon, header.get("cty") == MANIFEST_CONTENT_TYPE), signature
+    if "payload" not in vcon_dict:
+        raise ValueError("vCon is not signed")
+    return protected, vcon_dict["payload"], signature
+
+
+_worker_signer = None
+_worker_verifier = None
+
+
+def _init_worker(signer: Optional[VconSigner], verifier: Optional[VconVerifier]) -> None:
+    global _worker_signer, _worker_verifier
+    _worker_signer = signer
+    _worker_verifier = verifier
+
+
+def _sign_segment(segment: bytes, signer: Optional[VconSigner] = None) -> Optional[str]:
+    try:
+        return (signer or _worker_signer).sign_segment(segment)
+    except Exception:
+        return None
+
+
+def _check(parts: Tuple[str, Union[str, bytes], str], verifier: Optional[VconVerifier] = None) -> str:
+    return (verifier or _worker_verifier).status_compact(*parts)
+
+
+def _run(fn, items: list, executor: str, workers: Optional[int], chunksize: int, **objects) -> list:
+    if executor not in ("process", "thread"):
+        raise ValueError(f"Unknown executor: {executor}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 0 or not items:
+        return [fn(item, **objects) for item in items]
+    if executor == "thread":
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            return list(pool.map(functools.partial(fn, **objects), items))
+    # the signer or verifier is sent to each worker once, not with every chunk
+    initargs = (objects.get("signer"), objects.get("verifier"))
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+        return list(pool.map(fn, items, chunksize=chunksize))
+
+
+def sign_many(
+    vcons: Iterable,
+    signer: VconSigner,
+    *,
+    workers: Optional[int] = None,
+    executor: str = "process",
+    chunksize: int = 16,
+) -> List[str]:
+    """
+    Sign vCons in parallel.
+
+    The vCons are serialized and encoded in the calling process, and only
+    the signature operation runs in the workers. Each vCon is updated in
+    place as with :meth:`VconSigner.sign`.
+
+    :param vcons: the vCons to sign
+    :type vcons: Iterable[Vcon]
+    :param signer: the signer to use
+    :type signer: VconSigner
+    :param workers: the number of workers, ``os.cpu_count()`` by default;
+        0 signs in the calling thread
+    :type workers: int or None
+    :param executor: ``"process"`` for a process pool, or ``"thread"`` for
+        a thread pool, which only helps if the crypto backend releases the
+        GIL while signing
+    :type executor: str
+    :param chunksize: the number of vCons sent to a worker process at a time
+    :type chunksize: int
+    :return: for each vCon in order, :data:`OK`, or :data:`MALFORMED` if it
+        could not be serialized or signed
+    :rtype: list[str]
+    :raises ValueError: if the executor is unknown
+    """
+    vcons = list(vcons)
+    segments = []
+    for vcon in vcons:
+        try:
+            segments.append(signer._segment(vcon))
+        except Exception:
+            segments.append(None)
+    signable = [segment for segment in segments if segment is not None]
+    signatures = iter(_run(_sign_segment, signable, executor, workers, chunksize, signer=signer))
+    statuses = []
+    for vcon, segment in zip(vcons, segments):
+        signature = None if segment is None else next(signatures)
+        if signature is None:
+            statuses.append(MALFORMED)
+            continue
+        signer._store(vcon, segment, signature)
+        statuses.append(OK)
+    return statuses
+
+
+def verify_many(
+    vcons: Iterable,
+    verifier: Union[VconVerifier, KeyRing, Any],
+    *,
+    workers: Optional[int] = None,
+    executor: str = "process",
+    chunksize: int = 16,
+) -> List[str]:
+    """
+    Verify the signatures of vCons in parallel.
+
+    :param vcons: the vCons to verify
+    :type vcons: Iterable[Vcon]
+    :param verifier: the verifier, or a key ring or public key to create
+        one from
+    :type verifier: Union[VconVerifier, KeyRing, Any]
+    :param workers: the number of workers, ``os.cpu_count()`` by default;
+        0 verifies in the calling thread
+    :type workers: int or None
+    :param executor: ``"process"`` or ``"thread"``, see :func:`sign_many`
+    :type executor: str
+    :param chunksize: the number of vCons sent to a worker process at a time
+    :type chunksize: int
+    :return: for each vCon in order, :data:`OK`, :data:`BAD_SIGNATURE`, or
+        :data:`MALFORMED` if it is unsigned or its signature cannot be
+        decoded
+    :rtype: list[str]
+    :raises ValueError: if the executor is unknown
+    """
+    if not isinstance(verifier, VconVerifier):
+        verifier = VconVerifier(verifier)
+    vcons = list(vcons)
+    parts = []
+    for vcon in vcons:
+        try:
+            parts.append(_signed_parts(vcon))
+        except ValueError:
+            parts.append(None)
+    checked = iter(_run(_check, [p for p in parts if p is not None], executor, workers, chunksize, verifier=verifier))
+    statuses = []
+    for vcon, signed in zip(vcons, parts):
+        status = MALFORMED if signed is None else next(checked)
+        if status == OK:
+            status = _content_status(vcon, signed)
+        statuses.append(status)
+    return statuses
@@ -0,0 +1,147 @@
+"""
+Dict-backed access to the tags attachment of a vCon.
+
+On the wire tags are the body of the ``"tags"`` attachment: a list of
+``"name:value"`` strings. :class:`TagStore` keeps a name -> position map
+over that list so reading, adding, updating and removing a tag is O(1),
+while the list itself stays in the wire format. The value is everything
+after the first colon, so values may contain colons.
+"""
+from typing import Dict, Mapping, Optional
+
+
+class TagStore:
+    __slots__ = ("_body", "_length", "_positions", "_duplicates")
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty tag store; it is bound to a tags body on first use.
+        """
+        self._body = None
+        self._length = 0
+        self._positions: Dict[str, int] = {}
+        self._duplicates = False
+
+    def _rebuild(self, body: list) -> None:
+        positions = {}
+        duplicates = False
+        for position, tag in enumerate(body):
+            name, separator, _ = tag.partition(":")
+            if not separator:
+                continue
+            if name in positions:
+                duplicates = True
+            else:
+                positions[name] = position
+        self._body = body
+        self._length = len(body)
+        self._positions = positions
+        self._duplicates = duplicates
+
+    def _position(self, body: list, name: str) -> Optional[int]:
+        if body is not self._body or len(body) != self._length:
+            self._rebuild(body)
+        position = self._positions.get(name)
+        if position is not None and not body[position].startswith(f"{name}:"):
+            # the list was edited in place
+            self._rebuild(body)
+            position = self._positions.get(name)
+        return position
+
+    def get(self, body: list, name: str) -> Optional[str]:
+        """
+        Returns the value of a tag.
+
+        :param body: the tags attachment body
+        :type body: list
+        :param name: the name of the tag
+        :type name: str
+        :return: the value of the tag or None if not found
+        :rtype: str or None
+        """
+        position = self._position(body, name)
+        if position is None:
+            return None
+        return body[position].partition(":")[2]
+
+    def set(self, body: list, name: str, value) -> None:
+        """
+        Adds a tag, or replaces its value in place if it already exists.
+
+        :param body: the tags attachment body
+        :type body: list
+        :param name: the name of the tag
+        :type name: str
+        :param value: the value of the tag
+        :type value: str
+        :return: None
+        :rtype: None
+        """
+        position = self._position(body, name)
+        tag = f"{name}:{value}"
+        if position is None:
+            self._positions[name] = len(body)
+            body.append(tag)
+            self._length += 1
+        else:
+            body[position] = tag
+
+    def remove(self, body: list, name: str) -> bool:
+        """
+        Removes a tag, and every duplicate of it left by older writers.
+
+        The last tag is moved into the freed position, so the order of the
+        remaining tags is not preserved.
+
+        :param body: the tags attachment body
+        :type body: list
+        :param name: the name of the tag
+        :type name: str
+        :return: True if the tag was found
+        :rtype: bool
+        """
+        position = self._position(body, name)
+        if position is None:
+            return False
+        if self._duplicates:
+            # legacy bodies may repeat a name; drop every entry for it
+            prefix = f"{name}:"
+            body[:] = [tag for tag in body if not tag.startswith(prefix)]
+            self._rebuild(body)
+            return True
+        del self._positions[name]
+        last = body.pop()
+        self._length -= 1
+        if position < len(body):
+            body[position] = last
+            last_name = last.partition(":")[0]
+            if self._positions.get(last_name) == len(body):
+                self._positions[last_name] = position
+        return True
+
+    def items(self, body: list) -> Dict[str, str]:
+        """
+        Returns all tags as a dictionary.
+
+        :param body: the tags attachment body
+        :type body: list
+        :return: the tag values by name
+        :rtype: dict[str, str]
+        """
+        if body is not self._body or len(body) != self._length:
+            self._rebuild(body)
+        return {name: body[position].partition(":")[2] for name, position in self._positions.items()}
+
+    def update(self, body: list, tags: Mapping[str, str]) -> None:
+        """
+        Adds or replaces several tags.
+
+        :param body: the tags attachment body
+        :type body: list
+        :param tags: the tag values by name
+        :type tags: Mapping[str, str]
+        :return: None
+        :rtype: None
+        """
+        for name, value in tags.items():
+            self.set(body, name, value)
@@ -0,0 +1,109 @@
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Union
+from dateutil import parser
+
+# Number of distinct timestamp strings remembered by normalize_timestamp.
+# Bulk loads see the same created_at/start values over and over, so a
+# modest bound keeps the hit rate high without growing without limit.
+TIMESTAMP_CACHE_SIZE = 4096
+
+_RFC3339 = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[Tt ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?"
+    r"(?:([Zz])|([+-])(\d{2}):?(\d{2}))?"
+)
+
+
+def _parse_rfc3339(value: str) -> Optional[datetime]:
+    """
+    Parse an RFC 3339 / ISO 8601 timestamp without dateutil.
+
+    :param value: the timestamp string
+    :type value: str
+    :return: the parsed datetime, or None if the string is not in a form
+        handled by the fast path
+    :rtype: datetime or None
+    """
+    match = _RFC3339.fullmatch(value)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, zulu, sign, tz_hour, tz_minute = match.groups()
+
+    tzinfo = None
+    if zulu:
+        tzinfo = timezone.utc
+    elif sign:
+        offset = timedelta(hours=int(tz_hour), minutes=int(tz_minute))
+        tzinfo = timezone(-offset if sign == "-" else offset)
+
+    # Like dateutil, keep microsecond precision and truncate anything finer
+    microsecond = int(fraction[:6].ljust(6, "0")) if fraction else 0
+    try:
+        return datetime(
+            int(year), int(month), int(day), int(hour), int(minute),
+            int(second or 0), microsecond, tzinfo=tzinfo,
+        )
+    except ValueError:
+        return None
+
+
+# Only fast path results are cached: dateutil fills in missing fields from
+# the current date, so "10:30" means a different instant tomorrow
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _parse_string(value: str) -> Optional[datetime]:
+    return _parse_rfc3339(value)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _normalize_string(value: str) -> Optional[str]:
+    parsed = _parse_string(value)
+    return None if parsed is None else parsed.isoformat()
+
+
+def parse_timestamp(value: Union[datetime, str]) -> datetime:
+    """
+    Convert a timestamp to a datetime.
+
+    Strings are parsed like :func:`normalize_timestamp`, RFC 3339 ones
+    memoized in a bounded cache; datetimes are returned unchanged.
+
+    :param value: the timestamp to parse
+    :type value: Union[datetime, str]
+    :return: the parsed timestamp
+    :rtype: datetime
+    :raises dateutil.parser.ParserError: if the string is not a timestamp
+    """
+    if isinstance(value, datetime):
+        return value
+    parsed = _parse_string(value)
+    if parsed is None:
+        # Non-standard input, let dateutil figure it out
+        parsed = parser.parse(value)
+    return parsed
+
+
+def normalize_timestamp(value: Union[datetime, str]) -> str:
+    """
+    Convert a timestamp to an ISO 8601 string.
+
+    Strings in RFC 3339 form are parsed directly; anything else falls back
+    to ``dateutil``. Results for RFC 3339 strings are memoized in a bounded
+    cache; other strings are parsed on every call, since ``dateutil``
+    completes partial input such as ``"10:30"`` with the current date.
+    Values that are neither strings nor datetimes are returned unchanged.
+
+    :param value: the timestamp to normalize
+    :type value: Union[datetime, str]
+    :return: the timestamp as an ISO 8601 string
+    :rtype: str
+    :raises dateutil.parser.ParserError: if the string is not a timestamp
+    """
+    if isinstance(value, str):
+        normalized = _normalize_string(value)
+        if normalized is None:
+            normalized = parser.parse(value).isoformat()
+        return normalized
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
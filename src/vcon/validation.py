@@ -0,0 +1,161 @@
+"""
+Validation of attachment and analysis bodies.
+
+Bodies are checked against their declared encoding at one of three levels:
+
+``"full"``
+    ``json`` bodies are parsed and ``base64url`` bodies are decoded, as the
+    vCon has always done. Both cost time and memory proportional to the
+    body.
+``"structural"``
+    ``json`` bodies are checked for matching delimiters around the
+    document and ``base64url`` bodies are scanned for the base64url
+    alphabet and padding. Neither allocates a copy of the body.
+``"none"``
+    Only the encoding name is checked.
+
+The default level is set with :func:`set_validation_level` and can be
+overridden per call. Dict and list bodies are accepted for the ``json``
+encoding at every level.
+"""
+import base64
+import re
+from typing import Any, Optional
+from . import json_engine
+
+# Body encodings accepted for attachments, analysis and dialogs
+ENCODINGS = frozenset(("json", "none", "base64url"))
+
+VALIDATION_LEVELS = ("full", "structural", "none")
+
+_level = "full"
+
+_BASE64URL = re.compile(r"[A-Za-z0-9_-]*={0,2}")
+_BASE64URL_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_JSON_WHITESPACE = (" ", "\t", "\n", "\r")
+_JSON_WHITESPACE_BYTES = (b" ", b"\t", b"\n", b"\r")
+_JSON_CLOSING = {"{": "}", "[": "]", '"': '"'}
+_JSON_CLOSING_BYTES = {b"{": b"}", b"[": b"]", b'"': b'"'}
+
+
+def set_validation_level(level: str) -> None:
+    """
+    Set the default validation level for attachment and analysis bodies.
+
+    :param level: ``"full"``, ``"structural"`` or ``"none"``
+    :type level: str
+    :return: None
+    :rtype: None
+    :raises ValueError: if the level is unknown
+    """
+    global _level
+    _level = _resolve(level)
+
+
+def get_validation_level() -> str:
+    """
+    Returns the default validation level.
+
+    :return: the validation level
+    :rtype: str
+    """
+    return _level
+
+
+def _resolve(level: Optional[str]) -> str:
+    if level is None:
+        return _level
+    if level not in VALIDATION_LEVELS:
+        raise ValueError(f"Unknown validation level: {level}")
+    return level
+
+
+def _json_is_structural(body: Any) -> bool:
+    if isinstance(body, (bytes, bytearray)):
+        whitespace, closing_for = _JSON_WHITESPACE_BYTES, _JSON_CLOSING_BYTES
+        backslash = b"\\"
+    elif isinstance(body, str):
+        whitespace, closing_for = _JSON_WHITESPACE, _JSON_CLOSING
+        backslash = "\\"
+    else:
+        return False
+    # Find the first and last non-whitespace characters without stripping
+    start = 0
+    end = len(body) - 1
+    while start <= end and body[start:start + 1] in whitespace:
+        start += 1
+    while end > start and body[end:end + 1] in whitespace:
+        end -= 1
+    if start > end:
+        return False
+    closing = closing_for.get(body[start:start + 1])
+    if closing is None:
+        # a bare number or literal is short enough to parse
+        try:
+            json_engine.loads(body)
+        except Exception:
+            return False
+        return True
+    if end == start or body[end:end + 1] != closing:
+        return False
+    # the closing quote of a string must not be escaped
+    backslashes = 0
+    while closing in ('"', b'"') and body[end - 1 - backslashes:end - backslashes] == backslash:
+        backslashes += 1
+    return backslashes % 2 == 0
+
+
+def _base64url_is_structural(body: Any) -> bool:
+    if isinstance(body, str):
+        # isascii() is O(1) for str, the regex then scans without copying
+        return len(body) % 4 == 0 and body.isascii() and _BASE64URL.fullmatch(body) is not None
+    if isinstance(body, (bytes, bytearray)):
+        if len(body) % 4:
+            return False
+        # deleting the alphabet leaves only the padding of a valid body
+        padding = body.translate(None, _BASE64URL_ALPHABET)
+        return padding in (b"", b"=", b"==") and body.endswith(padding)
+    return False
+
+
+def check_body(body: Any, encoding: str, level: Optional[str] = None) -> None:
+    """
+    Check a body against its declared encoding.
+
+    :param body: the body
+    :type body: Union[dict, list, str, bytes]
+    :param encoding: ``"json"``, ``"none"`` or ``"base64url"``
+    :type encoding: str
+    :param level: the validation level to use instead of the default one
+    :type level: str or None
+    :return: None
+    :rtype: None
+    :raises ValueError: if the level is unknown
+    :raises Exception: if the encoding is unknown or the body does not
+        match it
+    """
+    level = _resolve(level)
+    if encoding not in ENCODINGS:
+        raise Exception("Invalid encoding")
+    if level == "none" or encoding == "none":
+        return
+
+    if encoding == "json":
+        if isinstance(body, (dict, list)):
+            return
+        if level == "full":
+            try:
+                json_engine.loads(body)
+            except Exception as e:
+                raise Exception("Invalid JSON body: ", e)
+        elif not _json_is_structural(body):
+            raise Exception("Invalid JSON body: ", "unbalanced or empty document")
+
+    if encoding == "base64url":
+        if level == "full":
+            try:
+                base64.urlsafe_b64decode(body)
+            except Exception as e:
+                raise Exception("Invalid base64url body: ", e)
+        elif not _base64url_is_structural(body):
+            raise Exception("Invalid base64url body: ", "not base64url encoded")
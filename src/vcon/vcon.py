@@ -1,62 +1,198 @@
 from __future__ import annotations
 
-import copy
-import json
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Callable, Iterable
+from operator import methodcaller
+import asyncio
 import hashlib
 import time
 import uuid6
 from datetime import datetime
 from datetime import timezone
-from pydash import get as _get
-import base64
-from authlib.jose import JsonWebSignature
-from authlib.jose.errors import BadSignatureError
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.primitives import serialization
 from .party import Party
 from .dialog import Dialog
-from dateutil import parser
+from .timestamps import normalize_timestamp
+from .views import ReadOnlyDict, PartyView, DialogView
+from .lazy import parse_lazy
+from .index import ListIndex, compile_path
+from .tags import TagStore
+from .query import DialogQuery
+from .validation import ENCODINGS, check_body
+from .fetch import AsyncFetcher, Fetcher, DEFAULT_CONCURRENCY, get_default_fetcher, run_in_threads
+from .signing import VconSigner, VconVerifier, generate_key_pair
+from . import json_engine
 
 _LAST_V8_TIMESTAMP = None
 
+_get_type = methodcaller("get", "type")
+_get_vendor = methodcaller("get", "vendor")
+
+
+def _get_dialogs(analysis: Any) -> list:
+    # analysis "dialog" is either a single dialog index or a list of them
+    value = analysis.get("dialog") if isinstance(analysis, dict) else None
+    if isinstance(value, list):
+        return value
+    return [] if value is None else [value]
+
+
+def _require(entry: Any, kind: str, keys: frozenset) -> dict:
+    if not isinstance(entry, dict):
+        raise Exception(f"Invalid {kind}: expected a dict, got {type(entry).__name__}")
+    if not entry.keys() >= keys:
+        missing = ", ".join(sorted(keys - entry.keys()))
+        raise Exception(f"Invalid {kind}: missing {missing}")
+    return entry
+
+
+def _without_none(entry: dict) -> dict:
+    if None in entry.values():
+        return {key: value for key, value in entry.items() if value is not None}
+    return dict(entry)
+
+
+_NO_KEYS = frozenset()
+_DIALOG_KEYS = frozenset(("type", "start", "parties"))
+_ATTACHMENT_KEYS = frozenset(("type", "body"))
+_ANALYSIS_KEYS = frozenset(("type", "dialog", "vendor", "body"))
+
+
+def _party_entry(party: Union[Party, dict]) -> dict:
+    if isinstance(party, Party):
+        return party.to_dict()
+    return _without_none(_require(party, "party", _NO_KEYS))
+
+
+def _dialog_entry(dialog: Union[Dialog, dict]) -> dict:
+    if isinstance(dialog, Dialog):
+        entry = dialog.to_dict()
+    else:
+        entry = _without_none(_require(dialog, "dialog", _DIALOG_KEYS))
+        entry["start"] = normalize_timestamp(entry["start"])
+    encoding = entry.get("encoding")
+    if encoding is not None and encoding not in ENCODINGS:
+        raise Exception("Invalid encoding")
+    return entry
+
+
+def _body_entry(entry: Any, kind: str, keys: frozenset, validation: str) -> dict:
+    entry = dict(_require(entry, kind, keys))
+    check_body(entry["body"], entry.setdefault("encoding", "none"), validation)
+    return entry
+
+
+def _copy_json(value: Any) -> Any:
+    # Structural deep copy of JSON-like data; scalars are immutable and shared
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+def _refresh_views(cached: Optional[tuple], items: list, make_view: Callable[[dict], Any]) -> tuple:
+    # Reuse the proxies whose dict is still in the list; entries replaced,
+    # added or removed directly in vcon_dict get new ones
+    if cached is None or cached[0] is not items:
+        return items, [make_view(item) for item in items]
+    views = cached[1]
+    del views[len(items):]
+    for position, item in enumerate(items):
+        if position == len(views):
+            views.append(make_view(item))
+        elif object.__getattribute__(views[position], "_data") is not item:
+            views[position] = make_view(item)
+    return cached
+
 
 class Vcon:
-    def __init__(self, vcon_dict={}) -> None:
-        # deep copy
+    def __init__(self, vcon_dict: Optional[dict] = None, *, copy: bool = True) -> None:
         """
         Initialize a Vcon object from a dictionary.
 
+        By default the dictionary is deep copied, so the caller keeps
+        ownership of it. Pass ``copy=False`` to adopt the dictionary as-is,
+        which avoids copying every dialog and attachment when the
+        caller owns a freshly decoded document (see :meth:`from_dict`).
+
         :param vcon_dict: a dictionary representing a vCon
         :type vcon_dict: dict
+        :param copy: deep copy the dictionary instead of adopting it
+        :type copy: bool
         """
+        if vcon_dict is None:
+            vcon_dict = {}
+
         # If the vcon_dict contains a created_at in datetime or in string, format it like a ISO 8601
-        if vcon_dict.get("created_at"):
-            if isinstance(vcon_dict["created_at"], datetime):
-                vcon_dict["created_at"] = (
-                    vcon_dict["created_at"].isoformat()
-                )
-            elif isinstance(vcon_dict["created_at"], str):
-                vcon_dict["created_at"] = (
-                    parser.parse(vcon_dict["created_at"]).isoformat()
-                )
+        created_at = vcon_dict.get("created_at")
+        if created_at:
+            created_at = normalize_timestamp(created_at)
         else:
-            vcon_dict["created_at"] = (
-                datetime.now(timezone.utc).isoformat()
-            )
-        self.vcon_dict = json.loads(json.dumps(vcon_dict))
+            created_at = datetime.now(timezone.utc).isoformat()
+
+        if copy:
+            # deep copy, normalizing created_at on the copy so the caller's
+            # dictionary is left untouched
+            self.vcon_dict = _copy_json({**vcon_dict, "created_at": created_at})
+        else:
+            vcon_dict["created_at"] = created_at
+            self.vcon_dict = vcon_dict
+
+        self._attachment_types = ListIndex(_get_type)
+        self._analysis_types = ListIndex(_get_type)
+        self._analysis_vendors = ListIndex(_get_vendor)
+        self._analysis_dialogs = ListIndex(_get_dialogs, many=True)
+        self._tags = TagStore()
+        self._party_indexes = {}
+        self._party_views = None
+        self._dialog_views = None
+        # body digests kept between manifest signatures, see
+        # vcon.signing.build_manifest
+        self._body_digests = {}
 
     @classmethod
-    def build_from_json(cls, json_string: str) -> Vcon:
+    def from_dict(cls, vcon_dict: dict, copy: bool = False) -> Vcon:
+        """
+        Initialize a Vcon object from a dictionary the caller owns.
+
+        Unlike the constructor, the dictionary is adopted without a deep copy
+        unless ``copy=True`` is given, so the construction cost does not grow
+        with the size of the bodies. The Vcon and the caller share the
+        dictionary afterwards, and ``created_at`` is normalized in place.
+
+        :param vcon_dict: a dictionary representing a vCon
+        :type vcon_dict: dict
+        :param copy: deep copy the dictionary instead of adopting it
+        :type copy: bool
+        :return: a Vcon object
+        :rtype: Vcon
+        """
+        return cls(vcon_dict, copy=copy)
+
+    @classmethod
+    def build_from_json(
+        cls, json_string: str, engine: Optional[str] = None, lazy: bool = False
+    ) -> Vcon:
         """
         Initialize a Vcon object from a JSON string.
 
+        With ``lazy=True`` large ``body`` strings in dialogs, attachments and
+        analysis are left undecoded in the source string and decoded the
+        first time they are read, see :mod:`vcon.lazy`. Lazy parsing always
+        uses the standard library decoder.
+
         :param json_string: a JSON string representing a vCon
         :type json_string: str
+        :param engine: the JSON engine to use instead of the default one
+        :type engine: str or None
+        :param lazy: defer decoding of large bodies until they are accessed
+        :type lazy: bool
         :return: a Vcon object
         :rtype: Vcon
         """
-        return cls(json.loads(json_string))
+        # the decoded dictionary is not shared with anyone, so adopt it
+        if lazy:
+            return cls(parse_lazy(json_string), copy=False)
+        return cls(json_engine.loads(json_string, engine), copy=False)
 
     @classmethod
     def build_new(cls) -> Vcon:
@@ -81,7 +217,7 @@ class Vcon:
             "attachments": [],
             "analysis": [],
         }
-        return cls(vcon_dict)
+        return cls(vcon_dict, copy=False)
 
     @property
     def tags(self) -> Optional[dict]:
@@ -93,7 +229,7 @@ class Vcon:
         """
         return self.find_attachment_by_type("tags")
 
-    def get_tag(self, tag_name) -> Optional[dict]:
+    def get_tag(self, tag_name) -> Optional[str]:
         """
         Returns the value of a tag by name.
 
@@ -105,17 +241,34 @@ class Vcon:
         tags_attachment = self.find_attachment_by_type("tags")
         if not tags_attachment:
             return None
-        tag = next(
-            (t for t in tags_attachment["body"] if t.startswith(f"{tag_name}:")), None
-        )
-        if not tag:
-            return None
-        tag_value = tag.split(":")[1]
-        return tag_value
+        return self._tags.get(tags_attachment["body"], tag_name)
+
+    def get_tags(self) -> dict[str, str]:
+        """
+        Returns all tags.
+
+        :return: the tag values by name
+        :rtype: dict[str, str]
+        """
+        tags_attachment = self.find_attachment_by_type("tags")
+        if not tags_attachment:
+            return {}
+        return self._tags.items(tags_attachment["body"])
+
+    def _tags_body(self) -> list:
+        tags_attachment = self.find_attachment_by_type("tags")
+        if not tags_attachment:
+            tags_attachment = {
+                "type": "tags",
+                "body": [],
+                "encoding": "json",
+            }
+            self._append_attachment(tags_attachment)
+        return tags_attachment["body"]
 
     def add_tag(self, tag_name, tag_value) -> None:
         """
-        Adds a tag to the vCon.
+        Adds a tag to the vCon, replacing its value if it already exists.
 
         :param tag_name: the name of the tag
         :type tag_name: str
@@ -124,15 +277,32 @@ class Vcon:
         :return: None
         :rtype: None
         """
+        self._tags.set(self._tags_body(), tag_name, tag_value)
+
+    def add_tags(self, tags: dict[str, str]) -> None:
+        """
+        Adds several tags to the vCon, replacing the values of existing ones.
+
+        :param tags: the tag values by name
+        :type tags: dict[str, str]
+        :return: None
+        :rtype: None
+        """
+        self._tags.update(self._tags_body(), tags)
+
+    def remove_tag(self, tag_name) -> None:
+        """
+        Removes a tag from the vCon. The order of the remaining tags is not
+        preserved.
+
+        :param tag_name: the name of the tag
+        :type tag_name: str
+        :return: None
+        :rtype: None
+        """
         tags_attachment = self.find_attachment_by_type("tags")
-        if not tags_attachment:
-            tags_attachment = {
-                "type": "tags",
-                "body": [],
-                "encoding": "json",
-            }
-            self.vcon_dict["attachments"].append(tags_attachment)
-        tags_attachment["body"].append(f"{tag_name}:{tag_value}")
+        if tags_attachment:
+            self._tags.remove(tags_attachment["body"], tag_name)
 
     def find_attachment_by_type(self, type: str) -> Optional[dict]:
         """
@@ -143,12 +313,36 @@ class Vcon:
         :return: the attachment or None if not found
         :rtype: dict or None
         """
-        return next(
-            (a for a in self.vcon_dict["attachments"] if a["type"] == type), None
-        )
+        attachments = self.vcon_dict["attachments"]
+        position = self._attachment_types.first(attachments, type)
+        if position is None:
+            return None
+        return attachments[position]
+
+    def find_all_attachments(self, type: str) -> list[dict]:
+        """
+        Finds every attachment of a type.
+
+        :param type: the type of the attachments
+        :type type: str
+        :return: the matching attachments in order
+        :rtype: list[dict]
+        """
+        attachments = self.vcon_dict["attachments"]
+        return [attachments[p] for p in self._attachment_types.positions(attachments, type)]
+
+    def _append_attachment(self, attachment: dict) -> None:
+        attachments = self.vcon_dict["attachments"]
+        attachments.append(attachment)
+        self._attachment_types.appended(attachments)
 
     def add_attachment(
-        self, *, body: Union[dict, list, str], type: str, encoding="none"
+        self,
+        *,
+        body: Union[dict, list, str],
+        type: str,
+        encoding="none",
+        validation: Optional[str] = None,
     ) -> None:
         """
         Adds an attachment to the vCon.
@@ -159,30 +353,46 @@ class Vcon:
         :type type: str
         :param encoding: the encoding of the attachment body
         :type encoding: str
+        :param validation: the body validation level to use instead of the
+            default one, see :mod:`vcon.validation`
+        :type validation: str or None
         :return: None
         :rtype: None
         """
-        if encoding not in ["json", "none", "base64url"]:
-            raise Exception("Invalid encoding")
-
-        if encoding == "json":
-            try:
-                json.loads(body)
-            except Exception as e:
-                raise Exception("Invalid JSON body: ", e)
-
-        if encoding == "base64url":
-            try:
-                base64.urlsafe_b64decode(body)
-            except Exception as e:
-                raise Exception("Invalid base64url body: ", e)
+        check_body(body, encoding, validation)
 
         attachment = {
             "type": type,
             "body": body,
             "encoding": encoding,
         }
-        self.vcon_dict["attachments"].append(attachment)
+        self._append_attachment(attachment)
+
+    def add_attachments(self, attachments: Iterable[dict], validation: Optional[str] = None) -> None:
+        """
+        Adds several attachments to the vCon.
+
+        Each attachment is a dict with ``type`` and ``body`` and, optionally,
+        ``encoding`` (default ``"none"``) and any other attachment fields.
+        Every entry is validated before any is added.
+
+        :param attachments: the attachments to add
+        :type attachments: Iterable[dict]
+        :param validation: the body validation level to use instead of the
+            default one, see :mod:`vcon.validation`
+        :type validation: str or None
+        :return: None
+        :rtype: None
+        """
+        entries = [
+            _body_entry(attachment, "attachment", _ATTACHMENT_KEYS, validation)
+            for attachment in attachments
+        ]
+
+        attachment_list = self.vcon_dict["attachments"]
+        start = len(attachment_list)
+        attachment_list.extend(entries)
+        self._attachment_types.extended(attachment_list, start)
 
     def find_analysis_by_type(self, type) -> Any | None:
         """
@@ -193,7 +403,51 @@ class Vcon:
         :return: the analysis or None if not found
         :rtype: dict or None
         """
-        return next((a for a in self.vcon_dict["analysis"] if a["type"] == type), None)
+        analysis = self.vcon_dict["analysis"]
+        position = self._analysis_types.first(analysis, type)
+        if position is None:
+            return None
+        return analysis[position]
+
+    def find_all_analysis(
+        self,
+        type: Optional[str] = None,
+        vendor: Optional[str] = None,
+        dialog: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Finds every analysis matching all of the given conditions.
+
+        Lookups by type, vendor and dialog use indexes, so no condition
+        scans the whole analysis list.
+
+        :param type: the type of the analysis
+        :type type: str or None
+        :param vendor: the vendor of the analysis
+        :type vendor: str or None
+        :param dialog: the index of a dialog the analysis refers to
+        :type dialog: int or None
+        :return: the matching analysis entries in order
+        :rtype: list[dict]
+        """
+        analysis = self.vcon_dict["analysis"]
+        positions = None
+        for index, value in (
+            (self._analysis_types, type),
+            (self._analysis_vendors, vendor),
+            (self._analysis_dialogs, dialog),
+        ):
+            if value is None:
+                continue
+            found = index.positions(analysis, value)
+            if positions is None:
+                positions = found
+            else:
+                found = set(found)
+                positions = [p for p in positions if p in found]
+        if positions is None:
+            positions = range(len(analysis))
+        return [analysis[p] for p in positions]
 
     def add_analysis(
         self,
@@ -204,6 +458,7 @@ class Vcon:
         body: Union[dict, list, str],
         encoding="none",
         extra={},
+        validation: Optional[str] = None,
     ) -> None:
         """
         Adds analysis data to the vCon.
@@ -220,23 +475,13 @@ class Vcon:
         :type encoding: str
         :param extra: extra key-value pairs to include in the analysis
         :type extra: dict
+        :param validation: the body validation level to use instead of the
+            default one, see :mod:`vcon.validation`
+        :type validation: str or None
         :return: None
         :rtype: None
         """
-        if encoding not in ["json", "none", "base64url"]:
-            raise Exception("Invalid encoding")
-
-        if encoding == "json":
-            try:
-                json.loads(body)
-            except Exception as e:
-                raise Exception("Invalid JSON body: ", e)
-
-        if encoding == "base64url":
-            try:
-                base64.urlsafe_b64decode(body)
-            except Exception as e:
-                raise Exception("Invalid base64url body: ", e)
+        check_body(body, encoding, validation)
 
         analysis = {
             "type": type,
@@ -246,7 +491,60 @@ class Vcon:
             "encoding": encoding,
             **extra,
         }
-        self.vcon_dict["analysis"].append(analysis)
+        analysis_list = self.vcon_dict["analysis"]
+        analysis_list.append(analysis)
+        self._analysis_types.appended(analysis_list)
+        self._analysis_vendors.appended(analysis_list)
+        self._analysis_dialogs.appended(analysis_list)
+
+    def add_analyses(self, analyses: Iterable[dict], validation: Optional[str] = None) -> None:
+        """
+        Adds several analysis entries to the vCon.
+
+        Each entry is a dict with ``type``, ``dialog``, ``vendor`` and
+        ``body`` and, optionally, ``encoding`` (default ``"none"``) and any
+        extra fields. Every entry is validated before any is added.
+
+        :param analyses: the analysis entries to add
+        :type analyses: Iterable[dict]
+        :param validation: the body validation level to use instead of the
+            default one, see :mod:`vcon.validation`
+        :type validation: str or None
+        :return: None
+        :rtype: None
+        """
+        entries = [
+            _body_entry(analysis, "analysis", _ANALYSIS_KEYS, validation)
+            for analysis in analyses
+        ]
+
+        analysis_list = self.vcon_dict["analysis"]
+        start = len(analysis_list)
+        analysis_list.extend(entries)
+        self._analysis_types.extended(analysis_list, start)
+        self._analysis_vendors.extended(analysis_list, start)
+        self._analysis_dialogs.extended(analysis_list, start)
+
+    def reindex(self) -> None:
+        """
+        Rebuild the lookup indexes and cached views on the next access.
+
+        Entries added through the Vcon methods are indexed automatically.
+        Call this after editing the lists in ``vcon_dict`` directly, for
+        example replacing an attachment or a party in place.
+
+        :return: None
+        :rtype: None
+        """
+        self._attachment_types.invalidate()
+        self._analysis_types.invalidate()
+        self._analysis_vendors.invalidate()
+        self._analysis_dialogs.invalidate()
+        self._tags = TagStore()
+        self._invalidate_party_indexes()
+        self._party_views = None
+        self._dialog_views = None
+        self._body_digests = {}
 
     def add_party(self, party: Party) -> None:
         """
@@ -257,7 +555,49 @@ class Vcon:
         :return: None
         :rtype: None
         """
-        self.vcon_dict["parties"].append(party.to_dict())
+        parties = self.vcon_dict["parties"]
+        parties.append(party.to_dict())
+        for index in self._party_indexes.values():
+            index.appended(parties)
+
+    def add_parties(self, parties: Iterable[Union[Party, dict]]) -> None:
+        """
+        Adds several parties to the vCon.
+
+        Parties may be given as Party objects or as party dicts; None values
+        are dropped from dicts. Every entry is checked before any is added.
+
+        :param parties: the parties to add
+        :type parties: Iterable[Union[Party, dict]]
+        :return: None
+        :rtype: None
+        """
+        entries = [_party_entry(party) for party in parties]
+        party_list = self.vcon_dict["parties"]
+        start = len(party_list)
+        party_list.extend(entries)
+        for index in self._party_indexes.values():
+            index.extended(party_list, start)
+
+    def index_parties(self, *paths: str) -> None:
+        """
+        Keep hash indexes of the parties on some fields.
+
+        Without an index, :meth:`find_party_index` and
+        :meth:`find_party_indices` scan the parties. Indexes follow parties
+        added through the Vcon methods and edits made through
+        :attr:`parties`; call :meth:`reindex` after editing a party dict in
+        ``vcon_dict`` directly.
+
+        :param paths: the party fields or ``pydash`` paths to index, e.g.
+            ``"tel"`` or ``"meta.role"``
+        :type paths: str
+        :return: None
+        :rtype: None
+        """
+        for path in paths:
+            if path not in self._party_indexes:
+                self._party_indexes[path] = ListIndex(compile_path(path))
 
     def find_party_index(self, by: str, val: str) -> Optional[int]:
         """
@@ -270,15 +610,44 @@ class Vcon:
         :return: The index of the party if found, None otherwise
         :rtype: Optional[int]
         """
+        parties = self.vcon_dict["parties"]
+        index = self._party_indexes.get(by)
+        if index is not None:
+            return index.first(parties, val)
+        getter = compile_path(by)
         return next(
-            (
-                ind
-                for ind, party in enumerate(self.vcon_dict["parties"])
-                if _get(party, by) == val
-            ),
+            (ind for ind, party in enumerate(parties) if getter(party) == val),
             None,
         )
 
+    def find_party_indices(self, by: str, values: list) -> list[Optional[int]]:
+        """
+        Find the indices of several parties in one pass.
+
+        :param by: the key to look for
+        :type by: str
+        :param values: the values to look for
+        :type values: list
+        :return: the index of the first party holding each value, or None
+            for values that were not found, in the order of ``values``
+        :rtype: list[Optional[int]]
+        """
+        parties = self.vcon_dict["parties"]
+        index = self._party_indexes.get(by)
+        if index is not None:
+            return [index.first(parties, val) for val in values]
+
+        getter = compile_path(by)
+        wanted = set(values)
+        found = {}
+        for ind, party in enumerate(parties):
+            value = getter(party)
+            if value in wanted and value not in found:
+                found[value] = ind
+                if len(found) == len(wanted):
+                    break
+        return [found.get(val) for val in values]
+
     def find_dialog(self, by: str, val: str) -> Optional[Dialog]:
         """
         Find a dialog in the vCon given a key-value pair. Convert the dialog to a Dialog object.
@@ -290,14 +659,45 @@ class Vcon:
         :return: The dialog if found, None otherwise
         :rtype: Optional[dict]
         """
+        getter = compile_path(by)
         dialog = next(
-            (dialog for dialog in self.vcon_dict["dialog"] if _get(dialog, by) == val),
+            (dialog for dialog in self.vcon_dict["dialog"] if getter(dialog) == val),
             None,
         )
         if dialog:
             return Dialog(**dialog)
         return None
 
+    def find_dialog_indices(self, query: Optional[DialogQuery] = None, **conditions) -> list[int]:
+        """
+        Find the indices of every dialog matching a query.
+
+        The conditions are the keyword arguments of
+        :class:`vcon.query.DialogQuery`: ``type``, ``mimetype``, ``party``,
+        ``originator``, ``since`` and ``until``. A compiled query can be
+        passed instead to reuse it across vCons.
+
+        :param query: a compiled query
+        :type query: DialogQuery or None
+        :return: the indices of the matching dialogs in order
+        :rtype: list[int]
+        """
+        if query is None:
+            query = DialogQuery(**conditions)
+        return query.indices(self.vcon_dict.get("dialog", []))
+
+    def find_dialogs(self, query: Optional[DialogQuery] = None, **conditions) -> list[ReadOnlyDict]:
+        """
+        Find every dialog matching a query, see :meth:`find_dialog_indices`.
+
+        :param query: a compiled query
+        :type query: DialogQuery or None
+        :return: read-only views over the matching dialog dicts
+        :rtype: list[ReadOnlyDict]
+        """
+        dialogs = self.vcon_dict.get("dialog", [])
+        return [ReadOnlyDict(dialogs[i]) for i in self.find_dialog_indices(query, **conditions)]
+
     def add_dialog(self, dialog: Dialog) -> None:
         """
         Add a dialog to the vCon.
@@ -309,24 +709,144 @@ class Vcon:
         """
         self.vcon_dict["dialog"].append(dialog.to_dict())
 
-    def to_json(self) -> str:
+    def add_dialogs(self, dialogs: Iterable[Union[Dialog, dict]]) -> None:
+        """
+        Add several dialogs to the vCon.
+
+        Dialogs may be given as Dialog objects or as dialog dicts with at
+        least ``type``, ``start`` and ``parties``. The start time of a dict
+        is normalized like Dialog does and None values are dropped. Every
+        entry is checked before any is added.
+
+        :param dialogs: the dialogs to add
+        :type dialogs: Iterable[Union[Dialog, dict]]
+        :return: None
+        :rtype: None
+        """
+        entries = [_dialog_entry(dialog) for dialog in dialogs]
+        self.vcon_dict["dialog"].extend(entries)
+
+    async def inline_all_external_async(
+        self, concurrency: int = DEFAULT_CONCURRENCY, fetcher: Optional[AsyncFetcher] = None
+    ) -> list[int]:
+        """
+        Fetch the data of every external dialog concurrently and inline it.
+
+        Dialogs with a ``url`` and no ``body`` are converted with
+        :meth:`vcon.dialog.Dialog.to_inline_data_async`, sharing one pooled
+        HTTP session. All requests are allowed to finish before the first
+        failure, if any, is raised; dialogs fetched successfully stay inlined.
+
+        :param concurrency: the maximum number of requests in flight
+        :type concurrency: int
+        :param fetcher: the fetcher to use instead of creating one
+        :type fetcher: AsyncFetcher or None
+        :return: the indices of the dialogs that were inlined
+        :rtype: list[int]
+        :raises Exception: the first fetch failure
+        """
+        dialogs = self.dialogs
+        external = [i for i, dialog in enumerate(dialogs) if dialog.url is not None and dialog.body is None]
+        if not external:
+            return []
+
+        async def inline_all(fetcher: AsyncFetcher) -> list:
+            return await asyncio.gather(
+                *(dialogs[i].to_inline_data_async(fetcher) for i in external), return_exceptions=True
+            )
+
+        if fetcher is None:
+            async with AsyncFetcher(concurrency=concurrency) as fetcher:
+                results = await inline_all(fetcher)
+        else:
+            results = await inline_all(fetcher)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return external
+
+    def inline_all_external(
+        self, concurrency: int = DEFAULT_CONCURRENCY, fetcher: Optional[Fetcher] = None
+    ) -> list[int]:
+        """
+        Fetch the data of every external dialog from a thread pool and
+        inline it.
+
+        Dialogs with a ``url`` and no ``body`` are converted with
+        :meth:`vcon.dialog.Dialog.to_inline_data`, sharing the fetcher's
+        connection pool. All requests are allowed to finish before the
+        first failure, if any, is raised; dialogs fetched successfully stay
+        inlined. Use :meth:`inline_all_external_async` from a running event
+        loop.
+
+        :param concurrency: the number of threads
+        :type concurrency: int
+        :param fetcher: the fetcher to use instead of the shared default one
+        :type fetcher: Fetcher or None
+        :return: the indices of the dialogs that were inlined
+        :rtype: list[int]
+        :raises Exception: the first fetch failure
+        """
+        dialogs = self.dialogs
+        external = [i for i, dialog in enumerate(dialogs) if dialog.url is not None and dialog.body is None]
+        if fetcher is None:
+            fetcher = get_default_fetcher()
+        results = run_in_threads(lambda i: dialogs[i].to_inline_data(fetcher), external, concurrency)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return external
+
+    def to_json(self, engine: Optional[str] = None, compat: Optional[bool] = None) -> str:
         """
         Serialize the vCon to a JSON string.
 
+        :param engine: the JSON engine to use instead of the default one
+        :type engine: str or None
+        :param compat: override the JSON engine compatibility mode, see
+            :mod:`vcon.json_engine`
+        :type compat: bool or None
         :return: a JSON string representation of the vCon
         :rtype: str
         """
-        tmp_vcon_dict = copy.copy(self.vcon_dict)
-        return json.dumps(tmp_vcon_dict)
+        return json_engine.dumps(self.vcon_dict, engine, compat)
 
-    def to_dict(self) -> dict:
+    def to_dict(self, copy: str = "deep") -> dict:
         """
         Serialize the vCon to a dictionary.
 
+        ``copy`` controls how much of the vCon is copied:
+
+        - ``"deep"``: an independent copy of every dict and list
+        - ``"shallow"``: a new top-level dict sharing the nested values
+        - ``"none"``: the vCon's own dictionary, changes to it modify the vCon
+
+        Use :meth:`view` for read-only access without any copy.
+
+        :param copy: ``"deep"``, ``"shallow"`` or ``"none"``
+        :type copy: str
         :return: a dictionary representation of the vCon
         :rtype: dict
         """
-        return json.loads(self.to_json())
+        if copy == "deep":
+            return _copy_json(self.vcon_dict)
+        if copy == "shallow":
+            return dict(self.vcon_dict)
+        if copy == "none":
+            return self.vcon_dict
+        raise ValueError(f"Invalid copy mode: {copy}")
+
+    def view(self) -> ReadOnlyDict:
+        """
+        Returns a read-only mapping view of the vCon.
+
+        The view is never copied; nested dicts and lists are wrapped in
+        read-only views as they are accessed.
+
+        :return: a read-only view of the vCon dictionary
+        :rtype: ReadOnlyDict
+        """
+        return ReadOnlyDict(self.vcon_dict)
 
     def dumps(self) -> str:
         """
@@ -342,15 +862,47 @@ class Vcon:
         """
         Returns the list of parties.
 
+        The parties are :class:`vcon.views.PartyView` proxies over the party
+        dicts, so changes made through them modify the vCon. The proxies are
+        cached, and a proxy is replaced when its party dict is no longer in
+        the list, for example after ``vcon_dict["parties"][0] = {...}``.
+
         :return: a list of parties
         :rtype: list[Party]
         """
-        return [Party(**party) for party in self.vcon_dict.get("parties", [])]
+        self._party_views = _refresh_views(
+            self._party_views, self.vcon_dict.get("parties", []), self._party_view
+        )
+        return list(self._party_views[1])
+
+    def _party_view(self, party: dict) -> PartyView:
+        # edits through the proxy may change an indexed field
+        return PartyView(party, self._invalidate_party_indexes)
+
+    def _invalidate_party_indexes(self) -> None:
+        for index in self._party_indexes.values():
+            index.invalidate()
 
     @property
     def dialog(self) -> list:
         return self.vcon_dict.get("dialog", [])
 
+    @property
+    def dialogs(self) -> list[Dialog]:
+        """
+        Returns the list of dialogs as Dialog objects.
+
+        The dialogs are :class:`vcon.views.DialogView` proxies over the
+        dialog dicts, so changes made through them modify the vCon and the
+        start time is not re-parsed. The proxies are cached, and a proxy is
+        replaced when its dialog dict is no longer in the list.
+
+        :return: a list of dialogs
+        :rtype: list[Dialog]
+        """
+        self._dialog_views = _refresh_views(self._dialog_views, self.vcon_dict.get("dialog", []), DialogView)
+        return list(self._dialog_views[1])
+
     @property
     def attachments(self) -> list:
         return self.vcon_dict.get("attachments", [])
@@ -433,71 +985,50 @@ class Vcon:
         """
         Sign the vCon using JWS.
 
-        :param private_key: the private key used for signing
-        :type private_key: Union[rsa.RSAPrivateKey, bytes]
+        The key is parsed on every call; pass a
+        :class:`vcon.signing.VconSigner` to sign many vCons with one key.
+
+        :param private_key: the private key used for signing, or a signer
+        :type private_key: Union[rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey, ed25519.Ed25519PrivateKey, bytes,
+            VconSigner]
         :return: None
         :rtype: None
         """
-        """Sign the vCon using JWS."""
-        payload = self.to_json()
-        jws = JsonWebSignature()
-        protected = {"alg": "RS256", "typ": "JWS"}
-
-        # Convert private key to PEM format if it's not already
-        if isinstance(private_key, rsa.RSAPrivateKey):
-            pem = private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.PKCS8,
-                encryption_algorithm=serialization.NoEncryption(),
-            )
-        else:
-            pem = private_key
-
-        signed = jws.serialize_compact(protected, payload, pem)
-        signed_str = signed.decode("utf-8")
-        header, payload, signature = signed_str.split(".")
-
-        self.vcon_dict["signatures"] = [{"protected": header, "signature": signature}]
-        self.vcon_dict["payload"] = payload
+        signer = private_key if isinstance(private_key, VconSigner) else VconSigner(private_key)
+        signer.sign(self)
 
     def verify(self, public_key) -> bool:
         """Verify the JWS signature of the vCon.
 
-        :param public_key: the public key used for verification
-        :type public_key: Union[rsa.RSAPublicKey, bytes]
+        The key is parsed on every call; pass a
+        :class:`vcon.signing.VconVerifier` to verify many vCons, or a
+        :class:`vcon.signing.KeyRing` to pick the key by ``kid``.
+
+        :param public_key: the public key used for verification, a key
+            ring or a verifier
+        :type public_key: Union[rsa.RSAPublicKey, ec.EllipticCurvePublicKey, ed25519.Ed25519PublicKey, bytes,
+            KeyRing, VconVerifier]
         :return: True if the signature is valid, False otherwise
         :rtype: bool
+        :raises ValueError: if the vCon is not signed or its signature is
+            malformed
         """
-        """Verify the JWS signature of the vCon."""
-        if "signatures" not in self.vcon_dict or "payload" not in self.vcon_dict:
-            raise ValueError("vCon is not signed")
-
-        jws = JsonWebSignature()
-        signed_data = f"{self.vcon_dict['signatures'][0]['protected']}.{self.vcon_dict['payload']}.{self.vcon_dict['signatures'][0]['signature']}"
-
-        # Convert public key to PEM format if it's not already
-        if isinstance(public_key, rsa.RSAPublicKey):
-            pem = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo,
-            )
-        else:
-            pem = public_key
-
-        try:
-            jws.deserialize_compact(signed_data, pem)
-            return True
-        except BadSignatureError:
-            return False
+        verifier = public_key if isinstance(public_key, VconVerifier) else VconVerifier(public_key)
+        return verifier.verify(self)
 
     @classmethod
-    def generate_key_pair(cls) -> tuple:
+    def generate_key_pair(cls, algorithm: str = "RS256") -> tuple:
         """
-        Generate a new RSA key pair for signing vCons.
+        Generate a new key pair for signing vCons.
+
+        The signature algorithm follows from the key type, see
+        :func:`vcon.signing.generate_key_pair`.
 
+        :param algorithm: ``"RS256"`` for RSA-2048, ``"ES256"`` for P-256 or
+            ``"EdDSA"`` for Ed25519
+        :type algorithm: str
         :return: a tuple containing the private key and public key
-        :rtype: tuple[rSA.RSAPrivateKey, rsa.RSAPublicKey]
+        :rtype: tuple
+        :raises ValueError: if the algorithm is not supported
         """
-        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-        public_key = private_key.public_key()
-        return private_key, public_key
+        return generate_key_pair(algorithm)
@@ -0,0 +1,200 @@
+"""
+Views over the dictionaries and lists that make up a vCon.
+
+Views never copy: nested containers are wrapped lazily as they are
+accessed, so reading a single field from a large vCon costs the same as
+reading it from the underlying dictionary. Changes made to the vCon are
+visible through views created before the change.
+
+:class:`ReadOnlyDict` and :class:`ReadOnlyList` are read-only.
+:class:`PartyView` and :class:`DialogView` are typed proxies: they are
+:class:`Party` and :class:`Dialog` instances whose attributes read from and
+write to the party or dialog dict of the vCon.
+"""
+import inspect
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Optional
+from .party import Party
+from .dialog import Dialog
+from .timestamps import normalize_timestamp
+
+
+def read_only(value: Any) -> Any:
+    """
+    Wrap a value in a read-only view if it is a dict or a list.
+
+    :param value: the value to wrap
+    :type value: Any
+    :return: a ReadOnlyDict, a ReadOnlyList or the value itself
+    :rtype: Any
+    """
+    if isinstance(value, dict):
+        return ReadOnlyDict(value)
+    if isinstance(value, list):
+        return ReadOnlyList(value)
+    return value
+
+
+class ReadOnlyDict(Mapping):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict) -> None:
+        """
+        Initialize a read-only view over a dictionary.
+
+        :param data: the dictionary to expose
+        :type data: dict
+        """
+        self._data = data
+
+    def __getitem__(self, key):
+        return read_only(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ReadOnlyDict):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ReadOnlyDict({self._data!r})"
+
+
+class ReadOnlyList(Sequence):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list) -> None:
+        """
+        Initialize a read-only view over a list.
+
+        :param data: the list to expose
+        :type data: list
+        """
+        self._data = data
+
+    def __getitem__(self, index):
+        return read_only(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ReadOnlyList):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ReadOnlyList({self._data!r})"
+
+
+class PartyView(Party):
+    __slots__ = ("_data", "_changed")
+
+    def __init__(self, data: dict, changed: Optional[Callable[[], None]] = None) -> None:
+        """
+        Initialize a Party proxy over a party dict.
+
+        Like a Party, fields that are not set read as None.
+
+        :param data: the party dict
+        :type data: dict
+        :param changed: called after a field is set through the proxy
+        :type changed: Callable[[], None] or None
+        """
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_changed", changed)
+
+    def __getattr__(self, name: str):
+        # only called when the attribute is not found on the object itself
+        data = object.__getattribute__(self, "_data")
+        if name in data:
+            return data[name]
+        if name in Party.__slots__:
+            return None
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value) -> None:
+        if value is None:
+            self._data.pop(name, None)
+        else:
+            self._data[name] = value
+        if self._changed is not None:
+            self._changed()
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in self._data.items() if value is not None}
+
+    def __copy__(self):
+        return type(self)(self._data, self._changed)
+
+    def __reduce__(self):
+        # the slot state cannot be restored through __setattr__; a deep
+        # copy or unpickled view gets its own party dict, detached from
+        # the vCon
+        return type(self), (self._data,)
+
+    def __repr__(self) -> str:
+        return f"PartyView({self._data!r})"
+
+
+_DIALOG_FIELDS = frozenset(inspect.signature(Dialog.__init__).parameters) - {"self"}
+
+
+class DialogView(Dialog):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict) -> None:
+        """
+        Initialize a Dialog proxy over a dialog dict.
+
+        Like a Dialog, fields that are not set read as None. The start time
+        is returned as stored, without parsing it.
+
+        :param data: the dialog dict
+        :type data: dict
+        """
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, name: str):
+        # only called when the attribute is not found on the object itself
+        if name in _DIALOG_FIELDS:
+            return object.__getattribute__(self, "_data").get(name)
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value) -> None:
+        if name not in _DIALOG_FIELDS:
+            raise AttributeError(f"Dialog has no field {name}")
+        if name == "start" and value is not None:
+            # stored as an ISO 8601 string, like Dialog.__init__ does
+            value = normalize_timestamp(value)
+        if value is None:
+            self._data.pop(name, None)
+        else:
+            self._data[name] = value
+
+    def to_dict(self) -> dict:
+        """
+        Returns a dictionary representation of the dialog.
+
+        :return: a shallow copy of the dialog dict without None values
+        :rtype: dict
+        """
+        return {key: value for key, value in self._data.items() if value is not None}
+
+    def __reduce__(self):
+        return type(self), (self._data,)
+
+    def __repr__(self) -> str:
+        return f"DialogView({self._data!r})"
@@ -0,0 +1,89 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class MediaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MediaHandler)
+        self.media = {}
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.downloads = 0
+        self.connections = 0
+        self.failures = {}
+        self.delay = 0.0
+
+    def handle_error(self, request, client_address):
+        # clients that time out close the connection mid-response
+        pass
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            media = server.media.get(self.path)
+            with server.lock:
+                failing = server.failures.get(self.path, 0)
+                if failing:
+                    server.failures[self.path] = failing - 1
+            if media is None or failing:
+                self.send_response(503 if failing else 404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body, content_type = media
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            with server.lock:
+                server.downloads += 1
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+@pytest.fixture
+def media_server():
+    server = MediaServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
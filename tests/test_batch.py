@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from vcon import Vcon, batch
+from vcon.io import VconWriter
+
+
+def party_count(vcon):
+    return len(vcon.parties)
+
+
+def fail_on_two(vcon):
+    if len(vcon.parties) == 2:
+        raise ValueError("two parties")
+    return len(vcon.parties)
+
+
+def make_documents(count):
+    documents = []
+    for i in range(count):
+        vcon = Vcon.build_new()
+        vcon.add_parties([{"tel": f"+1555555{j:04d}"} for j in range(i % 5)])
+        documents.append(vcon.to_json())
+    return documents
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_map_ordered(workers):
+    documents = make_documents(50)
+    stats = batch.BatchStats()
+    results = list(batch.map(party_count, documents, workers=workers, chunksize=4, stats=stats))
+    assert results == [i % 5 for i in range(50)]
+    assert stats.submitted == stats.completed == 50
+    assert sum(worker.vcons for worker in stats.workers.values()) == 50
+
+
+def test_map_unordered():
+    documents = make_documents(40)
+    results = batch.map(party_count, documents, workers=2, chunksize=3, ordered=False)
+    assert sorted(results) == sorted(i % 5 for i in range(40))
+
+
+def test_map_corpus_file_and_directory(tmp_path):
+    documents = make_documents(10)
+    with VconWriter(tmp_path / "corpus.jsonl.gz") as writer:
+        writer.write_many(Vcon.build_from_json(d) for d in documents)
+    assert list(batch.map(party_count, tmp_path / "corpus.jsonl.gz", workers=0)) == [i % 5 for i in range(10)]
+
+    directory = tmp_path / "vcons"
+    directory.mkdir()
+    for i, document in enumerate(documents[:3]):
+        (directory / f"{i}.json").write_text(document)
+    assert list(batch.map(party_count, str(directory), workers=0)) == [0, 1, 2]
+    assert list(batch.map(party_count, sorted(directory.iterdir()), workers=0)) == [0, 1, 2]
+    corpus = io.BytesIO("\n".join(documents[:4]).encode())
+    assert list(batch.map(party_count, corpus, workers=0)) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_map_errors(workers):
+    documents = make_documents(10) + ["{broken", json.dumps([1])]
+    with pytest.raises(ValueError, match="two parties"):
+        list(batch.map(fail_on_two, documents, workers=workers))
+
+    stats = batch.BatchStats()
+    seen = []
+    results = list(batch.map(fail_on_two, documents, workers=workers, errors="skip", stats=stats,
+                             progress=lambda s: seen.append(s.completed)))
+    assert results == [i % 5 for i in range(10) if i % 5 != 2]
+    assert stats.errors == 4
+    assert seen[-1] == 12
+
+
+def test_map_rejects_bad_options():
+    with pytest.raises(ValueError):
+        list(batch.map(party_count, [], errors="ignore"))
+    with pytest.raises(ValueError):
+        list(batch.map(party_count, [], chunksize=0))
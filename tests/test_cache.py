@@ -0,0 +1,156 @@
+import hashlib
+import multiprocessing
+import os
+
+import pytest
+
+from vcon.cache import MediaCache
+from vcon.dialog import Dialog
+from vcon.fetch import Fetcher
+
+
+def store(cache, url, body, **headers):
+    writer = cache.writer()
+    writer.write(body)
+    return writer.commit(url, **headers)
+
+
+def read(cache, url):
+    chunks = []
+    assert cache.read(cache.lookup(url), chunks.append, chunk_size=4)
+    return b"".join(chunks)
+
+
+def cached_fetcher(cache):
+    return Fetcher(cache=cache, backoff_factor=0, backoff_jitter=0)
+
+
+def test_store_and_read(tmp_path):
+    cache = MediaCache(tmp_path)
+    digest = store(cache, "http://example.com/a.wav", b"0123456789", content_type="audio/x-wav", etag='"1"')
+    assert digest == hashlib.sha256(b"0123456789").hexdigest()
+    entry = cache.lookup("http://example.com/a.wav")
+    assert entry["sha256"] == digest
+    assert entry["size"] == 10
+    assert entry["content_type"] == "audio/x-wav"
+    assert cache.validators(entry) == {"If-None-Match": '"1"'}
+    assert read(cache, "http://example.com/a.wav") == b"0123456789"
+    assert cache.lookup("http://example.com/b.wav") is None
+    assert os.listdir(tmp_path / "tmp") == []
+
+
+def test_content_is_stored_once(tmp_path):
+    cache = MediaCache(tmp_path)
+    store(cache, "http://example.com/a.wav", b"same")
+    store(cache, "http://example.com/b.wav", b"same")
+    assert cache.size() == 4
+    assert read(cache, "http://example.com/b.wav") == b"same"
+
+
+def test_abort_leaves_nothing_behind(tmp_path):
+    cache = MediaCache(tmp_path)
+    writer = cache.writer()
+    writer.write(b"partial")
+    writer.abort()
+    assert os.listdir(tmp_path / "tmp") == []
+    assert cache.size() == 0
+
+
+def test_least_recently_used_bodies_are_evicted(tmp_path):
+    cache = MediaCache(tmp_path, max_bytes=25)
+    for name, age in (("a", 30), ("b", 20)):
+        digest = store(cache, f"http://example.com/{name}", name.encode() * 10)
+        os.utime(cache.blob_path(digest), (0, os.path.getmtime(cache.blob_path(digest)) - age))
+    # reading a makes it the most recently used
+    read(cache, "http://example.com/a")
+    store(cache, "http://example.com/c", b"c" * 10)
+    assert cache.lookup("http://example.com/b") is None
+    assert read(cache, "http://example.com/a") == b"a" * 10
+    assert read(cache, "http://example.com/c") == b"c" * 10
+    assert cache.stats.evictions == 1
+    assert cache.size() <= 25
+
+
+def test_clear(tmp_path):
+    cache = MediaCache(tmp_path)
+    store(cache, "http://example.com/a", b"a")
+    cache.clear()
+    assert cache.lookup("http://example.com/a") is None
+    assert cache.size() == 0
+
+
+def _store_many(args):
+    directory, worker = args
+    cache = MediaCache(directory, max_bytes=1 << 20)
+    for i in range(20):
+        store(cache, f"http://example.com/{i}", f"body {i % 10}".encode() * 100)
+    return worker
+
+
+def test_shared_between_processes(tmp_path):
+    with multiprocessing.get_context().Pool(3) as pool:
+        assert sorted(pool.map(_store_many, [(str(tmp_path), worker) for worker in range(3)])) == [0, 1, 2]
+    cache = MediaCache(tmp_path)
+    for i in range(20):
+        assert read(cache, f"http://example.com/{i}") == f"body {i % 10}".encode() * 100
+    assert len(os.listdir(tmp_path / "urls")) == 20
+    assert os.listdir(tmp_path / "tmp") == []
+
+
+def test_fetcher_revalidates_cached_media(media_server, tmp_path):
+    media_server.media["/calls/a.wav"] = (b"\x00\x01audio", "audio/x-wav")
+    url = f"{media_server.url}/calls/a.wav"
+    cache = MediaCache(tmp_path)
+    with cached_fetcher(cache) as fetcher:
+        first = Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0], url=url)
+        first.to_inline_data(fetcher)
+        second = Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0], url=url)
+        second.to_inline_data(fetcher)
+        third = Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0])
+        third.add_external_data(url, None, None, fetcher=fetcher)
+
+    assert second.body == first.body
+    assert second.mimetype == "audio/x-wav"
+    assert third.signature == first.signature
+    assert media_server.requests == 3
+    assert media_server.downloads == 1
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (2, 1, 1)
+
+
+def test_fetcher_refetches_changed_media(media_server, tmp_path):
+    media_server.media["/calls/a.wav"] = (b"old", "audio/x-wav")
+    url = f"{media_server.url}/calls/a.wav"
+    cache = MediaCache(tmp_path)
+    chunks = []
+    with cached_fetcher(cache) as fetcher:
+        fetcher.stream(url, chunks.append)
+        media_server.media["/calls/a.wav"] = (b"new", "audio/x-wav")
+        chunks.clear()
+        fetcher.stream(url, chunks.append)
+    assert b"".join(chunks) == b"new"
+    assert media_server.downloads == 2
+    assert cache.stats.misses == 2
+    assert read(cache, url) == b"new"
+
+
+def test_fetcher_without_revalidation(media_server, tmp_path):
+    media_server.media["/calls/a.wav"] = (b"audio", "audio/x-wav")
+    url = f"{media_server.url}/calls/a.wav"
+    cache = MediaCache(tmp_path, revalidate=False)
+    with cached_fetcher(cache) as fetcher:
+        for _ in range(3):
+            chunks = []
+            assert fetcher.stream(url, chunks.append) == "audio/x-wav"
+            assert b"".join(chunks) == b"audio"
+    assert media_server.requests == 1
+    assert cache.stats.hits == 2
+
+
+def test_failed_downloads_are_not_cached(media_server, tmp_path):
+    cache = MediaCache(tmp_path)
+    with cached_fetcher(cache) as fetcher:
+        with pytest.raises(Exception, match="404"):
+            fetcher.stream(f"{media_server.url}/missing", lambda chunk: None)
+    assert cache.lookup(f"{media_server.url}/missing") is None
+    assert cache.stats.misses == 1
+    assert os.listdir(tmp_path / "tmp") == []
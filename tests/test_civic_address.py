@@ -311,4 +311,15 @@ def test_initialize_with_mixed_data():
     address = CivicAddress(**mixed_data)
 
     # Then
-    assert address.to_dict() == mixed_data
\ No newline at end of file
+    assert address.to_dict() == mixed_data
+
+
+# CivicAddress stores its fields in slots rather than a per-instance dict
+def test_uses_slots():
+    # Given
+    address = CivicAddress(country="US")
+
+    # Then
+    assert not hasattr(address, "__dict__")
+    with pytest.raises(AttributeError):
+        address.unknown = "value"
@@ -205,8 +205,8 @@ class TestDialog:
         response_mock = mocker.Mock()
         response_mock.status_code = 200
         response_mock.headers = {"Content-Type": "text/plain"}
-        response_mock.text = "sample data"
-        mocker.patch("requests.get", return_value=response_mock)
+        response_mock.iter_content.return_value = [b"sample ", b"data"]
+        mocker.patch("requests.Session.get", return_value=response_mock)
 
         # Act
         dialog.add_external_data(url, filename, mimetype)
@@ -229,7 +229,7 @@ class TestDialog:
         mimetype = "text/plain"
         response_mock = mocker.Mock()
         response_mock.status_code = 404
-        mocker.patch("requests.get", return_value=response_mock)
+        mocker.patch("requests.Session.get", return_value=response_mock)
 
         # Act & Assert
         with pytest.raises(Exception) as excinfo:
@@ -247,8 +247,8 @@ class TestDialog:
         response_mock = mocker.Mock()
         response_mock.status_code = 200
         response_mock.headers = {"Content-Type": mimetype}
-        response_mock.text = "dummy data"
-        mocker.patch('requests.get', return_value=response_mock)
+        response_mock.iter_content.return_value = [b"dummy data"]
+        mocker.patch('requests.Session.get', return_value=response_mock)
 
         # Invoke
         dialog.add_external_data(url, filename, None)
@@ -267,8 +267,8 @@ class TestDialog:
         response_mock = mocker.Mock()
         response_mock.status_code = 200
         response_mock.headers = {"Content-Type": mimetype}
-        response_mock.text = "dummy data"
-        mocker.patch('requests.get', return_value=response_mock)
+        response_mock.iter_content.return_value = [b"dummy data"]
+        mocker.patch('requests.Session.get', return_value=response_mock)
 
         # Invoke
         dialog.add_external_data(url, filename, None)
@@ -367,7 +367,7 @@ class TestDialog:
         start_time = datetime(2022, 9, 15, 10, 30, 0)
 
         # Create a Dialog object with a datetime start time
-        with patch('src.vcon.dialog.parser') as mock_parser:
+        with patch('src.vcon.timestamps.parser') as mock_parser:
             mock_parser.parse.return_value.isoformat.return_value = '2022-09-15T10:30:00'
             dialog = Dialog(
                 type="audio",
@@ -387,7 +387,7 @@ class TestDialog:
         start_time = "2022-01-01T12:00:00"
         expected_iso_time = "2022-01-01T12:00:00"
 
-        with patch('src.vcon.dialog.parser') as mock_parser:
+        with patch('src.vcon.timestamps.parser') as mock_parser:
             mock_parser.parse.return_value.isoformat.return_value = expected_iso_time
 
             dialog = Dialog(
@@ -396,4 +396,12 @@ class TestDialog:
                 parties=[1, 2, 3]
             )
 
-            assert dialog.start == expected_iso_time
\ No newline at end of file
+            assert dialog.start == expected_iso_time
+
+    # Dialog stores its fields in slots rather than a per-instance dict
+    def test_uses_slots(self):
+        dialog = Dialog(type="text", start="2022-01-01T12:00:00", parties=[0, 1])
+
+        assert not hasattr(dialog, "__dict__")
+        with pytest.raises(AttributeError):
+            dialog.unknown = "value"
@@ -0,0 +1,225 @@
+import asyncio
+import base64
+import hashlib
+import importlib.util
+import time
+
+import pytest
+import requests
+
+from vcon import Vcon
+from vcon.dialog import Dialog
+from vcon.fetch import AsyncFetcher, Fetcher, get_default_fetcher, set_default_fetcher
+
+requires_aiohttp = pytest.mark.skipif(importlib.util.find_spec("aiohttp") is None, reason="aiohttp is not installed")
+
+
+def signature_of(text):
+    return base64.urlsafe_b64encode(hashlib.sha256(text.encode()).digest()).decode()
+
+
+def encoded(text):
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+@requires_aiohttp
+def test_add_external_data_async(media_server):
+    media_server.media["/calls/a.txt"] = (b"hello", "text/plain")
+    dialog = Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0])
+    asyncio.run(dialog.add_external_data_async(f"{media_server.url}/calls/a.txt", None, None))
+    assert dialog.filename == "a.txt"
+    assert dialog.mimetype == "text/plain"
+    assert dialog.signature == signature_of("hello")
+
+
+@requires_aiohttp
+def test_to_inline_data_async_with_shared_fetcher(media_server):
+    media_server.media["/calls/b.txt"] = (b"world", "text/plain")
+    dialog = Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0],
+                    url=f"{media_server.url}/calls/b.txt")
+
+    async def inline():
+        async with AsyncFetcher(concurrency=2) as fetcher:
+            await dialog.to_inline_data_async(fetcher)
+
+    asyncio.run(inline())
+    assert dialog.body == encoded("world")
+    assert dialog.filename == "b.txt"
+    assert dialog.signature == signature_of("world")
+
+
+@requires_aiohttp
+def test_fetch_error_status(media_server):
+    dialog = Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0],
+                    url=f"{media_server.url}/missing")
+    with pytest.raises(Exception, match="Failed to fetch external data: 404"):
+        asyncio.run(dialog.to_inline_data_async())
+
+
+def fast_fetcher(**options):
+    options.setdefault("backoff_factor", 0)
+    options.setdefault("backoff_jitter", 0)
+    return Fetcher(**options)
+
+
+def test_add_external_data_with_fetcher(media_server):
+    media_server.media["/calls/a.txt"] = (b"hello", "text/plain")
+    dialog = Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0])
+    with fast_fetcher() as fetcher:
+        dialog.add_external_data(f"{media_server.url}/calls/a.txt", None, None, fetcher=fetcher)
+    assert dialog.filename == "a.txt"
+    assert dialog.mimetype == "text/plain"
+    assert dialog.signature == signature_of("hello")
+
+
+def test_fetcher_reuses_connections(media_server):
+    media_server.media["/calls/a.txt"] = (b"hello", "text/plain")
+    with fast_fetcher() as fetcher:
+        for _ in range(5):
+            assert fetcher.fetch(f"{media_server.url}/calls/a.txt") == ("hello", "text/plain")
+    assert media_server.requests == 5
+    assert media_server.connections == 1
+
+
+def test_fetcher_retries_transient_errors(media_server):
+    media_server.media["/calls/a.txt"] = (b"hello", "text/plain")
+    media_server.failures["/calls/a.txt"] = 2
+    with fast_fetcher(retries=2) as fetcher:
+        assert fetcher.fetch(f"{media_server.url}/calls/a.txt")[0] == "hello"
+    assert media_server.requests == 3
+
+
+def test_fetcher_gives_up_after_retries(media_server):
+    media_server.media["/calls/a.txt"] = (b"hello", "text/plain")
+    media_server.failures["/calls/a.txt"] = 5
+    with fast_fetcher(retries=1) as fetcher:
+        with pytest.raises(Exception, match="Failed to fetch external data: 503"):
+            fetcher.fetch(f"{media_server.url}/calls/a.txt")
+    assert media_server.requests == 2
+
+
+def test_fetcher_times_out(media_server):
+    media_server.media["/calls/a.txt"] = (b"hello", "text/plain")
+    media_server.delay = 0.5
+    started = time.perf_counter()
+    with fast_fetcher(read_timeout=0.05, retries=0) as fetcher:
+        with pytest.raises(requests.exceptions.RequestException):
+            fetcher.fetch(f"{media_server.url}/calls/a.txt")
+    assert time.perf_counter() - started < 0.4
+
+
+def test_fetch_many_limits_connections_per_host(media_server):
+    media_server.delay = 0.05
+    for i in range(6):
+        media_server.media[f"/calls/{i}.txt"] = (f"body {i}".encode(), "text/plain")
+    urls = [f"{media_server.url}/calls/{i}.txt" for i in range(6)] + [f"{media_server.url}/missing"]
+    with fast_fetcher(pool_maxsize=2) as fetcher:
+        results = fetcher.fetch_many(urls, workers=6)
+    assert [text for text, _ in results[:6]] == [f"body {i}" for i in range(6)]
+    assert str(results[6]) == "Failed to fetch external data: 404"
+    assert media_server.max_in_flight == 2
+
+
+def test_default_fetcher():
+    fetcher = fast_fetcher()
+    try:
+        set_default_fetcher(fetcher)
+        assert get_default_fetcher() is fetcher
+    finally:
+        set_default_fetcher(None)
+    assert get_default_fetcher() is not fetcher
+
+
+def test_inline_all_external(media_server):
+    media_server.delay = 0.05
+    vcon = Vcon.build_new()
+    for i in range(12):
+        media_server.media[f"/calls/{i}.txt"] = (f"body {i}".encode(), "text/plain")
+        vcon.add_dialog(Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0],
+                               url=f"{media_server.url}/calls/{i}.txt"))
+    vcon.add_dialog(Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0], body="inline"))
+
+    assert vcon.inline_all_external(concurrency=4) == list(range(12))
+    assert [d["body"] for d in vcon.dialog[:3]] == [encoded(f"body {i}") for i in range(3)]
+    assert vcon.dialog[5]["signature"] == signature_of("body 5")
+    assert 1 < media_server.max_in_flight <= 4
+    # already inlined dialogs are not fetched again
+    assert vcon.inline_all_external() == []
+    assert media_server.requests == 12
+
+
+def test_inline_all_external_reports_failures(media_server):
+    media_server.media["/calls/ok.txt"] = (b"ok", "text/plain")
+    vcon = Vcon.build_new()
+    for path in ("/calls/ok.txt", "/calls/missing.txt"):
+        vcon.add_dialog(Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0],
+                               url=media_server.url + path))
+    with pytest.raises(Exception, match="404"):
+        vcon.inline_all_external()
+    assert vcon.dialog[0]["body"] == encoded("ok")
+    assert "body" not in vcon.dialog[1]
+
+
+@requires_aiohttp
+def test_inline_all_external_async(media_server):
+    media_server.media["/calls/a.txt"] = (b"hello", "text/plain")
+    vcon = Vcon.build_new()
+    vcon.add_dialog(Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0],
+                           url=f"{media_server.url}/calls/a.txt"))
+    assert asyncio.run(vcon.inline_all_external_async(concurrency=2)) == [0]
+    assert vcon.dialog[0]["body"] == encoded("hello")
+
+
+@requires_aiohttp
+def test_fetcher_rejects_bad_concurrency():
+    with pytest.raises(ValueError):
+        AsyncFetcher(concurrency=0)
+
+
+def test_binary_content_is_hashed_and_encoded_raw(media_server):
+    audio = bytes(range(256)) * 1000 + b"\xff\xfe"
+    media_server.media["/calls/a.wav"] = (audio, "audio/x-wav")
+    dialog = Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0],
+                    url=f"{media_server.url}/calls/a.wav")
+    signature = base64.urlsafe_b64encode(hashlib.sha256(audio).digest()).decode()
+
+    external = Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0])
+    external.add_external_data(dialog.url, None, None)
+    assert external.signature == signature
+
+    with fast_fetcher() as fetcher:
+        dialog.to_inline_data(fetcher)
+    assert dialog.signature == signature
+    assert dialog.encoding == "base64url"
+    assert base64.urlsafe_b64decode(dialog.body) == audio
+    assert dialog.body == base64.urlsafe_b64encode(audio).decode()
+    assert not dialog.is_external_data_changed()
+
+
+def test_to_inline_data_streams_in_bounded_memory(mocker):
+    import tracemalloc
+
+    size, chunk_size = 8 << 20, 65536
+
+    def chunks(_):
+        for offset in range(0, size, chunk_size):
+            yield bytes([offset % 251]) * min(chunk_size, size - offset)
+
+    response = mocker.Mock()
+    response.status_code = 200
+    response.headers = {"Content-Type": "audio/x-wav"}
+    response.iter_content.side_effect = chunks
+    mocker.patch("requests.Session.get", return_value=response)
+    dialog = Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0],
+                    url="http://example.com/long.wav")
+
+    tracemalloc.start()
+    try:
+        dialog.to_inline_data(fast_fetcher())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(dialog.body) == (size + 2) // 3 * 4
+    # the encoded chunks and the joined body, nothing proportional to the
+    # decoded or re-encoded content
+    assert peak < 2.2 * len(dialog.body)
@@ -0,0 +1,65 @@
+from operator import methodcaller
+
+from vcon.index import ListIndex
+
+
+get_type = methodcaller("get", "type")
+
+
+def test_positions_and_first():
+    items = [{"type": "a"}, {"type": "b"}, {"type": "a"}]
+    index = ListIndex(get_type)
+    assert index.positions(items, "a") == [0, 2]
+    assert index.first(items, "b") == 1
+    assert index.first(items, "c") is None
+
+
+def test_appended_updates_index():
+    items = [{"type": "a"}]
+    index = ListIndex(get_type)
+    assert index.positions(items, "a") == [0]
+    items.append({"type": "a"})
+    index.appended(items)
+    assert index.positions(items, "a") == [0, 1]
+
+
+def test_direct_list_changes_trigger_rebuild():
+    items = [{"type": "a"}]
+    index = ListIndex(get_type)
+    assert index.first(items, "a") == 0
+    items.insert(0, {"type": "b"})
+    assert index.first(items, "a") == 1
+    items[1] = {"type": "c"}
+    assert index.first(items, "a") is None
+    assert index.first(items, "c") == 1
+
+
+def test_unhashable_values():
+    items = [{"type": ["x"]}, {"type": "a"}]
+    index = ListIndex(get_type)
+    assert index.positions(items, ["x"]) == [0]
+    assert index.positions(items, "a") == [1]
+
+
+def test_compile_path_matches_pydash():
+    from pydash import get
+
+    from vcon.index import compile_path
+
+    data = {"a": {"b": [1, {"c": 2}]}, "x.y": 3, "tel": "+1"}
+    for path in ["tel", "a.b", "a.b.1.c", "a.b[1].c", "a.z.q", "x\\.y", "a.b.5", "missing"]:
+        assert compile_path(path)(data) == get(data, path)
+    assert compile_path("tel") is compile_path("tel")
+
+
+def test_many_values_per_entry():
+    get_dialogs = methodcaller("get", "dialog", [])
+    items = [{"dialog": [0, 1]}, {"dialog": [1, 1]}, {"dialog": []}]
+    index = ListIndex(get_dialogs, many=True)
+    assert index.positions(items, 1) == [0, 1]
+    assert index.positions(items, 0) == [0]
+    items.append({"dialog": [2, 0]})
+    index.appended(items)
+    assert index.positions(items, 0) == [0, 3]
+    items[0]["dialog"] = [2]
+    assert index.positions(items, 0) == [3]
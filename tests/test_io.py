@@ -0,0 +1,84 @@
+import gzip
+import io
+
+import pytest
+
+from vcon import Vcon
+from vcon.io import VconReader, VconWriter, iter_vcons
+
+
+def make_vcons(count):
+    vcons = []
+    for i in range(count):
+        vcon = Vcon.build_new()
+        vcon.add_attachment(type="tags", body=[f"n:{i}"])
+        vcons.append(vcon)
+    return vcons
+
+
+@pytest.mark.parametrize("name", ["corpus.jsonl", "corpus.jsonl.gz"])
+def test_round_trip_path(tmp_path, name):
+    path = tmp_path / name
+    vcons = make_vcons(5)
+    with VconWriter(path, buffer_size=64) as writer:
+        writer.write_many(vcons)
+    assert writer.stats.vcons == 5
+
+    if name.endswith(".gz"):
+        with gzip.open(path, "rb") as fp:
+            assert len(fp.read().splitlines()) == 5
+
+    read = list(iter_vcons(path))
+    assert [v.uuid for v in read] == [v.uuid for v in vcons]
+    assert read[3].get_tag("n") == "3"
+
+
+def test_detects_gzip_file_object():
+    fp = io.BytesIO()
+    with VconWriter(fp, compression="gzip") as writer:
+        writer.write_many(make_vcons(3))
+    assert not fp.closed
+    fp.seek(0)
+    assert len(list(iter_vcons(fp))) == 3
+    assert not fp.closed
+
+
+def test_bad_lines_are_skipped_and_reported():
+    good = make_vcons(2)
+    lines = [good[0].to_json(), "{not json", "", "[1, 2]", good[1].to_json()]
+    reported = []
+    reader = VconReader(io.BytesIO("\n".join(lines).encode()),
+                        on_error=lambda number, line, error: reported.append(number))
+    assert [v.uuid for v in reader] == [good[0].uuid, good[1].uuid]
+    assert reported == [2, 4]
+    assert [number for number, _ in reader.errors] == [2, 4]
+    assert reader.stats.lines == 5
+    assert reader.stats.vcons == 2
+    assert reader.stats.errors == 2
+    assert reader.stats.vcons_per_second > 0
+
+
+def test_strict_raises():
+    with pytest.raises(ValueError):
+        list(iter_vcons(io.BytesIO(b"{oops}\n"), strict=True))
+
+
+def test_text_file_object_and_lazy():
+    vcon = Vcon.build_new()
+    vcon.add_attachment(type="audio", body="A" * 5000, encoding="base64url")
+    read = next(iter_vcons(io.StringIO(vcon.to_json() + "\n"), lazy=True))
+    assert not read.attachments[0].is_loaded("body")
+    assert read.attachments[0]["body"] == "A" * 5000
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        VconWriter(tmp_path / "corpus.jsonl", compression="bz2")
+
+
+def test_zstd_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    path = tmp_path / "corpus.jsonl.zst"
+    with VconWriter(path) as writer:
+        writer.write_many(make_vcons(3))
+    assert len(list(iter_vcons(path))) == 3
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from vcon import Vcon, json_engine
+
+
+sample = {
+    "uuid": "f6603c8b-f3c6-4d12-bc50-b0a1f1c887b3",
+    "created_at": "2024-05-03T20:13:48.414984",
+    "parties": [{"name": "Zoë / agent", "tel": "+14327534365"}],
+    "dialog": [{"type": "text", "duration": 59.304, "parties": [0, 1], "body": "héllo"}],
+}
+
+
+@pytest.fixture(autouse=True)
+def restore_engine():
+    yield
+    json_engine.set_json_engine()
+
+
+@pytest.mark.parametrize("engine", ["json", "orjson", "ujson"])
+def test_compat_mode_matches_stdlib(engine):
+    pytest.importorskip(engine)
+    json_engine.set_json_engine(engine)
+    vcon = Vcon(sample)
+    assert vcon.to_json(compat=True) == json.dumps(vcon.vcon_dict)
+
+
+def test_auto_engine_keeps_compat_mode():
+    json_engine.set_json_engine()
+    vcon = Vcon(sample)
+    assert vcon.to_json() == json.dumps(vcon.vcon_dict)
+
+
+@pytest.mark.parametrize("engine", ["json", "orjson", "ujson"])
+def test_named_engine_encodes(engine, tmp_path):
+    pytest.importorskip(engine)
+    vcon = Vcon(sample)
+    native = json_engine.dumps(vcon.vcon_dict, engine, compat=False)
+    assert vcon.to_json(engine=engine) == native
+    json_engine.set_json_engine(engine)
+    assert vcon.to_json() == native
+    if engine != "json":
+        with pytest.raises(ValueError, match="compat"):
+            vcon.to_json(engine=engine, compat=True)
+        with pytest.raises(ValueError, match="compat"):
+            json_engine.set_json_engine(engine, compat=True)
+
+
+@pytest.mark.parametrize("engine", ["json", "orjson", "ujson"])
+def test_native_mode_is_compact(engine):
+    pytest.importorskip(engine)
+    assert json_engine.dumps(sample, engine, compat=False) == json.dumps(
+        sample, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+@pytest.mark.parametrize("engine", ["json", "orjson", "ujson"])
+def test_round_trip(engine):
+    pytest.importorskip(engine)
+    vcon = Vcon.build_from_json(json.dumps(sample), engine=engine)
+    assert vcon.to_dict() == Vcon(sample).to_dict()
+
+
+@pytest.mark.parametrize("engine", ["json", "orjson", "ujson"])
+def test_decode_error(engine):
+    pytest.importorskip(engine)
+    with pytest.raises(json.JSONDecodeError):
+        json_engine.loads("invalid_json", engine)
+
+
+def test_auto_picks_installed_engine():
+    name = json_engine.set_json_engine("auto")
+    assert name in json_engine.ENGINES
+    assert json_engine.get_json_engine() == name
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        json_engine.set_json_engine("simplejson")
+
+
+def test_compat_mode_decodes_like_stdlib():
+    vcon = Vcon(dict(sample, meta={"score": float("nan"), "id": 2 ** 70}))
+    decoded = Vcon.build_from_json(vcon.to_json())
+    assert decoded.vcon_dict["meta"]["id"] == 2 ** 70
+    assert decoded.vcon_dict["meta"]["score"] != decoded.vcon_dict["meta"]["score"]
+
+
+@pytest.mark.parametrize("engine", ["json", "orjson", "ujson"])
+def test_copy_does_not_depend_on_engine(engine):
+    pytest.importorskip(engine)
+    json_engine.set_json_engine(engine, compat=False)
+    original = dict(sample, meta={"score": float("nan"), "id": 2 ** 70})
+    vcon = Vcon(original)
+    assert vcon.vcon_dict["meta"]["id"] == 2 ** 70
+    assert vcon.vcon_dict["meta"]["score"] != vcon.vcon_dict["meta"]["score"]
+    vcon.vcon_dict["parties"][0]["name"] = "changed"
+    assert original["parties"][0]["name"] == "Zoë / agent"
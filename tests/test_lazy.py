@@ -0,0 +1,81 @@
+import base64
+import copy
+import json
+import os
+import pickle
+
+import pytest
+
+from vcon import Vcon, json_engine
+from vcon.lazy import LazyDict, parse_lazy
+
+
+audio = base64.urlsafe_b64encode(os.urandom(30000)).decode()
+sample = {
+    "uuid": "f6603c8b-f3c6-4d12-bc50-b0a1f1c887b3",
+    "vcon": "0.0.1",
+    "created_at": "2024-05-03T20:13:48.414984",
+    "parties": [{"tel": "+14327534365", "name": 'Quote "body": "x" inside'}],
+    "dialog": [
+        {"type": "recording", "parties": [0], "body": audio, "encoding": "base64url"},
+        {"type": "text", "parties": [0], "body": "short"},
+    ],
+    "attachments": [{"type": "transcript", "body": 'escaped \\ and "quotes" ' * 500, "encoding": "none"}],
+    "analysis": [{"type": "summary", "body": {"body": "nested " * 1000}, "encoding": "none"}],
+}
+sample_json = json.dumps(sample)
+
+
+def test_large_bodies_are_deferred():
+    vcon_dict = parse_lazy(sample_json)
+    dialog = vcon_dict["dialog"][0]
+    assert isinstance(dialog, LazyDict)
+    assert not dialog.is_loaded("body")
+    assert type(vcon_dict["dialog"][1]) is dict
+    assert not vcon_dict["attachments"][0].is_loaded("body")
+    assert not vcon_dict["analysis"][0]["body"].is_loaded("body")
+
+
+def test_deferred_bodies_decode_on_access():
+    vcon_dict = parse_lazy(sample_json)
+    assert vcon_dict["dialog"][0]["body"] == audio
+    assert vcon_dict["dialog"][0].is_loaded("body")
+    assert vcon_dict["attachments"][0].get("body") == sample["attachments"][0]["body"]
+    assert vcon_dict == sample
+
+
+def test_dict_operations_see_decoded_bodies():
+    dialog = parse_lazy(sample_json)["dialog"][0]
+    assert dict(dialog)["body"] == audio
+    assert {**dialog}["body"] == audio
+    assert dict(dialog.items())["body"] == audio
+    assert copy.deepcopy(parse_lazy(sample_json)) == sample
+    assert pickle.loads(pickle.dumps(parse_lazy(sample_json)["dialog"][0]))["body"] == audio
+    assert parse_lazy(sample_json)["dialog"][0].pop("body") == audio
+
+
+@pytest.mark.parametrize("engine", ["json", "orjson", "ujson"])
+def test_serialization(engine):
+    pytest.importorskip(engine)
+    vcon_dict = parse_lazy(sample_json)
+    encoded = json_engine.dumps(vcon_dict, engine, compat=False)
+    assert json.loads(encoded) == sample
+
+
+def test_build_from_json_lazy():
+    vcon = Vcon.build_from_json(sample_json, lazy=True)
+    assert vcon.uuid == sample["uuid"]
+    assert vcon.parties[0].name == sample["parties"][0]["name"]
+    assert not vcon.dialog[0].is_loaded("body")
+    assert vcon.to_json() == Vcon.build_from_json(sample_json).to_json()
+    assert vcon.to_dict() == Vcon.build_from_json(sample_json).to_dict()
+
+
+def test_bytes_and_small_documents():
+    assert parse_lazy(sample_json.encode()) == sample
+    assert parse_lazy('{"dialog": [{"body": "x"}]}') == {"dialog": [{"body": "x"}]}
+
+
+def test_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        parse_lazy('{"dialog": [{"body": "' + "x" * 5000)
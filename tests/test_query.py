@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+from vcon import Vcon
+from vcon.dialog import Dialog
+from vcon.query import DialogQuery
+from vcon.views import ReadOnlyDict
+
+
+def build_vcon():
+    vcon = Vcon.build_new()
+    vcon.add_dialog(Dialog(type="text", start="2024-01-01T10:00:00Z", parties=[0, 1], originator=0,
+                           mimetype="text/plain", body="hi"))
+    vcon.add_dialog(Dialog(type="recording", start="2024-01-01T10:05:00+00:00", parties=[0, [1, 2]],
+                           mimetype="audio/x-wav", url="https://example.com/a.wav"))
+    vcon.add_dialog(Dialog(type="text", start="2024-01-01T06:10:00-05:00", parties=[1, 2], originator=2,
+                           mimetype="text/plain", body="hello"))
+    vcon.add_dialog(Dialog(type="transfer", start="2024-01-01T11:30:00", parties=[1]))
+    return vcon
+
+
+def test_single_conditions():
+    vcon = build_vcon()
+    assert vcon.find_dialog_indices(type="text") == [0, 2]
+    assert vcon.find_dialog_indices(mimetype=["audio/x-wav", "audio/ogg"]) == [1]
+    assert vcon.find_dialog_indices(party=2) == [1, 2]
+    assert vcon.find_dialog_indices(originator=2) == [2]
+    assert vcon.find_dialog_indices() == [0, 1, 2, 3]
+
+
+def test_time_range():
+    vcon = build_vcon()
+    assert vcon.find_dialog_indices(since="2024-01-01T10:05:00Z") == [1, 2, 3]
+    assert vcon.find_dialog_indices(until="2024-01-01T10:05:00Z") == [0]
+    since = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)
+    assert vcon.find_dialog_indices(since=since, until="2024-01-01T12:00:00") == [2, 3]
+
+
+def test_combined_conditions_and_reuse():
+    query = DialogQuery(type="text", party=1, since="2024-01-01T10:30:00Z")
+    vcon = build_vcon()
+    assert vcon.find_dialog_indices(query) == [2]
+    assert query.matches(vcon.dialog[2])
+    assert not query.matches(vcon.dialog[0])
+
+
+def test_find_dialogs_returns_views():
+    vcon = build_vcon()
+    dialogs = vcon.find_dialogs(type="text", originator=0)
+    assert len(dialogs) == 1
+    assert isinstance(dialogs[0], ReadOnlyDict)
+    assert dialogs[0]["body"] == "hi"
+    assert dialogs[0] == vcon.dialog[0]
@@ -0,0 +1,57 @@
+import pytest
+
+from vcon.civic_address import CivicAddress
+from vcon.dialog import Dialog
+from vcon.party import Party, PartyHistory
+from vcon.serializers import compile_to_dict
+
+
+class Point:
+    __slots__ = ("x", "y", "label")
+
+    def __init__(self, x=None, y=None, label=None):
+        self.x = x
+        self.y = y
+        self.label = label
+
+
+def test_compile_to_dict_skips_none_and_keeps_order():
+    to_dict = compile_to_dict("Point", ("y", "x", "label"))
+    assert list(to_dict(Point(1, 2))) == ["y", "x"]
+    assert to_dict(Point()) == {}
+    assert to_dict.__qualname__ == "Point.to_dict"
+
+
+def test_compile_to_dict_converters():
+    to_dict = compile_to_dict("Point", ("x", "label"), converters={"label": str.upper})
+    assert to_dict(Point(1, label="a")) == {"x": 1, "label": "A"}
+    # a converter returning None drops the field
+    to_dict = compile_to_dict("Point", ("x",), converters={"x": lambda x: None})
+    assert to_dict(Point(1)) == {}
+
+
+def test_compile_to_dict_rejects_invalid_fields():
+    with pytest.raises(ValueError):
+        compile_to_dict("Point", ("x; import os",))
+
+
+def test_civic_address_field_order():
+    address = CivicAddress(pc="90001", country="US", a1="CA")
+    assert list(address.to_dict()) == ["country", "a1", "pc"]
+
+
+def test_party_defaults_and_nested_civic_address():
+    party = Party(tel="+15555550100", civicaddress=CivicAddress(country="US"))
+    assert party.name is None
+    assert party.to_dict() == {"tel": "+15555550100", "civicaddress": {"country": "US"}}
+
+
+def test_dialog_party_history():
+    dialog = Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0, 1],
+                    party_history=[PartyHistory(0, "join", "2024-05-03T20:13:48+00:00")])
+    assert list(dialog.to_dict()) == ["type", "start", "parties", "party_history"]
+    assert dialog.to_dict()["party_history"] == [
+        {"party": 0, "event": "join", "time": "2024-05-03T20:13:48+00:00"}
+    ]
+    dialog.party_history = []
+    assert "party_history" not in dialog.to_dict()
@@ -0,0 +1,392 @@
+import base64
+import json
+import pickle
+
+import pytest
+from authlib.jose import JsonWebSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed448
+
+from vcon import Vcon
+from vcon.dialog import Dialog
+from vcon import signing
+from vcon.signing import (
+    BAD_SIGNATURE, MALFORMED, MANIFEST_CONTENT_TYPE, OK, KeyRing, VconSigner, VconVerifier, build_manifest,
+    import_key, sign_many, verify_many,
+)
+
+
+@pytest.fixture(scope="module")
+def key_pair():
+    return Vcon.generate_key_pair()
+
+
+@pytest.fixture(scope="module")
+def other_key_pair():
+    return Vcon.generate_key_pair()
+
+
+def make_vcon():
+    vcon = Vcon.build_new()
+    vcon.add_dialog(Dialog(type="text", start="2024-05-03T20:13:48+00:00", parties=[0], body="hello"))
+    return vcon
+
+
+def pem(public_key):
+    return public_key.public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+def test_sign_and_verify(key_pair, other_key_pair):
+    private_key, public_key = key_pair
+    vcon = make_vcon()
+    vcon.sign(private_key)
+    assert vcon.verify(public_key)
+    assert vcon.verify(pem(public_key))
+    assert not vcon.verify(other_key_pair[1])
+
+
+def test_signature_is_a_standard_jws(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_vcon()
+    VconSigner(private_key).sign(vcon)
+    signature = vcon.vcon_dict["signatures"][0]
+    compact = f"{signature['protected']}.{vcon.vcon_dict['payload']}.{signature['signature']}"
+    data = JsonWebSignature().deserialize_compact(compact, pem(public_key))
+    assert data["header"] == {"alg": "RS256", "typ": "JWS"}
+    assert json.loads(data["payload"])["uuid"] == vcon.uuid
+
+
+def test_signer_and_verifier_are_reusable(key_pair):
+    private_key, public_key = key_pair
+    signer, verifier = VconSigner(private_key), VconVerifier(public_key)
+    vcons = [make_vcon() for _ in range(3)]
+    for vcon in vcons:
+        vcon.sign(signer)
+    assert all(vcon.verify(verifier) for vcon in vcons)
+
+
+def test_tampered_vcon_fails(key_pair):
+    private_key, public_key = key_pair
+    signer = VconSigner(private_key)
+    vcon, other = make_vcon(), make_vcon()
+    signer.sign(vcon)
+    signer.sign(other)
+    vcon.vcon_dict["payload"] = other.vcon_dict["payload"][:-4] + "AAAA"
+    assert not VconVerifier(public_key).verify(vcon)
+
+
+def test_resigning_does_not_nest_payloads(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_vcon()
+    vcon.sign(private_key)
+    size = len(vcon.to_json())
+    for _ in range(3):
+        vcon.sign(private_key)
+        assert len(vcon.to_json()) == size
+    assert vcon.verify(public_key)
+    signed = json.loads(base64.urlsafe_b64decode(vcon.vcon_dict["payload"] + "=="))
+    assert "signatures" not in signed and "payload" not in signed
+    assert signed["uuid"] == vcon.uuid
+
+
+def test_key_ring_selects_key_by_kid(key_pair, other_key_pair):
+    ring = KeyRing({"current": key_pair[1], "previous": other_key_pair[1]})
+    for kid, private_key in (("current", key_pair[0]), ("previous", other_key_pair[0])):
+        vcon = make_vcon()
+        VconSigner(private_key, kid=kid).sign(vcon)
+        assert vcon.verify(ring)
+    vcon = make_vcon()
+    VconSigner(key_pair[0], kid="unknown").sign(vcon)
+    assert not vcon.verify(ring)
+    # without a kid every key in the ring is tried
+    vcon = make_vcon()
+    vcon.sign(other_key_pair[0])
+    assert vcon.verify(ring)
+
+
+def test_key_ring_from_jwks_file(tmp_path, key_pair):
+    private_key, public_key = key_pair
+    jwks = {"keys": [dict(import_key(public_key).as_dict(), kid="2024-05")]}
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks))
+    ring = KeyRing.from_jwks(path)
+    assert "2024-05" in ring and len(ring) == 1
+    assert ring.to_jwks() == jwks
+    vcon = make_vcon()
+    VconSigner(private_key, kid="2024-05").sign(vcon)
+    assert VconVerifier(ring).verify(vcon)
+    with pytest.raises(ValueError):
+        KeyRing.from_jwks({"keys": "none"})
+
+
+def test_key_ring_defaults_to_thumbprint(key_pair):
+    ring = KeyRing()
+    kid = ring.add(key_pair[1])
+    assert kid == import_key(key_pair[1]).thumbprint()
+    assert ring.get(kid) is not None
+
+
+def test_signer_requires_private_key(key_pair):
+    with pytest.raises(ValueError, match="private key"):
+        VconSigner(key_pair[1])
+
+
+def test_verify_unsigned_or_malformed(key_pair):
+    verifier = VconVerifier(key_pair[1])
+    vcon = make_vcon()
+    with pytest.raises(ValueError, match="not signed"):
+        verifier.verify(vcon)
+    vcon.sign(key_pair[0])
+    vcon.vcon_dict["signatures"][0]["protected"] = "not a header"
+    with pytest.raises(ValueError, match="Malformed"):
+        verifier.verify(vcon)
+
+
+def test_header_cannot_change_algorithm(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_vcon()
+    vcon.sign(private_key)
+    signature = vcon.vcon_dict["signatures"][0]
+    header = json.dumps({"alg": "none", "typ": "JWS"}).encode()
+    signature["protected"] = base64.urlsafe_b64encode(header).rstrip(b"=").decode()
+    signature["signature"] = ""
+    assert not vcon.verify(public_key)
+
+
+@pytest.mark.parametrize("executor,workers", [("process", 2), ("thread", 2), ("process", 0)])
+def test_sign_many_and_verify_many(key_pair, other_key_pair, executor, workers):
+    private_key, public_key = key_pair
+    vcons = [make_vcon() for _ in range(5)]
+    assert sign_many(vcons, VconSigner(private_key, kid="k1"), workers=workers, executor=executor,
+                     chunksize=2) == [OK] * 5
+    assert all(vcon.verify(public_key) for vcon in vcons)
+
+    vcons[1].vcon_dict["payload"] = vcons[2].vcon_dict["payload"]
+    vcons[3].vcon_dict["signatures"][0]["protected"] = "bm90IGpzb24"
+    vcons.append(make_vcon())
+    ring = KeyRing({"k1": public_key, "k2": other_key_pair[1]})
+    assert verify_many(vcons, ring, workers=workers, executor=executor) == [
+        OK, BAD_SIGNATURE, OK, MALFORMED, OK, MALFORMED
+    ]
+
+
+def test_sign_many_reports_unserializable_vcons(key_pair):
+    vcons = [make_vcon(), make_vcon()]
+    vcons[0].vcon_dict["meta"] = {"bad": object()}
+    assert sign_many(vcons, VconSigner(key_pair[0]), workers=0) == [MALFORMED, OK]
+    assert "signatures" not in vcons[0].vcon_dict
+
+
+def test_signers_and_verifiers_pickle(key_pair):
+    signer = pickle.loads(pickle.dumps(VconSigner(key_pair[0], kid="k1")))
+    vcon = make_vcon()
+    signer.sign(vcon)
+    assert pickle.loads(pickle.dumps(VconVerifier(key_pair[1]))).verify(vcon)
+    assert pickle.loads(pickle.dumps(VconVerifier(KeyRing({"k1": key_pair[1]})))).verify(vcon)
+
+
+def test_unknown_executor(key_pair):
+    with pytest.raises(ValueError, match="executor"):
+        sign_many([make_vcon()], VconSigner(key_pair[0]), executor="gpu")
+
+
+def make_media_vcon(size=1 << 20):
+    vcon = make_vcon()
+    body = base64.urlsafe_b64encode(b"\x01" * size).decode()
+    vcon.add_dialog(Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0],
+                           mimetype="audio/x-wav", body=body, encoding="base64url"))
+    vcon.add_dialog(Dialog(type="recording", start="2024-05-03T20:13:48+00:00", parties=[0],
+                           url="https://example.com/a.wav", alg="sha256", signature="abc"))
+    vcon.add_attachment(type="transcript", body={"text": "hello"}, encoding="json")
+    return vcon
+
+
+def test_manifest_signing(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_media_vcon()
+    vcon.sign(VconSigner(private_key, manifest=True))
+    assert len(vcon.vcon_dict["payload"]) < 2000
+    header = json.loads(base64.urlsafe_b64decode(vcon.vcon_dict["signatures"][0]["protected"] + "=="))
+    assert header["cty"] == MANIFEST_CONTENT_TYPE
+    assert vcon.verify(public_key)
+    # a vCon loaded from JSON hashes its bodies again and still verifies
+    assert Vcon.build_from_json(vcon.to_json()).verify(public_key)
+    assert Vcon.build_from_json(vcon.to_json(), lazy=True).verify(public_key)
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda d: d["dialog"][1].update(body=d["dialog"][1]["body"][:-4] + "AAAA"),
+    lambda d: d["dialog"][1].update(mimetype="audio/mpeg"),
+    lambda d: d["dialog"][2].update(signature="abd"),
+    lambda d: d["attachments"][0]["body"].update(text="goodbye"),
+    lambda d: d.update(subject="changed"),
+    lambda d: d["dialog"].pop(),
+])
+def test_manifest_detects_changes(key_pair, tamper):
+    private_key, public_key = key_pair
+    vcon = make_media_vcon(1024)
+    vcon.sign(VconSigner(private_key, manifest=True))
+    tampered = Vcon.build_from_json(vcon.to_json())
+    tamper(tampered.vcon_dict)
+    assert not tampered.verify(public_key)
+    assert verify_many([vcon, tampered], public_key, workers=0) == [OK, BAD_SIGNATURE]
+
+
+def test_manifest_caches_body_digests(key_pair, mocker):
+    private_key, public_key = key_pair
+    vcon = make_media_vcon()
+    signer = VconSigner(private_key, manifest=True)
+    vcon.sign(signer)
+    body = vcon.vcon_dict["dialog"][1]["body"].encode()
+    digest = mocker.spy(signing, "_digest")
+    assert vcon.verify(public_key)
+    vcon.add_tag("reviewed", "yes")
+    vcon.sign(signer)
+    assert vcon.verify(public_key)
+    assert all(call.args[0] != body for call in digest.call_args_list)
+    # replacing a body hashes the new one
+    vcon.vcon_dict["dialog"][1]["body"] = "AAAA"
+    vcon.sign(signer)
+    assert any(call.args[0] == b"AAAA" for call in digest.call_args_list)
+
+
+def test_manifest_detects_in_place_body_edits(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_media_vcon(1024)
+    signer = VconSigner(private_key, manifest=True)
+    vcon.sign(signer)
+    vcon.vcon_dict["attachments"][0]["body"]["text"] = "TAMPERED"
+    assert not vcon.verify(public_key)
+    # signing again covers the edited body
+    vcon.sign(signer)
+    assert vcon.verify(public_key)
+    vcon.vcon_dict["attachments"][0]["body"]["text"] = "hello"
+    assert not vcon.verify(public_key)
+
+
+def test_manifest_excludes_previous_signatures(key_pair):
+    vcon = make_vcon()
+    manifest = build_manifest(vcon)
+    vcon.sign(key_pair[0])
+    assert build_manifest(vcon) == manifest
+
+
+def test_sign_many_with_manifest(key_pair):
+    vcons = [make_media_vcon(1024) for _ in range(3)]
+    assert sign_many(vcons, VconSigner(key_pair[0], manifest=True), workers=2) == [OK] * 3
+    assert verify_many(vcons, key_pair[1], workers=2) == [OK] * 3
+
+
+def test_detached_signing(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_media_vcon(1 << 16)
+    size = len(vcon.to_json())
+    vcon.sign(VconSigner(private_key, detached=True))
+    assert "payload" not in vcon.vcon_dict
+    assert len(vcon.to_json()) < size + 1000
+    header = json.loads(base64.urlsafe_b64decode(vcon.vcon_dict["signatures"][0]["protected"] + "=="))
+    assert header["b64"] is False and header["crit"] == ["b64"]
+    assert vcon.verify(public_key)
+    assert Vcon.build_from_json(vcon.to_json()).verify(public_key)
+    # the signing input is the canonical JSON of the vCon without its signatures
+    signature = base64.urlsafe_b64decode(vcon.vcon_dict["signatures"][0]["signature"] + "==")
+    signing_input = vcon.vcon_dict["signatures"][0]["protected"].encode() + b"." + signing.detached_payload(vcon)
+    assert JsonWebSignature.ALGORITHMS_REGISTRY["RS256"].verify(signing_input, signature, import_key(public_key))
+
+
+def test_detached_resigning_replaces_attached_payload(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_vcon()
+    vcon.sign(private_key)
+    payload = signing.detached_payload(vcon)
+    vcon.sign(VconSigner(private_key, detached=True, manifest=True))
+    assert "payload" not in vcon.vcon_dict
+    assert signing.detached_payload(vcon) == payload
+    assert vcon.verify(public_key)
+
+
+@pytest.mark.parametrize("manifest", [False, True])
+@pytest.mark.parametrize("tamper,status", [
+    (lambda d: d["dialog"][1].update(body=d["dialog"][1]["body"][:-4] + "AAAA"), BAD_SIGNATURE),
+    (lambda d: d["attachments"][0]["body"].update(text="goodbye"), BAD_SIGNATURE),
+    (lambda d: d.update(subject="changed"), BAD_SIGNATURE),
+    # a stray payload member is not part of the signed content
+    (lambda d: d.update(payload="ignored"), OK),
+])
+def test_detached_detects_changes(key_pair, manifest, tamper, status):
+    private_key, public_key = key_pair
+    vcon = make_media_vcon(1024)
+    vcon.sign(VconSigner(private_key, manifest=manifest, detached=True))
+    tampered = Vcon.build_from_json(vcon.to_json())
+    tamper(tampered.vcon_dict)
+    assert tampered.verify(public_key) is (status == OK)
+    assert verify_many([vcon, tampered], public_key, workers=2) == [OK, status]
+
+
+def test_unknown_critical_header_is_rejected(key_pair):
+    private_key, public_key = key_pair
+    vcon = make_vcon()
+    vcon.sign(VconSigner(private_key, detached=True))
+    for header in ({"alg": "RS256", "b64": False, "crit": ["b64", "exp"]}, {"alg": "RS256", "b64": False}):
+        encoded = base64.urlsafe_b64encode(json.dumps(header).encode()).rstrip(b"=").decode()
+        vcon.vcon_dict["signatures"][0]["protected"] = encoded
+        with pytest.raises(ValueError, match="Malformed"):
+            vcon.verify(public_key)
+        assert verify_many([vcon], public_key, workers=0) == [MALFORMED]
+
+
+def test_sign_many_detached(key_pair):
+    vcons = [make_media_vcon(1024) for _ in range(3)]
+    assert sign_many(vcons, VconSigner(key_pair[0], detached=True), workers=2) == [OK] * 3
+    assert all("payload" not in vcon.vcon_dict for vcon in vcons)
+    assert verify_many(vcons, key_pair[1], workers=2) == [OK] * 3
+
+
+@pytest.fixture(scope="module", params=["RS256", "ES256", "EdDSA"])
+def algorithm_key_pair(request):
+    return request.param, Vcon.generate_key_pair(request.param)
+
+
+def test_algorithm_follows_key_type(algorithm_key_pair, key_pair):
+    algorithm, (private_key, public_key) = algorithm_key_pair
+    vcon = make_vcon()
+    vcon.sign(private_key)
+    header = json.loads(base64.urlsafe_b64decode(vcon.vcon_dict["signatures"][0]["protected"] + "=="))
+    assert header["alg"] == algorithm
+    assert vcon.verify(public_key)
+    assert vcon.verify(pem(public_key))
+    assert not vcon.verify(Vcon.generate_key_pair(algorithm)[1])
+    compact = f"{vcon.vcon_dict['signatures'][0]['protected']}.{vcon.vcon_dict['payload']}." \
+              f"{vcon.vcon_dict['signatures'][0]['signature']}"
+    assert JsonWebSignature().deserialize_compact(compact, import_key(public_key))["header"]["alg"] == algorithm
+    if algorithm != "RS256":
+        assert not vcon.verify(key_pair[1])
+
+
+def test_mixed_key_ring(algorithm_key_pair, key_pair):
+    algorithm, (private_key, public_key) = algorithm_key_pair
+    ring = KeyRing({"rsa": key_pair[1], algorithm: public_key})
+    ring = pickle.loads(pickle.dumps(ring))
+    vcons = [make_vcon(), make_vcon()]
+    VconSigner(private_key, kid=algorithm).sign(vcons[0])
+    VconSigner(private_key, detached=True).sign(vcons[1])
+    assert verify_many(vcons, ring, workers=2) == [OK, OK]
+
+
+def test_header_algorithm_must_match_key(algorithm_key_pair):
+    algorithm, (private_key, public_key) = algorithm_key_pair
+    vcon = make_vcon()
+    vcon.sign(private_key)
+    other = "EdDSA" if algorithm != "EdDSA" else "ES256"
+    header = json.dumps({"alg": other, "typ": "JWS"}).encode()
+    vcon.vcon_dict["signatures"][0]["protected"] = base64.urlsafe_b64encode(header).rstrip(b"=").decode()
+    assert not vcon.verify(public_key)
+
+
+def test_unsupported_keys():
+    with pytest.raises(ValueError, match="curve"):
+        import_key(ec.generate_private_key(ec.SECP384R1()))
+    with pytest.raises(ValueError, match="curve"):
+        VconSigner(ed448.Ed448PrivateKey.generate())
+    with pytest.raises(ValueError, match="algorithm"):
+        Vcon.generate_key_pair("HS256")
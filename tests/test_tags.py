@@ -0,0 +1,62 @@
+from vcon.tags import TagStore
+
+
+def test_get_and_set():
+    body = ["a:1", "b:2"]
+    store = TagStore()
+    assert store.get(body, "a") == "1"
+    assert store.get(body, "c") is None
+    store.set(body, "c", "3")
+    store.set(body, "a", "10")
+    assert body == ["a:10", "b:2", "c:3"]
+
+
+def test_values_with_colons():
+    body = []
+    store = TagStore()
+    store.set(body, "url", "https://example.com:8443/x")
+    assert store.get(body, "url") == "https://example.com:8443/x"
+    assert body == ["url:https://example.com:8443/x"]
+
+
+def test_remove():
+    body = ["a:1", "b:2", "c:3"]
+    store = TagStore()
+    assert store.remove(body, "a")
+    assert not store.remove(body, "a")
+    assert sorted(body) == ["b:2", "c:3"]
+    assert store.get(body, "c") == "3"
+    assert store.remove(body, "c")
+    assert body == ["b:2"]
+    assert store.items(body) == {"b": "2"}
+
+
+def test_duplicates_and_direct_edits():
+    body = ["a:1", "a:2", "plain"]
+    store = TagStore()
+    assert store.get(body, "a") == "1"
+    assert store.items(body) == {"a": "1"}
+    body[body.index("a:2")] = "b:3"
+    store.remove(body, "a")
+    assert store.get(body, "a") is None
+    assert body == ["b:3", "plain"]
+    body.append("d:4")
+    assert store.get(body, "d") == "4"
+
+
+def test_remove_drops_legacy_duplicates():
+    body = ["a:1", "b:2", "a:3"]
+    store = TagStore()
+    assert store.remove(body, "a")
+    assert store.get(body, "a") is None
+    assert body == ["b:2"]
+    assert not store.remove(body, "a")
+
+
+def test_update():
+    body = []
+    store = TagStore()
+    store.update(body, {"a": "1", "b": "2"})
+    store.update(body, {"b": "3"})
+    assert store.items(body) == {"a": "1", "b": "3"}
+    assert len(body) == 2
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
+
+import pytest
+from dateutil import parser
+from dateutil.parser import ParserError
+
+from vcon import timestamps
+from vcon.timestamps import normalize_timestamp
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2023-06-01T10:00:00Z",
+        "2023-06-01t10:00:00z",
+        "2023-06-01T10:00:00",
+        "2023-06-01 10:00:00",
+        "2023-06-01T10:00Z",
+        "2023-06-01T10:00:00.000Z",
+        "2023-06-01T10:00:00.5+05:30",
+        "2023-06-01T10:00:00.1234567Z",
+        "2023-06-01T10:00:00-00:00",
+        "2023-06-01T10:00:00+0530",
+        "2024-05-03T20:13:48.414984",
+    ],
+)
+def test_matches_dateutil(value):
+    assert normalize_timestamp(value) == parser.parse(value).isoformat()
+
+
+def test_fast_path_skips_dateutil():
+    timestamps._normalize_string.cache_clear()
+    with patch("vcon.timestamps.parser") as mock_parser:
+        assert normalize_timestamp("2022-01-01T12:00:00Z") == "2022-01-01T12:00:00+00:00"
+    mock_parser.parse.assert_not_called()
+
+
+def test_falls_back_to_dateutil():
+    assert normalize_timestamp("June 1 2023 10:00") == "2023-06-01T10:00:00"
+    assert normalize_timestamp("2023-06-01") == "2023-06-01T00:00:00"
+
+
+def test_results_are_cached():
+    timestamps._normalize_string.cache_clear()
+    normalize_timestamp("2023-06-01T10:00:00Z")
+    normalize_timestamp("2023-06-01T10:00:00Z")
+    info = timestamps._normalize_string.cache_info()
+    assert info.hits == 1
+    assert info.maxsize == timestamps.TIMESTAMP_CACHE_SIZE
+
+
+def test_relative_input_is_not_cached():
+    timestamps._normalize_string.cache_clear()
+    with patch("vcon.timestamps.parser") as mock_parser:
+        mock_parser.parse.return_value.isoformat.side_effect = ["2024-01-01T10:30:00", "2024-01-02T10:30:00"]
+        assert normalize_timestamp("10:30") == "2024-01-01T10:30:00"
+        assert normalize_timestamp("10:30") == "2024-01-02T10:30:00"
+    assert mock_parser.parse.call_count == 2
+
+
+def test_datetime_values():
+    value = datetime(2022, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=-5)))
+    assert normalize_timestamp(value) == "2022-01-01T12:00:00-05:00"
+
+
+def test_invalid_string():
+    with pytest.raises(ParserError):
+        normalize_timestamp("invalid-datetime")
+    with pytest.raises(ParserError):
+        normalize_timestamp("2023-13-45T10:00:00Z")
@@ -0,0 +1,74 @@
+import pytest
+
+from vcon import Vcon, validation
+from vcon.validation import check_body
+
+
+@pytest.fixture(autouse=True)
+def restore_level():
+    level = validation.get_validation_level()
+    yield
+    validation.set_validation_level(level)
+
+
+@pytest.mark.parametrize("body", ['{"a": [1, 2]}', " [1]\n", '"text"', '"ends with \\\\"', "12", "null", b'{"a": 1}'])
+def test_structural_json_accepts(body):
+    check_body(body, "json", "structural")
+
+
+@pytest.mark.parametrize("body", ["", "  ", "{", '{"a": 1]', '"escaped\\"', "nul", 12])
+def test_structural_json_rejects(body):
+    with pytest.raises(Exception, match="Invalid JSON body"):
+        check_body(body, "json", "structural")
+
+
+def test_structural_json_does_not_parse():
+    # only the outer delimiters are checked
+    check_body('{"a": oops}', "json", "structural")
+    with pytest.raises(Exception, match="Invalid JSON body"):
+        check_body('{"a": oops}', "json", "full")
+
+
+@pytest.mark.parametrize("level", ["full", "structural", "none"])
+def test_json_dict_and_list_bodies(level):
+    check_body({"a": 1}, "json", level)
+    check_body([1, 2], "json", level)
+
+
+def test_structural_base64url():
+    check_body("aGVsbG8gd29ybGQ=", "base64url", "structural")
+    check_body(b"aGVsbG8_-w==", "base64url", "structural")
+    for body in ("aGVsbG8", "aGVs+G8=", "aGVsbG8gd29ybGQ=a", 42):
+        with pytest.raises(Exception, match="Invalid base64url body"):
+            check_body(body, "base64url", "structural")
+
+
+def test_none_level_checks_encoding_only():
+    check_body("{", "json", "none")
+    check_body("!!", "base64url", "none")
+    with pytest.raises(Exception, match="Invalid encoding"):
+        check_body("x", "gzip", "none")
+
+
+def test_unknown_level():
+    with pytest.raises(ValueError):
+        validation.set_validation_level("strict")
+    with pytest.raises(ValueError):
+        check_body("x", "none", "strict")
+
+
+def test_default_level_and_per_call_override():
+    vcon = Vcon.build_new()
+    validation.set_validation_level("none")
+    vcon.add_attachment(type="raw", body="{", encoding="json")
+    with pytest.raises(Exception, match="Invalid JSON body"):
+        vcon.add_attachment(type="raw", body="{", encoding="json", validation="full")
+    with pytest.raises(Exception, match="Invalid base64url body"):
+        vcon.add_analysis(type="audio", dialog=0, vendor="acme", body="a+b/", encoding="base64url",
+                          validation="structural")
+    with pytest.raises(Exception, match="Invalid JSON body"):
+        vcon.add_analyses([{"type": "summary", "dialog": 0, "vendor": "acme", "body": "{", "encoding": "json"}],
+                          validation="structural")
+    vcon.add_analysis(type="summary", dialog=0, vendor="acme", body={"text": "hi"}, encoding="json")
+    assert len(vcon.attachments) == 1
+    assert vcon.analysis[0]["body"] == {"text": "hi"}
@@ -1,10 +1,14 @@
 from vcon import Vcon
 from vcon.party import Party
 from vcon.dialog import Dialog
+from vcon.index import ListIndex
+
+import copy
+import pickle
 
 import pytest
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
 """
 This covers testing the main methods of the Vcon class, including:
@@ -387,4 +391,348 @@ class Test__Init__:
         from src.vcon.vcon import Vcon
         vcon_dict = {"created_at": "2022-01-01T12:00:00Z", "data": {"key": "value"}}
         vcon = Vcon(vcon_dict)
-        assert vcon.vcon_dict is not vcon_dict, "vcon_dict should be a deep copy"
\ No newline at end of file
+        assert vcon.vcon_dict is not vcon_dict, "vcon_dict should be a deep copy"
+
+    # Does not modify the caller's dictionary when copying
+    def test_copy_leaves_input_untouched(self):
+        from src.vcon.vcon import Vcon
+        vcon_dict = {"created_at": datetime(2022, 1, 1, 12, 0, 0)}
+        vcon = Vcon(vcon_dict)
+        assert isinstance(vcon_dict["created_at"], datetime)
+        assert vcon.vcon_dict["created_at"] == "2022-01-01T12:00:00"
+
+
+class TestFromDict:
+    # Adopts the dictionary without copying it
+    def test_adopts_dict(self):
+        body = {"speaker": "Agent", "message": "Hello"}
+        vcon_dict = {"created_at": "2022-01-01T12:00:00Z", "dialog": [{"body": body}]}
+        vcon = Vcon.from_dict(vcon_dict)
+        assert vcon.vcon_dict is vcon_dict
+        assert vcon.dialog[0]["body"] is body
+        assert vcon.created_at == "2022-01-01T12:00:00+00:00"
+
+    # Deep copies the dictionary when asked to
+    def test_copy_on_request(self):
+        vcon_dict = {"created_at": "2022-01-01T12:00:00Z", "dialog": [{"body": "abc"}]}
+        vcon = Vcon.from_dict(vcon_dict, copy=True)
+        assert vcon.vcon_dict is not vcon_dict
+        assert vcon.vcon_dict["dialog"] is not vcon_dict["dialog"]
+        assert vcon_dict["created_at"] == "2022-01-01T12:00:00Z"
+
+    # Sets created_at when it is missing
+    def test_sets_created_at(self):
+        vcon = Vcon.from_dict({})
+        assert vcon.created_at is not None
+
+
+class TestToDict:
+    # Deep copies are independent of the vCon
+    def test_deep_copy(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        vcon_dict = vcon.to_dict()
+        assert vcon_dict == json.loads(vcon.to_json())
+        vcon_dict["dialog"][0]["meta"]["direction"] = "out"
+        assert vcon.dialog[0]["meta"]["direction"] == "in"
+
+    # Shallow copies share nested values
+    def test_shallow_copy(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        vcon_dict = vcon.to_dict(copy="shallow")
+        assert vcon_dict is not vcon.vcon_dict
+        assert vcon_dict["dialog"] is vcon.vcon_dict["dialog"]
+
+    # No copy returns the vCon's own dictionary
+    def test_no_copy(self):
+        vcon = Vcon.build_new()
+        assert vcon.to_dict(copy="none") is vcon.vcon_dict
+
+    def test_invalid_copy_mode(self):
+        with pytest.raises(ValueError):
+            Vcon.build_new().to_dict(copy="partial")
+
+
+def test_view():
+    vcon = Vcon.build_from_json(test_vcon_string)
+    view = vcon.view()
+    assert view["uuid"] == vcon.uuid
+    assert view["dialog"][0]["meta"]["direction"] == "in"
+    assert view == vcon.to_dict()
+    with pytest.raises(TypeError):
+        view["dialog"][0]["meta"]["direction"] = "out"
+    vcon.add_tag("k", "v")
+    assert view["attachments"][0]["type"] == "tags"
+
+
+def test_find_all_attachments():
+    vcon = Vcon.build_new()
+    vcon.add_attachment(body="one", type="note")
+    vcon.add_tag("k", "v")
+    vcon.add_attachment(body="two", type="note")
+    assert [a["body"] for a in vcon.find_all_attachments("note")] == ["one", "two"]
+    assert vcon.find_attachment_by_type("tags")["body"] == ["k:v"]
+    assert vcon.find_all_attachments("missing") == []
+
+
+def test_find_all_analysis():
+    vcon = Vcon.build_new()
+    vcon.add_analysis(type="transcript", dialog=0, vendor="deepgram", body="a")
+    vcon.add_analysis(type="sentiment", dialog=[0, 1], vendor="openai", body="b")
+    vcon.add_analysis(type="transcript", dialog=1, vendor="openai", body="c")
+    vcon.add_analysis(type="summary", dialog=[1], vendor="openai", body="d")
+
+    def bodies(**kwargs):
+        return [a["body"] for a in vcon.find_all_analysis(**kwargs)]
+
+    assert bodies(type="transcript") == ["a", "c"]
+    assert bodies(vendor="openai") == ["b", "c", "d"]
+    assert bodies(type="transcript", vendor="openai") == ["c"]
+    assert bodies(dialog=1) == ["b", "c", "d"]
+    assert bodies(type="sentiment", dialog=0) == ["b"]
+    assert bodies() == ["a", "b", "c", "d"]
+    assert bodies(type="missing") == []
+    vcon.add_analyses([{"type": "summary", "dialog": [2, 0], "vendor": "openai", "body": "e"}])
+    assert bodies(dialog=0) == ["a", "b", "e"]
+    assert bodies(dialog=3) == []
+
+
+def test_find_all_analysis_by_dialog_uses_index(mocker):
+    vcon = Vcon.build_new()
+    vcon.add_analysis(type="transcript", dialog=0, vendor="deepgram", body="a")
+    vcon.add_analysis(type="transcript", dialog=[1], vendor="deepgram", body="b")
+    assert [a["body"] for a in vcon.find_all_analysis(dialog=1)] == ["b"]
+    rebuild = mocker.spy(ListIndex, "_rebuild")
+    vcon.add_analysis(type="summary", dialog=1, vendor="openai", body="c")
+    assert [a["body"] for a in vcon.find_all_analysis(dialog=1)] == ["b", "c"]
+    assert rebuild.call_count == 0
+
+
+def test_indexes_follow_direct_edits():
+    vcon = Vcon.build_new()
+    vcon.add_analysis(type="transcript", dialog=0, vendor="deepgram", body="a")
+    assert vcon.find_analysis_by_type("transcript")["body"] == "a"
+    vcon.vcon_dict["analysis"].insert(0, {"type": "transcript", "dialog": 0, "vendor": "x", "body": "z"})
+    assert vcon.find_analysis_by_type("transcript")["body"] == "z"
+    vcon.vcon_dict["analysis"][1]["vendor"] = "y"
+    vcon.reindex()
+    assert vcon.find_all_analysis(vendor="y")[0]["body"] == "a"
+
+
+def test_tag_updates_in_place():
+    vcon = Vcon.build_new()
+    vcon.add_tag("queue", "sales")
+    vcon.add_tag("queue", "support")
+    assert vcon.get_tag("queue") == "support"
+    assert vcon.tags["body"] == ["queue:support"]
+
+
+def test_bulk_tags():
+    vcon = Vcon.build_new()
+    assert vcon.get_tags() == {}
+    vcon.add_tags({"a": "1", "b": "2", "time": "10:30"})
+    assert vcon.get_tags() == {"a": "1", "b": "2", "time": "10:30"}
+    assert vcon.get_tag("time") == "10:30"
+    vcon.remove_tag("a")
+    vcon.remove_tag("missing")
+    assert vcon.get_tags() == {"b": "2", "time": "10:30"}
+    assert len(vcon.find_all_attachments("tags")) == 1
+
+
+def test_remove_tag_from_legacy_duplicates():
+    vcon = Vcon.build_new()
+    vcon.add_attachment(type="tags", body=["a:1", "b:2", "a:3"], encoding="json")
+    vcon.remove_tag("a")
+    assert vcon.get_tag("a") is None
+    assert vcon.get_tags() == {"b": "2"}
+
+
+def test_tags_from_json():
+    vcon = Vcon.build_new()
+    vcon.add_tags({"a": "1", "b": "2"})
+    loaded = Vcon.build_from_json(vcon.to_json())
+    assert loaded.get_tags() == {"a": "1", "b": "2"}
+    loaded.add_tag("a", "3")
+    assert loaded.tags["body"] == ["a:3", "b:2"]
+
+
+def test_find_party_index_by_indexed_and_nested_fields():
+    vcon = Vcon.build_new()
+    vcon.add_party(Party(tel="+1", name="Alice", meta={"role": "agent"}))
+    vcon.add_party(Party(tel="+2", name="Bob", meta={"role": "customer"}))
+    assert vcon.find_party_index("tel", "+2") == 1
+    vcon.index_parties("tel", "mailto", "meta.role")
+    vcon.add_party(Party(tel="+3", mailto="carol@example.com"))
+    assert vcon.find_party_index("tel", "+3") == 2
+    assert vcon.find_party_index("mailto", "carol@example.com") == 2
+    assert vcon.find_party_index("meta.role", "customer") == 1
+    vcon.add_party(Party(tel="+4", meta={"role": "supervisor"}))
+    assert vcon.find_party_index("meta.role", "supervisor") == 3
+    vcon.vcon_dict["parties"][0]["tel"] = "+9"
+    assert vcon.find_party_index("tel", "+1") is None
+    vcon.reindex()
+    assert vcon.find_party_index("tel", "+9") == 0
+
+
+def test_find_party_index_scans_after_direct_edits():
+    vcon = Vcon.build_new()
+    vcon.add_party(Party(tel="+1"))
+    assert vcon.find_party_index("tel", "+1") == 0
+    vcon.vcon_dict["parties"][0]["tel"] = "+9"
+    assert vcon.find_party_index("tel", "+9") == 0
+    assert vcon.find_party_index("tel", "+1") is None
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_find_party_index_after_proxy_edit(indexed):
+    vcon = Vcon.build_new()
+    vcon.add_party(Party(tel="+1"))
+    vcon.add_party(Party(tel="+2"))
+    if indexed:
+        vcon.index_parties("tel")
+    assert vcon.find_party_index("tel", "+1") == 0
+    vcon.parties[0].tel = "+9"
+    assert vcon.find_party_index("tel", "+9") == 0
+    assert vcon.find_party_index("tel", "+1") is None
+    copy.copy(vcon.parties[1]).tel = "+8"
+    assert vcon.find_party_indices("tel", ["+8", "+2"]) == [1, None]
+
+
+def test_find_party_indices():
+    vcon = Vcon.build_new()
+    for n in range(5):
+        vcon.add_party(Party(tel=f"+{n}", meta={"seat": n}))
+    assert vcon.find_party_indices("tel", ["+3", "+0", "+7"]) == [3, 0, None]
+    assert vcon.find_party_indices("meta.seat", [4, 1]) == [4, 1]
+    assert vcon.find_party_indices("tel", []) == []
+
+
+class TestTypedViews:
+    # Parties are cached proxies over the party dicts
+    def test_parties_are_cached_proxies(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        first = vcon.parties
+        second = vcon.parties
+        assert first[0] is second[0]
+        assert isinstance(first[0], Party)
+        assert first[0].name == "Daniel Rodriguez"
+        assert first[0].uuid is None
+        first[0].name = "Dan Rodriguez"
+        assert vcon.vcon_dict["parties"][0]["name"] == "Dan Rodriguez"
+
+    # Adding a party invalidates the cache
+    def test_parties_cache_invalidated(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        assert len(vcon.parties) == 2
+        vcon.add_party(Party(name="Alice"))
+        assert vcon.parties[2].name == "Alice"
+        second = vcon.parties[1]
+        vcon.vcon_dict["parties"][0] = {"name": "Eve"}
+        assert vcon.parties[0].name == "Eve"
+        assert vcon.parties[1] is second
+        vcon.parties[0].name = "Eva"
+        assert vcon.vcon_dict["parties"][0]["name"] == "Eva"
+        del vcon.vcon_dict["parties"][1:]
+        assert [party.name for party in vcon.parties] == ["Eva"]
+
+    # Replacing a dialog dict directly is picked up without reindex()
+    def test_dialogs_follow_direct_edits(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        assert vcon.dialogs[0].body is None
+        vcon.vcon_dict["dialog"][0] = {"type": "text", "start": "2024-05-03T20:13:48Z", "parties": [0], "body": "new"}
+        assert vcon.dialogs[0].body == "new"
+        vcon.dialogs[0].body = "edited"
+        assert vcon.vcon_dict["dialog"][0]["body"] == "edited"
+
+    # Proxies copy and pickle like the Party and Dialog objects they stand for
+    def test_proxies_copy_and_pickle(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        for view, data in ((vcon.parties[0], vcon.vcon_dict["parties"][0]), (vcon.dialogs[0], vcon.dialog[0])):
+            shallow = copy.copy(view)
+            assert type(shallow) is type(view) and shallow.to_dict() == view.to_dict()
+            assert shallow._data is data
+            for detached in (copy.deepcopy(view), pickle.loads(pickle.dumps(view))):
+                assert type(detached) is type(view) and detached.to_dict() == view.to_dict()
+                assert detached._data is not data
+
+    # Setting the start time through a proxy stores an ISO 8601 string
+    def test_dialog_proxy_normalizes_start(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        vcon.dialogs[0].start = datetime(2024, 5, 3, 20, 13, 48, tzinfo=timezone.utc)
+        assert vcon.dialog[0]["start"] == "2024-05-03T20:13:48+00:00"
+        vcon.dialogs[0].start = "2024-05-03T20:13:48Z"
+        assert vcon.dialog[0]["start"] == "2024-05-03T20:13:48+00:00"
+        json.loads(vcon.to_json())
+
+    # Dialogs are cached proxies over the dialog dicts
+    def test_dialogs_are_cached_proxies(self):
+        vcon = Vcon.build_from_json(test_vcon_string)
+        dialog = vcon.dialogs[0]
+        assert dialog is vcon.dialogs[0]
+        assert isinstance(dialog, Dialog)
+        assert dialog.start == "2024-05-03T20:13:48.414951"
+        assert dialog.body is None
+        assert dialog.to_dict() == vcon.dialog[0]
+        dialog.add_inline_data("aGVsbG8", "hello.txt", "text/plain")
+        assert vcon.dialog[0]["body"] == "aGVsbG8"
+        assert vcon.dialogs[0].is_text()
+        vcon.add_dialog(Dialog(type="text", start="2023-06-01T10:00:00Z", parties=[0], body="hi"))
+        assert vcon.dialogs[1].body == "hi"
+
+
+class TestBulkBuilders:
+    # Parties may be Party objects or dicts, and the indexes follow along
+    def test_add_parties(self):
+        vcon = Vcon.build_new()
+        vcon.add_party(Party(tel="+15555550100"))
+        assert vcon.find_party_index("tel", "+15555550100") == 0
+        vcon.add_parties([Party(tel="+15555550101", name="Bob"), {"tel": "+15555550102", "name": None}])
+        assert vcon.vcon_dict["parties"][2] == {"tel": "+15555550102"}
+        assert vcon.find_party_index("tel", "+15555550102") == 2
+        assert vcon.find_party_index("name", "Bob") == 1
+
+    # Dialog dicts are checked and their start time normalized
+    def test_add_dialogs(self):
+        vcon = Vcon.build_new()
+        start = datetime(2024, 5, 3, 20, 13, 48)
+        vcon.add_dialogs(
+            [Dialog(type="text", start=start, parties=[0], body="hi")]
+            + [{"type": "text", "start": start, "parties": [0, 1], "body": str(i)} for i in range(3)]
+        )
+        assert len(vcon.dialog) == 4
+        assert vcon.dialog[3] == {"type": "text", "start": start.isoformat(), "parties": [0, 1], "body": "2"}
+
+    # Nothing is added when any entry is invalid
+    def test_add_dialogs_is_all_or_nothing(self):
+        vcon = Vcon.build_new()
+        with pytest.raises(Exception, match="missing parties"):
+            vcon.add_dialogs([{"type": "text", "start": "2024-05-03T20:13:48Z", "parties": [0]},
+                              {"type": "text", "start": "2024-05-03T20:13:48Z"}])
+        with pytest.raises(Exception, match="Invalid encoding"):
+            vcon.add_dialogs([{"type": "text", "start": "2024-05-03T20:13:48Z", "parties": [0],
+                               "encoding": "rot13"}])
+        assert vcon.dialog == []
+
+    # Attachments and analysis bodies are validated, and lookups stay indexed
+    def test_add_attachments_and_analyses(self):
+        vcon = Vcon.build_new()
+        vcon.add_attachment(type="transcript", body="hello")
+        vcon.add_attachments([
+            {"type": "transcript", "body": "world"},
+            {"type": "metadata", "body": '{"a": 1}', "encoding": "json", "party": 0},
+        ])
+        assert [a["body"] for a in vcon.find_all_attachments("transcript")] == ["hello", "world"]
+        assert vcon.find_attachment_by_type("metadata")["party"] == 0
+
+        vcon.add_analyses([
+            {"type": "summary", "dialog": 0, "vendor": "acme", "body": "short"},
+            {"type": "sentiment", "dialog": [0, 1], "vendor": "acme", "body": "positive", "product": "x"},
+        ])
+        assert vcon.find_all_analysis(vendor="acme", dialog=1)[0]["product"] == "x"
+        assert vcon.analysis[0]["encoding"] == "none"
+
+        with pytest.raises(Exception, match="Invalid JSON body"):
+            vcon.add_attachments([{"type": "metadata", "body": "{", "encoding": "json"}])
+        with pytest.raises(Exception, match="missing vendor"):
+            vcon.add_analyses([{"type": "summary", "dialog": 0, "body": "short"}])
+        assert len(vcon.attachments) == 3
+        assert len(vcon.analysis) == 2
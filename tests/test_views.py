@@ -0,0 +1,35 @@
+import pytest
+
+from vcon.views import ReadOnlyDict, ReadOnlyList, read_only
+
+
+def test_read_only_wraps_containers():
+    assert isinstance(read_only({}), ReadOnlyDict)
+    assert isinstance(read_only([]), ReadOnlyList)
+    assert read_only("text") == "text"
+
+
+def test_dict_view_is_live_and_immutable():
+    data = {"a": {"b": [1, 2, {"c": 3}]}}
+    view = ReadOnlyDict(data)
+    assert view["a"]["b"][2]["c"] == 3
+    assert len(view) == 1
+    assert "a" in view
+    assert list(view) == ["a"]
+    assert view.get("missing") is None
+    data["a"]["b"].append(4)
+    assert view["a"]["b"][-1] == 4
+    with pytest.raises(TypeError):
+        view["x"] = 1
+    with pytest.raises(AttributeError):
+        view["a"]["b"].append(5)
+
+
+def test_list_view():
+    data = [1, [2, 3], {"a": 1}]
+    view = ReadOnlyList(data)
+    assert view == data
+    assert view[1:] == [[2, 3], {"a": 1}]
+    assert isinstance(view[2], ReadOnlyDict)
+    assert view.index(1) == 0
+    assert len(view) == 3